@@ -1,9 +1,16 @@
 from django.contrib import admin
-from colleges.models import College
+from colleges.models import College, DeletionJob
 
 # Register your models here.
 class CollegeAdmin(admin.ModelAdmin):
     list_display = ('id', 'name', 'address', 'contact_number', 'date_created', 'date_updated')
     list_filter = ('date_created', 'date_updated')
 
-admin.site.register(College, CollegeAdmin)
\ No newline at end of file
+admin.site.register(College, CollegeAdmin)
+
+class DeletionJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'target_type', 'target_id', 'target_name', 'status', 'step', 'created_at', 'finished_at')
+    list_filter = ('status', 'target_type')
+    readonly_fields = ('planned', 'deleted', 'error')
+
+admin.site.register(DeletionJob, DeletionJobAdmin)
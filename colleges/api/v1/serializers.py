@@ -1,5 +1,6 @@
 from rest_framework import serializers
-from colleges.models import College
+from colleges.models import College, DeletionJob
+from departments.counts import COUNT_FIELDS
 
 class CollegeSerializer(serializers.ModelSerializer):
     class Meta:
@@ -7,4 +8,42 @@ class CollegeSerializer(serializers.ModelSerializer):
         fields = [
             'id', 
             'name', 
-        ]
\ No newline at end of file
+        ]
+
+
+class CollegeCountsSerializer(CollegeSerializer):
+    """
+    College with student, professor, course and active enrollment counts
+    (annotated by the view)
+    """
+    student_count = serializers.IntegerField(read_only=True)
+    professor_count = serializers.IntegerField(read_only=True)
+    course_count = serializers.IntegerField(read_only=True)
+    active_enrollment_count = serializers.IntegerField(read_only=True)
+
+    class Meta(CollegeSerializer.Meta):
+        fields = CollegeSerializer.Meta.fields + COUNT_FIELDS
+        annotated_fields = COUNT_FIELDS
+
+
+class DeletionJobSerializer(serializers.ModelSerializer):
+    progress = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = DeletionJob
+        fields = [
+            'id',
+            'target_type',
+            'target_id',
+            'target_name',
+            'status',
+            'step',
+            'progress',
+            'planned',
+            'deleted',
+            'error',
+            'created_at',
+            'updated_at',
+            'finished_at',
+        ]
+        read_only_fields = fields
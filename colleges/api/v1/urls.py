@@ -1,7 +1,18 @@
 from django.urls import path
-from .views import CollegeListCreate, CollegeRetrieveUpdateDestroy
+from .views import (
+    CollegeListCreate,
+    CollegeRetrieveUpdateDestroy,
+    catalog,
+    deletion_job_list,
+    deletion_job_detail,
+    resume_deletion_job,
+)
 
 urlpatterns = [
     path('colleges/', CollegeListCreate.as_view(), name='college-list-create'),  # Combined endpoint for listing and creating colleges
     path('colleges/<int:pk>/', CollegeRetrieveUpdateDestroy.as_view(), name='college-update-delete'),
+    path('catalog/', catalog, name='catalog'),
+    path('deletion-jobs/', deletion_job_list, name='deletion-job-list'),
+    path('deletion-jobs/<int:pk>/', deletion_job_detail, name='deletion-job-detail'),
+    path('deletion-jobs/<int:pk>/resume/', resume_deletion_job, name='deletion-job-resume'),
 ]
\ No newline at end of file
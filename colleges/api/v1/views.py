@@ -1,14 +1,45 @@
 from rest_framework import generics
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
+from django.shortcuts import get_object_or_404
 from drf_yasg.utils import swagger_auto_schema
-from colleges.models import College
-from .serializers import CollegeSerializer
+from core.cache import REFERENCE_NAMESPACE
+from core.caching import CachedReadMixin, ObjectCacheMixin
+from core.prefetch import AutoPrefetchMixin
+from users.permissions import IsAdmin
+from users.scope import get_request_scope
+from colleges.catalog import get_catalog
+from colleges.deletion import create_deletion_job, start_deletion_job
+from colleges.models import College, DeletionJob
+from departments.counts import annotate_college_counts
+from .serializers import CollegeSerializer, CollegeCountsSerializer, DeletionJobSerializer
 
 # get all colleges and create a new college
-class CollegeListCreate(generics.ListCreateAPIView):
+class CollegeListCreate(CachedReadMixin, AutoPrefetchMixin, generics.ListCreateAPIView):
     queryset = College.objects.all()
     serializer_class = CollegeSerializer
+    cache_namespace = REFERENCE_NAMESPACE
+    cache_vary_on_scope = False
+
+    def with_counts(self):
+        return self.request.method == 'GET' and self.request.query_params.get('with_counts') in ('1', 'true')
+
+    def should_cache(self, request):
+        # Counts follow students and enrollments, which don't bump the cache
+        return not self.with_counts()
+
+    def get_serializer_class(self):
+        if self.with_counts():
+            return CollegeCountsSerializer
+        return CollegeSerializer
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.with_counts():
+            queryset = annotate_college_counts(queryset)
+        return queryset
 
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -18,20 +49,18 @@ class CollegeListCreate(generics.ListCreateAPIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 # get, update, delete college by ID
-class CollegeRetrieveUpdateDestroy(generics.RetrieveUpdateDestroyAPIView):
+class CollegeRetrieveUpdateDestroy(ObjectCacheMixin, AutoPrefetchMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = College.objects.all()
     serializer_class = CollegeSerializer
 
     def get(self, request, *args, **kwargs):
-        college = self.get_object()
-        serializer = self.get_serializer(college)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return self.retrieve(request, *args, **kwargs)
 
     def put(self, request, *args, **kwargs):
         college = self.get_object()
         serializer = self.get_serializer(college, data=request.data)
         if serializer.is_valid():
-            serializer.save()
+            self.perform_update(serializer)
             return Response(serializer.data, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -39,11 +68,67 @@ class CollegeRetrieveUpdateDestroy(generics.RetrieveUpdateDestroyAPIView):
         college = self.get_object()
         serializer = self.get_serializer(college, data=request.data, partial=True)
         if serializer.is_valid():
-            serializer.save()
+            self.perform_update(serializer)
             return Response(serializer.data, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     def delete(self, request, *args, **kwargs):
         college = self.get_object()
+        if request.query_params.get('background') in ('1', 'true'):
+            # Large subtrees: delete in batches on a background job
+            job = create_deletion_job(college, requested_by=request.user)
+            start_deletion_job(job)
+            return Response(DeletionJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
         college.delete()
-        return Response(status=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+# get the whole college -> department -> course -> subject tree
+@api_view(['GET'])
+def catalog(request):
+    """Get the nested catalog, optionally for one college or department"""
+    filters = {}
+    for param in ('college', 'department'):
+        value = request.query_params.get(param)
+        if value:
+            try:
+                filters[f'{param}_id'] = int(value)
+            except ValueError:
+                return Response({param: 'Must be an integer ID.'}, status=status.HTTP_400_BAD_REQUEST)
+
+    scope = get_request_scope(request)
+    department_ids = None if scope.is_admin else scope.department_ids
+    return Response({'colleges': get_catalog(department_ids=department_ids, **filters)})
+
+
+# background deletion jobs
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, IsAdmin])
+def deletion_job_list(request):
+    """List background deletion jobs, newest first (?status= to filter)"""
+    jobs = DeletionJob.objects.all()
+    job_status = request.query_params.get('status')
+    if job_status:
+        jobs = jobs.filter(status=job_status)
+    return Response(DeletionJobSerializer(jobs[:100], many=True).data)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, IsAdmin])
+def deletion_job_detail(request, pk):
+    """Get the status and progress of a deletion job"""
+    job = get_object_or_404(DeletionJob, pk=pk)
+    return Response(DeletionJobSerializer(job).data)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated, IsAdmin])
+def resume_deletion_job(request, pk):
+    """Restart a failed deletion job from where it stopped"""
+    job = get_object_or_404(DeletionJob, pk=pk)
+    if job.status != 'failed':
+        return Response(
+            {'error': f'Only failed jobs can be resumed (this one is {job.status}).'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    start_deletion_job(job)
+    return Response(DeletionJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
@@ -5,6 +5,7 @@ from drf_yasg.utils import swagger_auto_schema
 from colleges.models import College
 from .serializers import CollegeSerializer
 from users.permissions import IsAdmin, IsPrincipal, IsCollegeManager
+from users.scope import get_request_scope
 
 # get all colleges and create a new college
 class CollegeListCreate(generics.ListCreateAPIView):
@@ -34,12 +35,13 @@ class CollegeListCreate(generics.ListCreateAPIView):
         if not user.is_authenticated:
             return College.objects.none()
         
+        scope = get_request_scope(self.request)
         # Admins can see all colleges
-        if user.is_admin():
+        if scope.is_admin:
             return College.objects.all()
         # Principals can see their own college
-        elif user.is_principal() and user.college:
-            return College.objects.filter(id=user.college.id)
+        elif user.is_principal() and user.college_id:
+            return College.objects.filter(id__in=scope.college_ids)
         # Other users can see all colleges (read-only)
         else:
             return College.objects.all()
@@ -91,12 +93,13 @@ class CollegeRetrieveUpdateDestroy(generics.RetrieveUpdateDestroyAPIView):
         if not user.is_authenticated:
             return College.objects.none()
         
+        scope = get_request_scope(self.request)
         # Admins can access all colleges
-        if user.is_admin():
+        if scope.is_admin:
             return College.objects.all()
         # Principals can access their own college
-        elif user.is_principal() and user.college:
-            return College.objects.filter(id=user.college.id)
+        elif user.is_principal() and user.college_id:
+            return College.objects.filter(id__in=scope.college_ids)
         # Other users can view all colleges (read-only)
         else:
             return College.objects.all()
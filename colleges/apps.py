@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class CollegesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'colleges'
+
+    def ready(self):
+        from colleges import signals  # noqa: F401
@@ -0,0 +1,87 @@
+import hashlib
+
+from django.conf import settings
+
+from colleges.models import College
+from colleges.hierarchy import within
+from core.cache import bump_generation, get_generation, read_through
+from courses.models import Course
+from departments.models import Department
+from subjects.models import Subject
+
+CATALOG_NAMESPACE = 'catalog'
+CATALOG_KEY = 'catalog:{generation}:{variant}'
+
+
+def build_catalog(college_id=None, department_id=None, department_ids=None):
+    """
+    Build the college → department → course → subject tree.
+
+    Each level is one flat values() query, so the whole tree costs four
+    queries however large it is. department_ids limits the tree to those
+    departments (None means no limit). Colleges without a visible
+    department are left out when the tree is limited.
+    """
+    departments = Department.objects.all()
+    courses = Course.objects.all()
+    subjects = Subject.objects.all()
+    colleges = College.objects.all()
+
+    if college_id is not None:
+        # One range scan on the materialized path per level, no joins
+        prefix = f'{college_id}/'
+        colleges = colleges.filter(id=college_id)
+        departments = within(departments, prefix=prefix)
+        courses = within(courses, prefix=prefix)
+        subjects = within(subjects, prefix=prefix)
+    if department_id is not None:
+        department_ids = {department_id} if department_ids is None else set(department_ids) & {department_id}
+    if department_ids is not None:
+        departments = departments.filter(id__in=department_ids)
+        courses = courses.filter(department_id__in=department_ids)
+        subjects = subjects.filter(course__department_id__in=department_ids)
+
+    department_rows = list(departments.order_by('name', 'id').values('id', 'college_id', 'name'))
+    if department_ids is not None:
+        colleges = colleges.filter(id__in={row['college_id'] for row in department_rows})
+
+    subjects_by_course = {}
+    for row in subjects.order_by('code', 'id').values('id', 'course_id', 'code', 'name'):
+        subjects_by_course.setdefault(row.pop('course_id'), []).append(row)
+
+    courses_by_department = {}
+    for row in courses.order_by('code', 'id').values('id', 'department_id', 'code', 'name'):
+        row['subjects'] = subjects_by_course.get(row['id'], [])
+        courses_by_department.setdefault(row.pop('department_id'), []).append(row)
+
+    departments_by_college = {}
+    for row in department_rows:
+        row['courses'] = courses_by_department.get(row['id'], [])
+        departments_by_college.setdefault(row.pop('college_id'), []).append(row)
+
+    tree = []
+    for row in colleges.order_by('name', 'id').values('id', 'name'):
+        row['departments'] = departments_by_college.get(row['id'], [])
+        tree.append(row)
+    return tree
+
+
+def get_catalog(college_id=None, department_id=None, department_ids=None):
+    """
+    Return the catalog tree, cached until any college, department, course
+    or subject changes
+    """
+    visible = 'all' if department_ids is None else ','.join(str(pk) for pk in sorted(department_ids))
+    variant = hashlib.md5(f'{college_id}:{department_id}:{visible}'.encode()).hexdigest()
+    key = CATALOG_KEY.format(generation=get_generation(CATALOG_NAMESPACE), variant=variant)
+    return read_through(
+        key,
+        lambda: build_catalog(college_id, department_id, department_ids),
+        timeout=getattr(settings, 'CATALOG_CACHE_TIMEOUT', 3600),
+        endpoint='catalog',
+    )
+
+
+def invalidate_catalog():
+    """Invalidate every cached catalog tree"""
+    bump_generation(CATALOG_NAMESPACE)
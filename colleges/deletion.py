@@ -0,0 +1,193 @@
+import logging
+import threading
+import time
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from colleges.hierarchy import node_prefix, prefix_range
+from colleges.models import DeletionJob
+
+logger = logging.getLogger(__name__)
+
+# Everything below a college or department, leaves first, so each batch
+# only deletes rows nothing else points at any more. Rows are found by
+# org path (see colleges.hierarchy) or, for models without one, by the
+# root they hang off directly.
+#
+#   (model, org_path lookups, {root type: root lookup})
+DELETION_STEPS = [
+    ('schedules.SectionEnrollment', ['section__subject__org_path', 'student__org_path'], {}),
+    ('schedules.MeetingTime', ['section__subject__org_path'], {}),
+    ('schedules.ProfessorAvailability', ['professor__org_path'], {}),
+    ('schedules.Section', ['subject__org_path'], {}),
+    ('enrollments.Enrollment', ['course__org_path', 'student__org_path'], {}),
+    ('enrollments.ArchivedEnrollment', ['course__org_path', 'student__org_path'], {}),
+    ('subjects.Subject', ['org_path'], {}),
+    ('courses.Course', ['org_path'], {}),
+    ('students.Student', ['org_path'], {}),
+    ('professors.Professor', ['org_path'], {}),
+    ('users.User', ['department__org_path'], {'college': 'college', 'department': 'department'}),
+    ('departments.DepartmentSummary', ['department__org_path'], {'department': 'department'}),
+    ('departments.Department', ['org_path'], {}),
+]
+
+ROOT_MODELS = {
+    'college': 'colleges.College',
+    'department': 'departments.Department',
+}
+
+
+def get_root(target_type, target_id):
+    """Return the job's college or department, or None once it is gone"""
+    model = apps.get_model(ROOT_MODELS[target_type])
+    return model._default_manager.filter(pk=target_id).first()
+
+
+def step_queryset(label, org_lookups, root_lookups, target_type, root):
+    """
+    Rows of one model that belong below root (a College or Department)
+    """
+    model = apps.get_model(label)
+    prefix = node_prefix(root)
+    condition = Q()
+    for lookup in org_lookups:
+        condition |= prefix_range(prefix, lookup)
+    if target_type in root_lookups:
+        condition |= Q(**{root_lookups[target_type]: root.pk})
+    return model._default_manager.filter(condition)
+
+
+def deletion_plan(target_type, root):
+    """
+    Return [(label, queryset)] for everything below root, leaves first
+    """
+    return [
+        (label, step_queryset(label, org_lookups, root_lookups, target_type, root))
+        for label, org_lookups, root_lookups in DELETION_STEPS
+    ]
+
+
+def create_deletion_job(root, requested_by=None, batch_size=None):
+    """
+    Record a pending deletion job for a College or Department, with the
+    number of rows to delete per model. Returns the unfinished job for root
+    instead when there already is one.
+    """
+    target_type = 'college' if root._meta.label == ROOT_MODELS['college'] else 'department'
+    existing = DeletionJob.objects.filter(
+        target_type=target_type, target_id=root.pk, status__in=['pending', 'running', 'failed']
+    ).first()
+    if existing is not None:
+        return existing
+    planned = {label: queryset.count() for label, queryset in deletion_plan(target_type, root)}
+    planned[root._meta.label] = 1
+    return DeletionJob.objects.create(
+        target_type=target_type,
+        target_id=root.pk,
+        target_name=str(root)[:255],
+        planned={label: count for label, count in planned.items() if count},
+        batch_size=batch_size or getattr(settings, 'DELETION_BATCH_SIZE', 500),
+        requested_by=requested_by,
+    )
+
+
+def claim_job(job, stale_after=None):
+    """
+    Mark job as running if nobody else is running it; returns True when
+    this caller may proceed. A running job that has not reported progress
+    for stale_after seconds is considered abandoned and can be claimed.
+    """
+    claimable = Q(status__in=['pending', 'failed'])
+    if stale_after is not None:
+        cutoff = timezone.now() - timedelta(seconds=stale_after)
+        claimable |= Q(status='running', updated_at__lt=cutoff)
+    claimed = DeletionJob.objects.filter(claimable, pk=job.pk).update(
+        status='running', error='', updated_at=timezone.now()
+    )
+    if claimed:
+        job.refresh_from_db()
+    return bool(claimed)
+
+
+def run_deletion_job(job, pause=None):
+    """
+    Delete a claimed job's subtree in batches of job.batch_size.
+
+    Each batch is its own short transaction and progress is saved after
+    every batch, so other requests can write in between (pause seconds
+    apart) and an interrupted job resumes where it stopped: the plan is
+    re-read from what is left in the database.
+    """
+    if pause is None:
+        pause = getattr(settings, 'DELETION_BATCH_PAUSE', 0.05)
+    try:
+        root = get_root(job.target_type, job.target_id)
+        steps = deletion_plan(job.target_type, root) if root is not None else []
+        for label, queryset in steps:
+            model = queryset.model
+            job.step = label
+            while True:
+                ids = list(queryset.order_by().values_list('pk', flat=True)[:job.batch_size])
+                if not ids:
+                    break
+                with transaction.atomic():
+                    model._default_manager.filter(pk__in=ids).delete()
+                job.deleted[label] = job.deleted.get(label, 0) + len(ids)
+                job.save(update_fields=['step', 'deleted', 'updated_at'])
+                if pause:
+                    time.sleep(pause)
+        if root is not None:
+            job.step = root._meta.label
+            root.delete()
+            job.deleted[root._meta.label] = 1
+        job.status = 'completed'
+        job.step = ''
+        job.finished_at = timezone.now()
+        job.save(update_fields=['status', 'step', 'deleted', 'finished_at', 'updated_at'])
+    except Exception as e:
+        job.status = 'failed'
+        job.error = str(e)
+        job.save(update_fields=['status', 'error', 'updated_at'])
+        raise
+    return job
+
+
+def _run_in_thread(job_id):
+    try:
+        job = DeletionJob.objects.get(pk=job_id)
+        run_deletion_job(job)
+    except Exception as e:
+        logger.exception('Deletion job %s failed', job_id)
+        # run_deletion_job records its own errors; anything raised before
+        # it started would leave the claimed job running forever
+        DeletionJob.objects.filter(pk=job_id, status='running').update(
+            status='failed', error=str(e), updated_at=timezone.now()
+        )
+    finally:
+        # The thread has its own connection; don't leak it
+        connection.close()
+
+
+def start_deletion_job(job):
+    """
+    Run a pending job: on a background thread when DELETION_JOBS_IN_THREAD
+    is on (the default), otherwise inline
+    """
+    if not claim_job(job):
+        return False
+    if getattr(settings, 'DELETION_JOBS_IN_THREAD', True):
+        # Start once the claim is committed, so the thread can see it
+        transaction.on_commit(lambda: threading.Thread(
+            target=_run_in_thread,
+            args=(job.pk,),
+            name=f'deletion-job-{job.pk}',
+            daemon=True,
+        ).start())
+    else:
+        run_deletion_job(job)
+    return True
@@ -0,0 +1,142 @@
+from django.db.models import CharField, Q, Value
+from django.db.models.functions import Concat, Substr
+
+# Materialized org paths. Every row below a college stores the IDs of its
+# ancestors, root first, each followed by '/':
+#
+#   Department                  '<college>/'
+#   Course, Student, Professor  '<college>/<department>/'
+#   Subject                     '<college>/<department>/<course>/'
+#
+# so everything under a node is one indexed range scan on org_path.
+
+
+def node_prefix(node):
+    """
+    Return the org_path prefix shared by everything below a College,
+    Department or Course
+    """
+    return f'{getattr(node, "org_path", "")}{node.pk}/'
+
+
+def prefix_range(prefix, field='org_path'):
+    """
+    Q matching paths that start with prefix, written as a range rather than
+    LIKE so it can use the org_path index on every backend
+    """
+    upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    return Q(**{f'{field}__gte': prefix, f'{field}__lt': upper})
+
+
+def within(queryset, node=None, prefix=None):
+    """
+    Restrict queryset (of a model with org_path) to rows below node
+    """
+    return queryset.filter(prefix_range(prefix or node_prefix(node)))
+
+
+def ancestor_ids(obj):
+    """
+    Return the ancestor IDs of obj from its path, root first, without queries
+    """
+    return tuple(int(pk) for pk in obj.org_path.split('/') if pk)
+
+
+def _parent(instance):
+    """
+    Return (parent field, parent ID) for a model maintained by this module
+    """
+    from departments.models import Department
+    from subjects.models import Subject
+    if isinstance(instance, Department):
+        return 'college', instance.college_id
+    if isinstance(instance, Subject):
+        return 'course', instance.course_id
+    return 'department', instance.department_id
+
+
+def compute_org_path(instance):
+    """
+    Return the org_path instance should have given its current parent.
+
+    Read from the parent row (one primary-key query) rather than trusted
+    from the instance or a cached parent: either may have been loaded
+    before move_subtree rewrote the paths, and saving a stale path would
+    put the row under its old college for permissions and deletion.
+    """
+    field_name, parent_id = _parent(instance)
+    if parent_id is None:
+        return ''
+    if field_name == 'college':
+        return f'{parent_id}/'
+    parent_model = instance._meta.get_field(field_name).related_model
+    parent_path = parent_model._default_manager.filter(pk=parent_id).values_list('org_path', flat=True).first()
+    if parent_path is None:
+        return ''  # The parent is gone; the save fails on the foreign key
+    return f'{parent_path}{parent_id}/'
+
+
+def descendant_models(instance):
+    """
+    Models whose paths run through instance
+    """
+    from courses.models import Course
+    from departments.models import Department
+    from professors.models import Professor
+    from students.models import Student
+    from subjects.models import Subject
+    if isinstance(instance, Department):
+        return [Course, Student, Professor, Subject]
+    if isinstance(instance, Course):
+        return [Subject]
+    return []
+
+
+def move_subtree(instance, old_path):
+    """
+    Rewrite the paths below instance after it moved from old_path
+    """
+    old_prefix = f'{old_path}{instance.pk}/'
+    new_prefix = node_prefix(instance)
+    for model in descendant_models(instance):
+        within(model.objects.all(), prefix=old_prefix).update(
+            org_path=Concat(
+                Value(new_prefix),
+                Substr('org_path', len(old_prefix) + 1),
+                output_field=CharField(),
+            )
+        )
+
+
+def rebuild_org_paths():
+    """
+    Recompute every org_path from the foreign keys, top down, with one
+    UPDATE per model. For repairs after bulk writes that skip signals.
+    """
+    from django.db.models import OuterRef, Subquery
+    from django.db.models.functions import Cast
+    from courses.models import Course
+    from departments.models import Department
+    from professors.models import Professor
+    from students.models import Student
+    from subjects.models import Subject
+
+    def child_path(parent_model, parent_field):
+        parent_path = Subquery(
+            parent_model.objects.filter(pk=OuterRef(parent_field)).values('org_path')[:1]
+        )
+        return Concat(
+            parent_path,
+            Cast(parent_field, CharField()),
+            Value('/'),
+            output_field=CharField(),
+        )
+
+    counts = {}
+    counts['departments'] = Department.objects.update(
+        org_path=Concat(Cast('college_id', CharField()), Value('/'), output_field=CharField())
+    )
+    for name, model in (('courses', Course), ('students', Student), ('professors', Professor)):
+        counts[name] = model.objects.update(org_path=child_path(Department, 'department_id'))
+    counts['subjects'] = Subject.objects.update(org_path=child_path(Course, 'course_id'))
+    return counts
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from colleges.catalog import invalidate_catalog
+from colleges.hierarchy import rebuild_org_paths
+
+
+class Command(BaseCommand):
+    help = 'Recompute the materialized org paths of departments, courses, subjects, students and professors'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            counts = rebuild_org_paths()
+        invalidate_catalog()
+        summary = ', '.join(f'{count} {name}' for name, count in counts.items())
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt org paths for {summary}'))
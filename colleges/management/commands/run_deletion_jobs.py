@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from colleges.deletion import claim_job, run_deletion_job
+from colleges.models import DeletionJob
+
+
+class Command(BaseCommand):
+    help = 'Run pending deletion jobs and resume failed or interrupted ones'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--job', type=int, default=None, help='Only run this job')
+        parser.add_argument(
+            '--stale',
+            type=int,
+            default=300,
+            help='Take over running jobs without progress for this many seconds (default: 300)',
+        )
+        parser.add_argument(
+            '--pause',
+            type=float,
+            default=None,
+            help='Seconds to wait between batches (default: DELETION_BATCH_PAUSE)',
+        )
+
+    def handle(self, *args, **options):
+        jobs = DeletionJob.objects.exclude(status='completed').order_by('created_at')
+        if options['job'] is not None:
+            jobs = jobs.filter(pk=options['job'])
+            if not jobs.exists():
+                raise CommandError(f'No unfinished deletion job {options["job"]}')
+
+        finished = 0
+        for job in jobs:
+            if not claim_job(job, stale_after=options['stale']):
+                self.stdout.write(f'Skipping job {job.pk}: already running')
+                continue
+            self.stdout.write(f'Deleting {job.target_type} {job.target_name or job.target_id} (job {job.pk})...')
+            try:
+                run_deletion_job(job, pause=options['pause'])
+            except Exception as e:
+                self.stdout.write(self.style.ERROR(f'Job {job.pk} failed at {job.step}: {e}'))
+                continue
+            deleted = sum(job.deleted.values())
+            self.stdout.write(self.style.SUCCESS(f'Job {job.pk} completed: {deleted} rows deleted'))
+            finished += 1
+        self.stdout.write(self.style.SUCCESS(f'{finished} deletion job(s) completed'))
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:19
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('colleges', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeletionJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('target_type', models.CharField(choices=[('college', 'College'), ('department', 'Department')], max_length=20)),
+                ('target_id', models.PositiveIntegerField()),
+                ('target_name', models.CharField(blank=True, max_length=255)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed')], db_index=True, default='pending', max_length=20)),
+                ('step', models.CharField(blank=True, max_length=100)),
+                ('planned', models.JSONField(blank=True, default=dict)),
+                ('deleted', models.JSONField(blank=True, default=dict)),
+                ('batch_size', models.PositiveIntegerField(default=500)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('requested_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='deletion_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Deletion job',
+                'verbose_name_plural': 'Deletion jobs',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
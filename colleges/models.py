@@ -2,6 +2,23 @@ from django.db import models
 from django.utils.translation import gettext_lazy as _
 from django.urls import reverse
 
+class OrgPathModel(models.Model):
+    """
+    Base of the models below a college, whose org_path the pre_save signal
+    in colleges.signals recomputes on every save (see colleges.hierarchy)
+    """
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        # A partial save still writes the recomputed path
+        update_fields = kwargs.get('update_fields')
+        if update_fields and 'org_path' not in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'org_path'}
+        super().save(*args, **kwargs)
+
+
 # Create your models here.
 class College(models.Model):
     def clean(self):
@@ -24,3 +41,58 @@ class College(models.Model):
 
     def get_absolute_url(self):
         return reverse("College_detail", kwargs={"pk": self.pk})
+
+
+class DeletionJob(models.Model):
+    """
+    Background deletion of a college or department and everything below it,
+    removed bottom-up in small batches (see colleges.deletion)
+    """
+    TARGET_CHOICES = [
+        ('college', 'College'),
+        ('department', 'Department'),
+    ]
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ]
+
+    target_type = models.CharField(max_length=20, choices=TARGET_CHOICES)
+    target_id = models.PositiveIntegerField()
+    target_name = models.CharField(max_length=255, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending', db_index=True)
+    step = models.CharField(max_length=100, blank=True)  # Model currently being deleted
+    planned = models.JSONField(default=dict, blank=True)  # Rows to delete per model
+    deleted = models.JSONField(default=dict, blank=True)  # Rows deleted so far per model
+    batch_size = models.PositiveIntegerField(default=500)
+    error = models.TextField(blank=True)
+    requested_by = models.ForeignKey(
+        'users.User',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='deletion_jobs'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = _("Deletion job")
+        verbose_name_plural = _("Deletion jobs")
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"Delete {self.target_type} {self.target_name or self.target_id} ({self.status})"
+
+    @property
+    def progress(self):
+        """Share of the planned rows deleted so far, 0.0 to 1.0"""
+        if self.status == 'completed':
+            return 1.0
+        planned = sum(self.planned.values())
+        if not planned:
+            return 0.0
+        return round(min(sum(self.deleted.values()) / planned, 1.0), 4)
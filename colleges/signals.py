@@ -0,0 +1,60 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from colleges.catalog import invalidate_catalog
+from colleges.hierarchy import compute_org_path, move_subtree
+from colleges.models import College
+from core.cache import REFERENCE_NAMESPACE, bump_generation
+from courses.models import Course
+from departments.models import Department
+from professors.models import Professor
+from students.models import Student
+from subjects.models import Subject
+
+
+@receiver(post_save, sender=College)
+@receiver(post_delete, sender=College)
+@receiver(post_save, sender=Department)
+@receiver(post_delete, sender=Department)
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+@receiver(post_save, sender=Subject)
+@receiver(post_delete, sender=Subject)
+def catalog_changed(sender, **kwargs):
+    """Any change to the hierarchy invalidates the cached catalog"""
+    invalidate_catalog()
+
+
+@receiver(post_save, sender=College)
+@receiver(post_delete, sender=College)
+@receiver(post_save, sender=Department)
+@receiver(post_delete, sender=Department)
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+def reference_data_changed(sender, **kwargs):
+    """Drop cached college, department and course responses"""
+    bump_generation(REFERENCE_NAMESPACE)
+
+
+@receiver(pre_save, sender=Department)
+@receiver(pre_save, sender=Course)
+@receiver(pre_save, sender=Subject)
+@receiver(pre_save, sender=Student)
+@receiver(pre_save, sender=Professor)
+def set_org_path(sender, instance, raw=False, **kwargs):
+    """Keep org_path in step with the parent foreign key"""
+    if raw:
+        return
+    old_path = instance.org_path
+    instance.org_path = compute_org_path(instance)
+    instance._moved_from = old_path if instance.pk and old_path and old_path != instance.org_path else None
+
+
+@receiver(post_save, sender=Department)
+@receiver(post_save, sender=Course)
+def cascade_org_path(sender, instance, created, raw=False, **kwargs):
+    """A moved department or course carries its descendants along"""
+    old_path = getattr(instance, '_moved_from', None)
+    if old_path and not created and not raw:
+        move_subtree(instance, old_path)
+        instance._moved_from = None
@@ -123,3 +123,357 @@ class CollegeAPITest(APITestCase):
         response = self.client.post(url, invalid_data, format='json')
         
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class CatalogTest(APITestCase):
+    """Test cases for the catalog tree endpoint"""
+
+    def setUp(self):
+        from django.contrib.auth import get_user_model
+        from django.core.cache import cache
+        from departments.models import Department
+        from courses.models import Course
+        from subjects.models import Subject
+        cache.clear()
+        self.college = College.objects.create(name="Catalog College")
+        self.other_college = College.objects.create(name="Other College")
+        self.department = Department.objects.create(college=self.college, name="Math")
+        self.other_department = Department.objects.create(college=self.other_college, name="Art")
+        for department in (self.department, self.other_department):
+            for index in range(3):
+                course = Course.objects.create(
+                    department=department,
+                    name=f"{department.name} {index}",
+                    code=f"{department.name[:2].upper()}{index}"
+                )
+                for subject in range(2):
+                    Subject.objects.create(
+                        course=course,
+                        name=f"Subject {subject}",
+                        code=f"{course.code}-{subject}",
+                        description="Subject"
+                    )
+        user_model = get_user_model()
+        self.admin = user_model.objects.create_user(username='admin', role='admin')
+        self.teacher = user_model.objects.create_user(
+            username='teacher', role='teacher', department=self.department
+        )
+        self.url = reverse('catalog')
+        self.client.force_authenticate(user=self.admin)
+
+    def test_catalog_tree(self):
+        """Test the full tree is returned in four queries"""
+        self.client.get(reverse('college-list-create'))  # resolve the access scope
+        with self.assertNumQueries(4):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        colleges = response.data['colleges']
+        self.assertEqual([college['name'] for college in colleges], ["Catalog College", "Other College"])
+        courses = colleges[0]['departments'][0]['courses']
+        self.assertEqual(len(courses), 3)
+        self.assertEqual([subject['code'] for subject in courses[0]['subjects']], ['MA0-0', 'MA0-1'])
+
+    def test_catalog_is_cached(self):
+        """Test repeated requests are served from the cache"""
+        self.client.get(self.url)
+        with self.assertNumQueries(0):
+            self.client.get(self.url)
+
+    def test_catalog_invalidated_on_change(self):
+        """Test saving any catalog model refreshes the tree"""
+        from subjects.models import Subject
+        self.client.get(self.url)
+        subject = Subject.objects.get(code='MA0-0')
+        subject.name = "Renamed"
+        subject.save()
+        response = self.client.get(self.url)
+        courses = response.data['colleges'][0]['departments'][0]['courses']
+        self.assertEqual(courses[0]['subjects'][0]['name'], "Renamed")
+
+    def test_catalog_filtered_by_college_and_department(self):
+        """Test the tree can be limited to one college or department"""
+        response = self.client.get(self.url, {'college': self.other_college.id})
+        self.assertEqual([college['id'] for college in response.data['colleges']], [self.other_college.id])
+        response = self.client.get(self.url, {'department': self.department.id})
+        self.assertEqual(len(response.data['colleges']), 1)
+        self.assertEqual(response.data['colleges'][0]['departments'][0]['name'], "Math")
+        response = self.client.get(self.url, {'department': 'x'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_catalog_respects_access_scope(self):
+        """Test non-admins only see their departments"""
+        self.client.force_authenticate(user=self.teacher)
+        response = self.client.get(self.url)
+        self.assertEqual(len(response.data['colleges']), 1)
+        self.assertEqual(
+            [department['id'] for department in response.data['colleges'][0]['departments']],
+            [self.department.id]
+        )
+
+
+class OrgPathTest(TestCase):
+    """Test cases for materialized org paths"""
+
+    def setUp(self):
+        from departments.models import Department
+        from courses.models import Course
+        from subjects.models import Subject
+        from students.models import Student
+        from professors.models import Professor
+        self.college = College.objects.create(name="Path College")
+        self.other_college = College.objects.create(name="Other College")
+        self.department = Department.objects.create(college=self.college, name="Physics")
+        self.other_department = Department.objects.create(college=self.other_college, name="Music")
+        self.course = Course.objects.create(department=self.department, name="Mechanics", code="PH1")
+        self.subject = Subject.objects.create(
+            course=self.course, name="Kinematics", code="PH1-1", description="Subject"
+        )
+        self.student = Student.objects.create(
+            department=self.department,
+            first_name="Ada",
+            last_name="Byron",
+            student_id="OP-1",
+            email="ada@example.com",
+            contact_number="123"
+        )
+        self.professor = Professor.objects.create(
+            department=self.department,
+            first_name="Max",
+            last_name="Planck",
+            specialization="Physics",
+            contact_number="123"
+        )
+
+    def refresh(self):
+        for obj in (self.department, self.course, self.subject, self.student, self.professor):
+            obj.refresh_from_db()
+
+    def test_paths_on_create(self):
+        """Test new rows store their ancestor IDs"""
+        college, department, course = self.college.id, self.department.id, self.course.id
+        self.assertEqual(self.department.org_path, f'{college}/')
+        self.assertEqual(self.course.org_path, f'{college}/{department}/')
+        self.assertEqual(self.student.org_path, f'{college}/{department}/')
+        self.assertEqual(self.professor.org_path, f'{college}/{department}/')
+        self.assertEqual(self.subject.org_path, f'{college}/{department}/{course}/')
+
+    def test_within_is_an_index_range(self):
+        """Test subtree lookups need no joins"""
+        from colleges.hierarchy import within
+        from subjects.models import Subject
+        queryset = within(Subject.objects.all(), self.college)
+        self.assertEqual(list(queryset), [self.subject])
+        self.assertNotIn('JOIN', str(queryset.query))
+        self.assertEqual(list(within(Subject.objects.all(), self.other_college)), [])
+
+    def test_ancestor_ids(self):
+        """Test ancestors are read from the path"""
+        from colleges.hierarchy import ancestor_ids
+        with self.assertNumQueries(0):
+            ids = ancestor_ids(self.subject)
+        self.assertEqual(ids, (self.college.id, self.department.id, self.course.id))
+
+    def test_save_reads_the_parent_path_once(self):
+        """Test an ordinary save costs one indexed lookup of the parent's path"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        self.course.name = "Classical Mechanics"
+        # The parent's org_path by primary key, the UPDATE, plus one ID
+        # lookup each for the subjects and the enrollments whose cached
+        # detail payloads render the course (fan-out eviction, core.caching)
+        with CaptureQueriesContext(connection) as context, self.assertNumQueries(4):
+            self.course.save()
+        parent_queries = [query for query in context.captured_queries if '"departments_department"' in query['sql']]
+        self.assertEqual(len(parent_queries), 1)
+
+    def test_stale_instance_keeps_the_moved_path(self):
+        """Test saving a row loaded before its department moved keeps the new path"""
+        from courses.models import Course
+        from students.models import Student
+        stale_course = Course.objects.get(pk=self.course.pk)
+        stale_student = Student.objects.get(pk=self.student.pk)
+        self.department.college = self.other_college
+        self.department.save()
+        prefix = f'{self.other_college.id}/{self.department.id}/'
+
+        stale_course.name = "Stale Mechanics"
+        stale_course.save()
+        stale_student.last_name = "Lovelace"
+        stale_student.save(update_fields=['last_name'])
+        self.refresh()
+        self.assertEqual(self.course.org_path, prefix)
+        self.assertEqual(self.student.org_path, prefix)
+        self.assertEqual(self.subject.org_path, f'{prefix}{self.course.id}/')
+
+    def test_partial_save_writes_the_path(self):
+        """Test save(update_fields=...) also writes a recomputed org_path"""
+        from students.models import Student
+        Student.objects.filter(pk=self.student.pk).update(org_path='999/999/')
+        self.student.refresh_from_db()
+        self.student.department = self.department
+        self.student.save(update_fields=['department'])
+        self.student.refresh_from_db()
+        self.assertEqual(self.student.org_path, f'{self.college.id}/{self.department.id}/')
+
+    def test_department_move_cascades(self):
+        """Test moving a department rewrites every path below it"""
+        self.department.college = self.other_college
+        self.department.save()
+        self.refresh()
+        prefix = f'{self.other_college.id}/{self.department.id}/'
+        self.assertEqual(self.department.org_path, f'{self.other_college.id}/')
+        self.assertEqual(self.course.org_path, prefix)
+        self.assertEqual(self.student.org_path, prefix)
+        self.assertEqual(self.professor.org_path, prefix)
+        self.assertEqual(self.subject.org_path, f'{prefix}{self.course.id}/')
+
+    def test_course_move_cascades(self):
+        """Test moving a course rewrites its subjects' paths"""
+        self.course.department_id = self.other_department.id
+        self.course.save()
+        self.refresh()
+        self.assertEqual(
+            self.subject.org_path,
+            f'{self.other_college.id}/{self.other_department.id}/{self.course.id}/'
+        )
+
+    def test_rebuild_command(self):
+        """Test paths can be rebuilt after writes that skip signals"""
+        from io import StringIO
+        from django.core.management import call_command
+        from subjects.models import Subject
+        Subject.objects.update(org_path='')
+        out = StringIO()
+        call_command('rebuild_org_paths', stdout=out)
+        self.refresh()
+        self.assertEqual(
+            self.subject.org_path,
+            f'{self.college.id}/{self.department.id}/{self.course.id}/'
+        )
+        self.assertIn('1 subjects', out.getvalue())
+
+
+class DeletionJobTest(APITestCase):
+    """Test cases for batched background deletion"""
+
+    def setUp(self):
+        from django.contrib.auth import get_user_model
+        from django.core.cache import cache
+        from departments.models import Department
+        from courses.models import Course
+        from subjects.models import Subject
+        from students.models import Student
+        from professors.models import Professor
+        from enrollments.models import Enrollment
+        cache.clear()
+        self.college = College.objects.create(name="Doomed College")
+        self.other_college = College.objects.create(name="Surviving College")
+        self.departments = [
+            Department.objects.create(college=self.college, name=f"Dept {index}") for index in range(2)
+        ]
+        self.other_department = Department.objects.create(college=self.other_college, name="Kept")
+        other_course = Course.objects.create(department=self.other_department, name="Kept", code="KEEP")
+        for index, department in enumerate(self.departments):
+            course = Course.objects.create(department=department, name=f"Course {index}", code=f"DC{index}")
+            Subject.objects.create(course=course, name=f"Subject {index}", code=f"DS{index}", description="")
+            Professor.objects.create(
+                department=department, first_name="Prof", last_name=str(index),
+                specialization="Any", contact_number="123"
+            )
+            for number in range(3):
+                student = Student.objects.create(
+                    department=department,
+                    first_name="Student",
+                    last_name=str(number),
+                    student_id=f"DEL-{index}-{number}",
+                    email="student@example.com",
+                    contact_number="123"
+                )
+                Enrollment.objects.create(student=student, course=course)
+                # Enrolled in another college's course too
+                Enrollment.objects.create(student=student, course=other_course)
+        User = get_user_model()
+        User.objects.create_user(username='teacher', role='teacher', college=self.college, department=self.departments[0])
+        User.objects.create_user(username='kept', role='teacher', college=self.other_college)
+        self.admin = User.objects.create_user(username='admin', role='admin')
+        self.client.force_authenticate(user=self.admin)
+
+    def test_batched_deletion_removes_only_the_subtree(self):
+        """Test everything below the college goes, in batches, and nothing else"""
+        from colleges.deletion import create_deletion_job, run_deletion_job, claim_job
+        from departments.models import Department
+        from enrollments.models import Enrollment
+        from students.models import Student
+        from users.models import User
+
+        job = create_deletion_job(self.college, batch_size=2)
+        self.assertEqual(job.planned['students.Student'], 6)
+        self.assertEqual(job.planned['enrollments.Enrollment'], 12)
+        self.assertTrue(claim_job(job))
+        run_deletion_job(job, pause=0)
+
+        self.assertEqual(job.status, 'completed')
+        self.assertEqual(job.progress, 1.0)
+        self.assertEqual(job.deleted['enrollments.Enrollment'], 12)
+        self.assertFalse(College.objects.filter(pk=self.college.pk).exists())
+        self.assertFalse(Student.objects.filter(student_id__startswith='DEL-').exists())
+        self.assertEqual(list(Department.objects.values_list('name', flat=True)), ['Kept'])
+        self.assertEqual(Enrollment.objects.count(), 0)
+        self.assertEqual(set(User.objects.values_list('username', flat=True)), {'kept', 'admin'})
+
+    def test_interrupted_job_resumes(self):
+        """Test a failed job picks up from what is left"""
+        from unittest import mock
+        from colleges import deletion
+        from students.models import Student
+
+        job = deletion.create_deletion_job(self.departments[0], batch_size=1)
+        deletion.claim_job(job)
+        calls = []
+
+        def interrupt(seconds):
+            calls.append(seconds)
+            if len(calls) == 3:
+                raise RuntimeError('worker stopped')
+
+        with mock.patch.object(deletion.time, 'sleep', interrupt):
+            with self.assertRaises(RuntimeError):
+                deletion.run_deletion_job(job, pause=0.01)
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'failed')
+        self.assertEqual(sum(job.deleted.values()), 3)
+        self.assertTrue(deletion.claim_job(job))
+        deletion.run_deletion_job(job, pause=0)
+        self.assertEqual(job.status, 'completed')
+        self.assertEqual(Student.objects.filter(department=self.departments[1]).count(), 3)
+        self.assertFalse(Student.objects.filter(department_id=self.departments[0].pk).exists())
+
+    def test_thread_failure_is_logged_and_recorded(self):
+        """Test an error before the job could record it still fails the job"""
+        from unittest import mock
+        from colleges import deletion
+        job = deletion.create_deletion_job(self.departments[0])
+        deletion.claim_job(job)
+        with mock.patch.object(deletion, 'run_deletion_job', side_effect=RuntimeError('boom')), \
+                mock.patch.object(deletion, 'connection'):
+            with self.assertLogs('colleges.deletion', 'ERROR'):
+                deletion._run_in_thread(job.pk)
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'failed')
+        self.assertEqual(job.error, 'boom')
+
+    def test_background_delete_endpoint(self):
+        """Test ?background=1 returns the job and the job endpoints report it"""
+        with self.settings(DELETION_JOBS_IN_THREAD=False, DELETION_BATCH_PAUSE=0):
+            response = self.client.delete(
+                reverse('college-update-delete', kwargs={'pk': self.college.pk}) + '?background=1'
+            )
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['target_type'], 'college')
+        self.assertFalse(College.objects.filter(pk=self.college.pk).exists())
+
+        response = self.client.get(reverse('deletion-job-detail', kwargs={'pk': response.data['id']}))
+        self.assertEqual(response.data['status'], 'completed')
+        self.assertEqual(response.data['progress'], 1.0)
+        response = self.client.post(reverse('deletion-job-resume', kwargs={'pk': response.data['id']}))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
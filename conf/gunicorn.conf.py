@@ -0,0 +1,112 @@
+"""
+Gunicorn configuration for production.
+
+    gunicorn -c conf/gunicorn.conf.py conf.asgi:application
+
+Uvicorn workers serve the ASGI application. The application is imported
+and warmed up once in the master process, so the workers forked from it
+share that memory copy-on-write instead of each importing their own copy.
+Before every fork the master's objects are moved out of the garbage
+collector's reach (gc.freeze), so collections in the workers don't write
+to those shared pages.
+
+Reload gracefully with `kill -HUP <master pid>`: new workers are forked
+from the already loaded application and old ones finish their requests
+(up to graceful_timeout). To load new code, start a new master with
+`kill -USR2 <master pid>`, then stop the old one with `kill -QUIT`.
+
+With more than one worker the API cache must be shared between them
+(CACHE_BACKEND in settings); the master refuses to start otherwise.
+
+Workers write their Prometheus metrics (core.metrics) to files in
+PROMETHEUS_MULTIPROC_DIR, a fresh temporary directory unless set, so
+/metrics on any worker reports the totals of all of them.
+
+Environment: GUNICORN_BIND, WEB_CONCURRENCY (workers), GUNICORN_PRELOAD,
+GUNICORN_GC_FREEZE, GUNICORN_WORKER_CLASS, PROMETHEUS_MULTIPROC_DIR.
+"""
+import gc
+import os
+import sys
+import tempfile
+
+
+def _cpu_count():
+    # CPUs this process may run on (respects container CPU sets)
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('WEB_CONCURRENCY') or _cpu_count() + 1)
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'uvicorn_worker.UvicornWorker')
+preload_app = os.environ.get('GUNICORN_PRELOAD', '1').lower() not in ('0', 'false', 'no', 'off')
+gc_freeze = preload_app and os.environ.get('GUNICORN_GC_FREEZE', '1').lower() not in ('0', 'false', 'no', 'off')
+
+timeout = 60
+graceful_timeout = 30
+keepalive = 5
+# Recycle workers now and then so slow leaks don't accumulate
+max_requests = 10000
+max_requests_jitter = 1000
+accesslog = '-'
+
+# Before the application (and prometheus_client) is imported
+if not os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+    os.environ['PROMETHEUS_MULTIPROC_DIR'] = tempfile.mkdtemp(prefix='prometheus-')
+
+
+def when_ready(server):
+    if server.cfg.workers > 1:
+        # Cache writes and evictions must reach every worker
+        if not preload_app:
+            import django
+
+            os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'conf.settings')
+            django.setup()
+        from core.cache import check_shared_caches
+
+        check_shared_caches()
+    if not preload_app:
+        return
+    from core.warmup import warm_up
+
+    warmed = warm_up()
+    server.log.info(
+        'Warmed up %(url_patterns)d URL patterns, %(models)d models and %(serializers)d serializers', warmed
+    )
+
+
+def pre_fork(server, worker):
+    # Runs in the master; the collector stays on there. Collecting first
+    # keeps garbage out of the frozen set, and freezing again before each
+    # fork covers what the master allocated since (respawned workers).
+    if gc_freeze:
+        gc.collect()
+        gc.freeze()
+
+
+def post_worker_init(worker):
+    if not preload_app:
+        from core.warmup import warm_up
+
+        warm_up()
+
+
+def worker_exit(server, worker):
+    # Runs in the worker as it exits, including when it is recycled after
+    # max_requests or aborted on timeout, where atexit handlers may not run
+    last_login = sys.modules.get('users.last_login')
+    if last_login is not None:
+        try:
+            last_login.flush_last_logins()
+        except Exception:
+            server.log.exception('Could not flush buffered last_login timestamps')
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
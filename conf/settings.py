@@ -12,6 +12,11 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 
 from pathlib import Path
 
+from decouple import Csv, config
+from django.core.exceptions import ImproperlyConfigured
+
+from core.sqlite import PRODUCTION_PRAGMAS, sqlite_options
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -23,7 +28,7 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 SECRET_KEY = 'django-insecure-*67#r6yw^!dyr1(o+1p-ye1rg)a*grhqbz_-@54*1o19pxsemo'
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = config('DEBUG', default=True, cast=bool)
 
 ALLOWED_HOSTS = ['localhost', '127.0.0.1']
 
@@ -46,6 +51,7 @@ INSTALLED_APPS = [
     'drf_yasg',                     # Yet Another Swagger generator
 
     # apps
+    'core',                         # Shared API infrastructure
     'users',                        # Custom user authentication
     'colleges',
     'departments',
@@ -54,15 +60,19 @@ INSTALLED_APPS = [
     'students',
     'subjects',
     'enrollments',                  # Student course enrollments
+    'schedules',                    # Sections, rooms and meeting times
 ]
 
 MIDDLEWARE = [
+    'core.timing.RequestTimingMiddleware',  # First, so it times everything below
+    'core.metrics.MetricsMiddleware',
     'corsheaders.middleware.CorsMiddleware',  # CORS middleware (should be at the top)
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.routing.ReplicaRoutingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -90,13 +100,80 @@ WSGI_APPLICATION = 'conf.wsgi.application'
 
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
-
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+#
+# Configured from the environment or a .env file (see .env.example):
+# DB_ENGINE is sqlite (the default, DB_NAME is the file) or postgres.
+
+DB_ENGINE = config('DB_ENGINE', default='sqlite')
+
+# Production SQLite profile (core.sqlite): WAL journaling, busy_timeout,
+# mmap and cache pragmas on every connection, and BEGIN IMMEDIATE for
+# transactions. On unless SQLITE_PRODUCTION=0 is set in the environment.
+# Checkpoint the WAL with `manage.py sqlite_maintenance` (e.g. from cron).
+SQLITE_PRODUCTION = config('SQLITE_PRODUCTION', default=True, cast=bool)
+SQLITE_PRAGMAS = dict(PRODUCTION_PRAGMAS)
+
+# PostgreSQL connections: with DB_POOL (the default) every process keeps a
+# psycopg pool of DB_POOL_MIN_SIZE to DB_POOL_MAX_SIZE connections, and a
+# request waits up to DB_POOL_TIMEOUT seconds for a free one. Without it
+# each thread keeps its connection for DB_CONN_MAX_AGE seconds, checked
+# before reuse. Django does not allow both at once.
+DB_POOL = config('DB_POOL', default=True, cast=bool)
+
+if DB_ENGINE == 'sqlite':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': config('DB_NAME', default=str(BASE_DIR / 'db.sqlite3')),
+        }
     }
-}
+    if SQLITE_PRODUCTION:
+        DATABASES['default']['OPTIONS'] = sqlite_options(SQLITE_PRAGMAS)
+elif DB_ENGINE in ('postgres', 'postgresql'):
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': config('DB_NAME', default='school'),
+            'USER': config('DB_USER', default='postgres'),
+            'PASSWORD': config('DB_PASSWORD', default=''),
+            'HOST': config('DB_HOST', default='localhost'),
+            'PORT': config('DB_PORT', default='5432'),
+            'CONN_MAX_AGE': 0 if DB_POOL else config('DB_CONN_MAX_AGE', default=60, cast=int),
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {
+                'pool': {
+                    'min_size': config('DB_POOL_MIN_SIZE', default=2, cast=int),
+                    'max_size': config('DB_POOL_MAX_SIZE', default=10, cast=int),
+                    'timeout': config('DB_POOL_TIMEOUT', default=10, cast=float),
+                },
+            } if DB_POOL else {},
+        }
+    }
+else:
+    raise ImproperlyConfigured(f'Unknown DB_ENGINE {DB_ENGINE!r}, use sqlite or postgres')
+
+# Read replicas (core.routing): DB_REPLICAS lists one entry per replica,
+# a file for SQLite or host[:port] for PostgreSQL, each added as a
+# replica<n> alias with the primary's other settings. Safe-method requests
+# read from a replica unless the user wrote in the last
+# REPLICA_STICKY_SECONDS; the marker lives in REPLICA_STICKY_CACHE_ALIAS,
+# which must be a shared cache when there are several processes (see
+# CACHE_BACKEND).
+DATABASE_REPLICAS = []
+for index, replica in enumerate(config('DB_REPLICAS', default='', cast=Csv()), start=1):
+    alias = f'replica{index}'
+    DATABASES[alias] = {**DATABASES['default'], 'TEST': {'MIRROR': 'default'}}
+    if DB_ENGINE == 'sqlite':
+        DATABASES[alias]['NAME'] = replica
+    else:
+        host, _, port = replica.partition(':')
+        DATABASES[alias]['HOST'] = host
+        DATABASES[alias]['PORT'] = port or DATABASES['default']['PORT']
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ['core.routing.ReplicaRouter']
+REPLICA_STICKY_SECONDS = config('REPLICA_STICKY_SECONDS', default=5, cast=int)
+REPLICA_STICKY_CACHE_ALIAS = 'default'
 
 
 # Password validation
@@ -176,8 +253,84 @@ SIMPLE_JWT = {
     'SLIDING_TOKEN_REFRESH_EXP_CLAIM': 'refresh_exp',
     'SLIDING_TOKEN_LIFETIME': timedelta(minutes=5),
     'SLIDING_TOKEN_REFRESH_LIFETIME': timedelta(days=1),
+
+    'TOKEN_OBTAIN_SERIALIZER': 'users.api.v1.serializers.CustomTokenObtainPairSerializer',
 }
 
+# Login pipeline: at most LOGIN_HASH_WORKERS password checks run at once
+# (users.login.verify_password_limited); the request waits for its check
+LOGIN_HASH_WORKERS = 4            # threads hashing passwords concurrently
+LOGIN_HASH_MAX_PENDING = 64       # logins allowed to queue for a hash thread
+LOGIN_HASH_QUEUE_TIMEOUT = 5      # seconds to wait for a slot before HTTP 429
+
+# last_login write-behind: buffer token-issuance timestamps and write them in
+# one bulk UPDATE instead of one UPDATE per login (flushed on exit too)
+LAST_LOGIN_WRITE_BEHIND = False
+LAST_LOGIN_FLUSH_INTERVAL = 30    # seconds; upper bound on last_login staleness
+LAST_LOGIN_MAX_BUFFER = 500       # flush early once this many logins are buffered
+
+# Caching. API_CACHE_ALIAS selects the backend used for cached API data
+# (access scopes, catalog, list generations, detail payloads). Writes
+# evict entries only from this backend, so with more than one server
+# process it must be shared: CACHE_BACKEND=redis with CACHE_LOCATION
+# redis://host:6379/0, or file with a directory every process can reach.
+# The default locmem cache is private to each process, and
+# conf/gunicorn.conf.py refuses to start several workers on it.
+CACHE_BACKEND = config('CACHE_BACKEND', default='locmem')
+if CACHE_BACKEND == 'locmem':
+    CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'default'}}
+elif CACHE_BACKEND == 'redis':
+    CACHES = {'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': config('CACHE_LOCATION')}}
+elif CACHE_BACKEND == 'file':
+    CACHES = {'default': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': config('CACHE_LOCATION')}}
+else:
+    raise ImproperlyConfigured(f'Unknown CACHE_BACKEND {CACHE_BACKEND!r}, use locmem, redis or file')
+API_CACHE_ALIAS = 'default'
+API_CACHE_TIMEOUT = 300           # seconds; entries are also dropped on writes
+API_CACHE_LOCK_TIMEOUT = 10       # max seconds other requests wait for a rebuild
+
+# Per-user access scopes (users.scope) are cached for this many seconds;
+# they are also invalidated when roles or departments change
+ACCESS_SCOPE_CACHE_TIMEOUT = 300
+
+# The catalog tree (colleges.catalog) is cached until any college,
+# department, course or subject changes, or for this many seconds
+CATALOG_CACHE_TIMEOUT = 3600
+
+# ?with_counts=1 on the department and college lists: count live with
+# grouped subqueries (False) or read the DepartmentSummary table kept by
+# `manage.py refresh_department_summaries` (True, for very large datasets)
+ORG_COUNTS_FROM_SUMMARY = False
+
+# Bulk user provisioning: `manage.py provision_users` hashes passwords
+# across processes for large batches; the API hashes on a thread pool
+# shared by the requests of each web worker (1 = inline)
+PROVISIONING_HASH_WORKERS = None        # None = one process per CPU
+PROVISIONING_PARALLEL_THRESHOLD = 50    # smaller batches are hashed inline
+PROVISIONING_HASH_THREADS = 2
+
+# Timetable generator (schedules.timetable): parallel restarts and the
+# time limit of each. TIMETABLE_SLOT_PATTERNS can replace the default slot
+# patterns with [[(day, 'HH:MM', 'HH:MM'), ...], ...]. Jobs requested
+# through the API (schedules.jobs) run one restart at a time on a thread
+# (False: inline in the request)
+TIMETABLE_WORKERS = None                # None = one process per CPU
+TIMETABLE_TIME_LIMIT = 30               # seconds per restart
+TIMETABLE_JOBS_IN_THREAD = True
+
+# Background deletion of colleges and departments (colleges.deletion):
+# rows per DELETE, pause between batches so other writers get the database,
+# and whether jobs start on a thread (False: run inline in the request)
+DELETION_BATCH_SIZE = 500
+DELETION_BATCH_PAUSE = 0.05             # seconds
+DELETION_JOBS_IN_THREAD = True
+
+# Enrollment archive (enrollments.archive): closed enrollments not updated
+# for this many days are moved to ArchivedEnrollment by
+# `manage.py archive_enrollments`, this many rows per transaction
+ENROLLMENT_ARCHIVE_AFTER_DAYS = 730
+ENROLLMENT_ARCHIVE_BATCH_SIZE = 1000
+
 # CORS Configuration
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",
@@ -191,8 +344,18 @@ CORS_ALLOW_CREDENTIALS = True
 CORS_ALLOW_ALL_ORIGINS = DEBUG  # Only allow all origins in development
 
 
+# API documentation (core.docs) at /api/v1/docs/. `manage.py
+# generate_openapi` writes the OpenAPI document to OPENAPI_SCHEMA_FILE at
+# build time, and it is served from there, cacheable for
+# OPENAPI_CACHE_SECONDS; only with DEBUG is a missing file generated per
+# request. Without API_DOCS the schema generator is never imported.
+API_DOCS = config('API_DOCS', default=True, cast=bool)
+OPENAPI_SCHEMA_FILE = config('OPENAPI_SCHEMA_FILE', default=str(BASE_DIR / 'openapi.json'))
+OPENAPI_CACHE_SECONDS = 300
+
 # Swagger settings
 SWAGGER_SETTINGS = {
+    'SPEC_URL': 'schema-json',
     'SECURITY_DEFINITIONS': {
         'Bearer': {
             'type': 'apiKey',
@@ -218,7 +381,18 @@ SWAGGER_SETTINGS = {
     'DEFAULT_MODEL_RENDERING': 'example'
 }
 
-# Django REST Framework config
+# Django REST Framework config. JSON goes through orjson (core.renderers,
+# core.parsers); the browsable API is only offered with BROWSABLE_API,
+# which defaults to DEBUG
+API_RENDERER_CLASSES = {
+    'production': ('core.renderers.FastJSONRenderer',),
+    'development': (
+        'core.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+}
+BROWSABLE_API = config('BROWSABLE_API', default=DEBUG, cast=bool)
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework_simplejwt.authentication.JWTAuthentication',
@@ -227,14 +401,41 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
-    'DEFAULT_RENDERER_CLASSES': (
-        'rest_framework.renderers.JSONRenderer',
-        'rest_framework.renderers.BrowsableAPIRenderer',
+    'DEFAULT_RENDERER_CLASSES': API_RENDERER_CLASSES['development' if BROWSABLE_API else 'production'],
+    'DEFAULT_PARSER_CLASSES': (
+        'core.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
     ),
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'core.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
 }
 
+# Request instrumentation (core.timing): the share of requests measured,
+# whether they get a Server-Timing header, and the query time (ms) from
+# which a query goes to the slow-query log. Not tied to DEBUG: set
+# REQUEST_TIMING_SAMPLE_RATE=1 and REQUEST_TIMING_HEADER=1 to profile
+REQUEST_TIMING_SAMPLE_RATE = config('REQUEST_TIMING_SAMPLE_RATE', default=0.05, cast=float)
+REQUEST_TIMING_HEADER = config('REQUEST_TIMING_HEADER', default=False, cast=bool)
+SLOW_QUERY_MS = config('SLOW_QUERY_MS', default=100, cast=float)
+
+# /metrics (core.metrics) is readable by admins, and by scrapers sending
+# "Authorization: Bearer <METRICS_TOKEN>" when a token is set
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+
+# Per-request timing lines ('core.timing', INFO) show with LOG_LEVEL=INFO;
+# slow queries ('core.slow_queries') are warnings
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'core': {'handlers': ['console'], 'level': config('LOG_LEVEL', default='WARNING'), 'propagate': False},
+    },
+}
+
 # Rich Logging Configuration
 # LOGGING = {
 #     "version": 1,
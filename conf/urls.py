@@ -14,30 +14,16 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path, include
-from rest_framework import permissions
-from drf_yasg.views import get_schema_view
-from drf_yasg import openapi
+from core.api.v1.views import metrics
 from rest_framework_simplejwt.views import (
     TokenObtainPairView,
     TokenRefreshView,
     TokenVerifyView,
 )
 
-schema_view = get_schema_view(
-    openapi.Info(
-        title="schoolmgmt API Documentation",
-        default_version='v1',
-        description="schoolmgmt API Description",
-        # terms_of_service="https://www.google.com/policies/terms/",
-        # contact=openapi.Contact(email="contact@snippets.local"),
-        # license=openapi.License(name="BSD License"),
-    ),
-    public=True,
-    permission_classes=(permissions.AllowAny,),
-)
-
 urlpatterns = [
     # django admin
     path('admin/', admin.site.urls),
@@ -61,7 +47,13 @@ urlpatterns = [
     path('api/v1/', include('students.api.v1.urls')),
     path('api/v1/', include('subjects.api.v1.urls')),
     path('api/v1/', include('enrollments.api.v1.urls')),
+    path('api/v1/', include('schedules.api.v1.urls')),
+    path('api/v1/', include('core.api.v1.urls')),
     
-    # Swagger
-    path('api/v1/docs/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
+    # Prometheus scrape target (admins or METRICS_TOKEN)
+    path('metrics', metrics, name='metrics'),
 ]
+
+if settings.API_DOCS:
+    # Swagger UI and the pregenerated OpenAPI document (core.docs)
+    urlpatterns.append(path('api/v1/docs/', include('core.docs')))
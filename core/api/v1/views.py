@@ -0,0 +1,71 @@
+import hmac
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpResponse
+from rest_framework.authentication import BaseAuthentication, get_authorization_header
+from rest_framework.decorators import api_view, authentication_classes, permission_classes, renderer_classes
+from rest_framework.permissions import BasePermission, IsAuthenticated
+from rest_framework.renderers import BaseRenderer
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from core.cache import cache_metrics
+from core.metrics import exposition
+from users.permissions import IsAdmin
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, IsAdmin])
+def cache_stats(request):
+    """
+    Cache hits, misses and hit ratio per endpoint (admin only)
+    """
+    return Response(cache_metrics.snapshot())
+
+
+class MetricsTokenAuthentication(BaseAuthentication):
+    """
+    Accept "Authorization: Bearer <METRICS_TOKEN>" from scrapers; any other
+    header is left to the next authentication class
+    """
+
+    def authenticate(self, request):
+        token = getattr(settings, 'METRICS_TOKEN', '')
+        if not token:
+            return None
+        expected = f'Bearer {token}'.encode()
+        if not hmac.compare_digest(get_authorization_header(request), expected):
+            return None
+        return AnonymousUser(), 'metrics-token'
+
+    def authenticate_header(self, request):
+        return 'Bearer realm="metrics"'
+
+
+class HasMetricsToken(BasePermission):
+    def has_permission(self, request, view):
+        return request.auth == 'metrics-token'
+
+
+class PlainTextRenderer(BaseRenderer):
+    """Renders errors of the metrics view; the metrics are an HttpResponse"""
+    media_type = 'text/plain'
+    format = 'txt'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return str(data.get('detail', data) if isinstance(data, dict) else data).encode()
+
+
+@api_view(['GET'])
+@authentication_classes([MetricsTokenAuthentication, *api_settings.DEFAULT_AUTHENTICATION_CLASSES])
+@permission_classes([HasMetricsToken | (IsAuthenticated & IsAdmin)])
+@renderer_classes([PlainTextRenderer])
+def metrics(request):
+    """
+    Request, database, cache and pagination metrics in Prometheus text
+    format, added up across worker processes (admins or METRICS_TOKEN)
+    """
+    body, content_type = exposition()
+    return HttpResponse(body, content_type=content_type)
+
@@ -0,0 +1,41 @@
+import inspect
+
+from asgiref.sync import sync_to_async
+from rest_framework.views import APIView
+
+
+class AsyncAPIView(APIView):
+    """
+    APIView whose handlers are coroutines (async def get(...)), for read
+    endpoints that use the async ORM.
+
+    Authentication, permissions and throttling run as usual, in a worker
+    thread since they may query the database; the handler itself runs on
+    the event loop. Under ASGI a request waiting on the database or a slow
+    client then costs a coroutine instead of a worker thread. Handlers
+    must only touch the database through the async ORM (aget, acount,
+    async for, ...) and serialize objects whose relations were loaded up
+    front, e.g. with core.prefetch.prefetch_for_serializer.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+            response = handler(request, *args, **kwargs)
+            if inspect.isawaitable(response):
+                response = await response
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
@@ -0,0 +1,174 @@
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+
+from core.metrics import observe_cache_lookup
+from core.routing import use_primary
+
+GENERATION_KEY = '{namespace}:generation'
+LOCK_KEY = '{key}:lock'
+
+# Colleges, departments and courses: read on most pages, rarely written
+REFERENCE_NAMESPACE = 'reference'
+
+_MISSING = object()
+
+# Backends whose entries only the process that wrote them can see
+PROCESS_LOCAL_BACKENDS = ('django.core.cache.backends.locmem.LocMemCache',)
+
+
+def get_cache():
+    """
+    Return the cache backend used for API data (API_CACHE_ALIAS, 'default'
+    unless configured otherwise)
+    """
+    return caches[getattr(settings, 'API_CACHE_ALIAS', 'default')]
+
+
+def check_shared_caches():
+    """
+    Raise ImproperlyConfigured when a cache that several server processes
+    must agree on (API_CACHE_ALIAS: cached responses and their
+    invalidation; REPLICA_STICKY_CACHE_ALIAS: the read-your-writes marker)
+    is private to each process, so a write in one would leave the others
+    serving stale data
+    """
+    aliases = {
+        'API_CACHE_ALIAS': getattr(settings, 'API_CACHE_ALIAS', 'default'),
+        'REPLICA_STICKY_CACHE_ALIAS': getattr(settings, 'REPLICA_STICKY_CACHE_ALIAS', 'default'),
+    }
+    local = [
+        f'{name} ({alias!r})' for name, alias in aliases.items()
+        if settings.CACHES.get(alias, {}).get('BACKEND') in PROCESS_LOCAL_BACKENDS
+    ]
+    if local:
+        raise ImproperlyConfigured(
+            f'{", ".join(local)} use a per-process cache, which several workers cannot share; '
+            'set CACHE_BACKEND=redis (or file) and CACHE_LOCATION, or run a single worker'
+        )
+
+
+def _fresh_generation():
+    # Time based, so a generation key that was evicted never restarts at a
+    # number whose entries may still be cached
+    return int(time.time() * 1000)
+
+
+def get_generation(namespace):
+    """
+    Return the current generation number for a cache namespace.
+
+    Keys built with the generation are invalidated all at once by
+    bump_generation(), without having to know or delete them.
+    """
+    return get_cache().get_or_set(GENERATION_KEY.format(namespace=namespace), _fresh_generation, timeout=None)
+
+
+def bump_generation(namespace):
+    """
+    Invalidate every key built with the namespace's current generation
+    """
+    cache = get_cache()
+    key = GENERATION_KEY.format(namespace=namespace)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        generation = _fresh_generation()
+        cache.set(key, generation, timeout=None)
+        return generation
+
+
+class CacheMetrics:
+    """
+    Thread-safe hit/miss counters per endpoint
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+
+    def reset(self):
+        """Clear all counters"""
+        with self._lock:
+            self._counters = {}
+
+    def record(self, endpoint, outcome):
+        """Count one lookup; outcome is 'hit', 'miss' or 'wait'"""
+        with self._lock:
+            counters = self._counters.setdefault(endpoint, {'hit': 0, 'miss': 0, 'wait': 0})
+            counters[outcome] += 1
+        # Also for /metrics, where the counts add up across processes
+        observe_cache_lookup(endpoint, outcome)
+
+    def snapshot(self):
+        """Return the counters and hit ratio of every endpoint"""
+        with self._lock:
+            result = {}
+            for endpoint, counters in sorted(self._counters.items()):
+                lookups = sum(counters.values())
+                # A request that waited for another's rebuild was still served from cache
+                served = counters['hit'] + counters['wait']
+                result[endpoint] = {
+                    'hits': counters['hit'],
+                    'misses': counters['miss'],
+                    'coalesced': counters['wait'],
+                    'hit_ratio': round(served / lookups, 4) if lookups else 0.0,
+                }
+            return result
+
+
+cache_metrics = CacheMetrics()
+
+
+def read_through(key, build, timeout=None, endpoint=None):
+    """
+    Return the cached value for key, building and storing it on a miss.
+
+    Only one caller rebuilds a cold key: the others wait for its result
+    (up to API_CACHE_LOCK_TIMEOUT seconds) instead of all hitting the
+    database at once. The lock is a cache.add() so it also holds across
+    processes when the backend is shared.
+    """
+    cache = get_cache()
+    if timeout is None:
+        timeout = getattr(settings, 'API_CACHE_TIMEOUT', 300)
+    lock_timeout = getattr(settings, 'API_CACHE_LOCK_TIMEOUT', 10)
+    endpoint = endpoint or key
+
+    value = cache.get(key, _MISSING)
+    if value is not _MISSING:
+        cache_metrics.record(endpoint, 'hit')
+        return value
+
+    lock_key = LOCK_KEY.format(key=key)
+    token = uuid.uuid4().hex
+    if not cache.add(lock_key, token, lock_timeout):
+        deadline = time.monotonic() + lock_timeout
+        delay = 0.005
+        while time.monotonic() < deadline:
+            time.sleep(delay)
+            value = cache.get(key, _MISSING)
+            if value is not _MISSING:
+                cache_metrics.record(endpoint, 'wait')
+                return value
+            if cache.add(lock_key, token, lock_timeout):
+                break  # Builder gave up or its lock expired
+            delay = min(delay * 2, 0.1)
+        else:
+            # Builder is too slow; serve a fresh result without caching
+            cache_metrics.record(endpoint, 'miss')
+            return build()
+
+    cache_metrics.record(endpoint, 'miss')
+    try:
+        # What gets cached must not lag behind the write that invalidated it
+        with use_primary():
+            value = build()
+        cache.set(key, value, timeout)
+    finally:
+        if cache.get(lock_key) == token:
+            cache.delete(lock_key)
+    return value
@@ -0,0 +1,355 @@
+import hashlib
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save
+from django.http import Http404
+from rest_framework.permissions import BasePermission
+from rest_framework.response import Response
+
+from core.cache import bump_generation, get_cache, get_generation, read_through
+from core.prefetch import get_query_plan
+from users.scope import get_request_scope
+
+API_KEY = 'api:{namespace}:{generation}:{digest}'
+LIST_NAMESPACE = 'list:{label}'
+
+# Query parameters that don't change the data: ?format= only picks the renderer
+IGNORED_PARAMS = ('format',)
+
+# Namespace -> models whose saves and deletes invalidate it
+_namespace_models = {}
+
+
+def _plan_models(model, plan):
+    """The model and every model its query plan joins or prefetches"""
+    models = {model}
+    for lookup in plan.select_related:
+        models.add(_lookup_target(model, lookup))
+    for _, related_model, related_plan in plan.prefetches:
+        models |= _plan_models(related_model, related_plan)
+    return models
+
+
+def register_response_cache(namespace, models):
+    """
+    Invalidate the cached responses of namespace whenever one of models is
+    saved or deleted
+    """
+    registered = _namespace_models.setdefault(namespace, set())
+    for model in models:
+        if model in registered:
+            continue
+        registered.add(model)
+        receiver = _response_data_changed(namespace)
+        uid = f'response-cache:{namespace}:{model._meta.label_lower}'
+        post_save.connect(receiver, sender=model, weak=False, dispatch_uid=uid)
+        post_delete.connect(receiver, sender=model, weak=False, dispatch_uid=uid)
+
+
+def _response_data_changed(namespace):
+    def receiver(sender, using=None, **kwargs):
+        # Now, so the next read in this transaction misses, and again on
+        # commit, in case another request cached a page read before it
+        bump_generation(namespace)
+        if using and transaction.get_connection(using).in_atomic_block:
+            transaction.on_commit(lambda: bump_generation(namespace), using=using)
+    return receiver
+
+
+def invalidate_response_cache(model):
+    """
+    Drop the cached responses that render model, for writes that send no
+    signals (queryset update(), bulk_create(), ...)
+    """
+    for namespace, models in _namespace_models.items():
+        if model in models:
+            bump_generation(namespace)
+
+
+class CachedReadMixin:
+    """
+    View mixin serving list() and retrieve() through the API cache.
+
+    Responses are cached per URL, normalized query string and (unless
+    cache_vary_on_scope is False) the caller's access scope rather than
+    the user, so every user with the same visibility (say, the teachers of
+    one department) shares the cached pages. Entries live under the
+    generation of cache_namespace (by default one per model), which is
+    bumped when the view's model or any model its serializer renders is
+    saved or deleted, dropping every cached page at once.
+    """
+    cache_namespace = None
+    cache_timeout = None
+    cache_vary_on_scope = True
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        queryset = getattr(cls, 'queryset', None)
+        serializer_class = getattr(cls, 'serializer_class', None)
+        if queryset is not None and serializer_class is not None:
+            model = queryset.model
+            register_response_cache(cls.get_cache_namespace(), _plan_models(model, get_query_plan(serializer_class)))
+
+    @classmethod
+    def get_cache_namespace(cls):
+        if cls.cache_namespace:
+            return cls.cache_namespace
+        return LIST_NAMESPACE.format(label=cls.queryset.model._meta.label_lower)
+
+    def should_cache(self, request):
+        return True
+
+    def get_cache_params(self, request):
+        """
+        The query parameters as sorted (key, value) pairs, without blank
+        values, IGNORED_PARAMS and an explicit first page, so equivalent
+        URLs share an entry
+        """
+        paginator = self.paginator
+        page_param = getattr(paginator, 'page_query_param', None)
+        params = []
+        for key in request.query_params:
+            if key in IGNORED_PARAMS:
+                continue
+            for value in request.query_params.getlist(key):
+                if value == '' or (key == page_param and value == '1'):
+                    continue
+                params.append((key, value))
+        return sorted(params)
+
+    def get_cache_key(self, request):
+        if not self.cache_vary_on_scope:
+            visibility = 'public'
+        elif request.user.is_authenticated:
+            visibility = get_request_scope(request).cache_key
+        else:
+            visibility = 'anonymous'
+        raw = f'{request.get_host()}{request.path}|{self.get_cache_params(request)}|{visibility}'
+        namespace = self.get_cache_namespace()
+        return API_KEY.format(
+            namespace=namespace,
+            generation=get_generation(namespace),
+            digest=hashlib.md5(raw.encode()).hexdigest(),
+        )
+
+    def cached_data(self, request, build):
+        if not self.should_cache(request):
+            return build()
+        match = request.resolver_match
+        return read_through(
+            self.get_cache_key(request),
+            build,
+            timeout=self.cache_timeout,
+            endpoint=match.url_name if match else self.__class__.__name__,
+        )
+
+    def list(self, request, *args, **kwargs):
+        data = self.cached_data(request, lambda: super(CachedReadMixin, self).list(request, *args, **kwargs).data)
+        return Response(data)
+
+    def retrieve(self, request, *args, **kwargs):
+        data = self.cached_data(request, lambda: super(CachedReadMixin, self).retrieve(request, *args, **kwargs).data)
+        return Response(data)
+
+
+OBJECT_KEY = 'object:{label}:{pk}'
+
+# Models with cached detail payloads, and the serializer that renders them
+_object_serializers = {}
+# Model -> [(dependent model, lookup from dependent to model, rendered attnames)]
+_object_dependents = {}
+# Model -> attnames its dependents render (None: unknown, so any save counts)
+_rendered_fields = {}
+
+
+def object_cache_key(model, pk):
+    return OBJECT_KEY.format(label=model._meta.label_lower, pk=pk)
+
+
+def _lookup_target(model, lookup):
+    for name in lookup.split('__'):
+        model = model._meta.get_field(name).related_model
+    return model
+
+
+def _rendered_attnames(plan, lookup, target):
+    """
+    The columns of target a plan renders through lookup, or None when the
+    plan loads the whole row (a property or __str__ may read anything)
+    """
+    if plan.columns is None:
+        return None
+    prefix = lookup + '__'
+    names = {
+        column[len(prefix):] for column in plan.columns
+        if column.startswith(prefix) and '__' not in column[len(prefix):]
+    }
+    if not names:
+        return None
+    return frozenset(target._meta.get_field(name).attname for name in names)
+
+
+def register_object_cache(model, serializer_class):
+    """
+    Register a cached detail payload and derive its dependencies from the
+    serializer's select_related plan: a payload that renders
+    department.name depends on that department, and on nothing else of it
+    """
+    if _object_serializers.get(model) is serializer_class:
+        return
+    _object_serializers[model] = serializer_class
+    _connect(model)
+    plan = get_query_plan(serializer_class)
+    for lookup in plan.select_related:
+        target = _lookup_target(model, lookup)
+        fields = _rendered_attnames(plan, lookup, target)
+        dependents = _object_dependents.setdefault(target, [])
+        if any(entry[:2] == (model, lookup) for entry in dependents):
+            continue
+        dependents.append((model, lookup, fields))
+        rendered = _rendered_fields.get(target, frozenset())
+        _rendered_fields[target] = None if fields is None or rendered is None else rendered | fields
+        _connect(target)
+
+
+def _snapshot(instance):
+    fields = _rendered_fields.get(instance.__class__)
+    if fields:
+        values = instance.__dict__
+        instance._object_cache_values = {name: values[name] for name in fields if name in values}
+
+
+def _changed_fields(instance, update_fields):
+    """
+    The attnames a save may have changed, or None when unknown
+    """
+    if update_fields is not None:
+        opts = instance._meta
+        return {opts.get_field(name).attname for name in update_fields}
+    loaded = instance.__dict__.get('_object_cache_values')
+    if loaded is None:
+        return None
+    values = instance.__dict__
+    return {
+        name for name in _rendered_fields.get(instance.__class__) or ()
+        if name not in loaded or values.get(name) != loaded[name]
+    }
+
+
+def _object_loaded(sender, instance, **kwargs):
+    _snapshot(instance)
+
+
+def _object_saved(sender, instance, created, update_fields=None, using=None, **kwargs):
+    if not created:
+        evict_object(instance, changed=_changed_fields(instance, update_fields), using=using)
+    _snapshot(instance)
+
+
+def _object_deleted(sender, instance, using=None, **kwargs):
+    # Dependents go with the cascade and send their own signals
+    evict_object(instance, fan_out=False, using=using)
+
+
+def _connect(model):
+    # Per model rather than global receivers, so models without cached
+    # payloads keep Django's fast (signal-free) deletes
+    uid = f'object-cache:{model._meta.label_lower}'
+    post_save.connect(_object_saved, sender=model, dispatch_uid=uid)
+    post_delete.connect(_object_deleted, sender=model, dispatch_uid=uid)
+    if _rendered_fields.get(model):
+        post_init.connect(_object_loaded, sender=model, dispatch_uid=uid)
+
+
+def evict_object(instance, fan_out=True, changed=None, using=None):
+    """
+    Drop the cached payload of instance and, with fan_out, of every cached
+    object that renders it (one pk query per dependent model). Dependents
+    that render none of the changed attnames keep their payload.
+
+    Inside a transaction the keys are dropped again on commit, in case
+    another request cached the old row in between.
+    """
+    model = instance.__class__
+    keys = []
+    if model in _object_serializers:
+        keys.append(object_cache_key(model, instance.pk))
+    if fan_out:
+        for dependent, lookup, fields in _object_dependents.get(model, ()):
+            if changed is not None and fields is not None and not changed & fields:
+                continue
+            pks = dependent._default_manager.filter(**{lookup: instance.pk}).values_list('pk', flat=True)
+            keys.extend(object_cache_key(dependent, pk) for pk in pks.iterator())
+    if keys:
+        get_cache().delete_many(keys)
+        if using and transaction.get_connection(using).in_atomic_block:
+            transaction.on_commit(lambda: get_cache().delete_many(keys), using=using)
+    return len(keys)
+
+
+class ObjectCacheMixin:
+    """
+    Detail view mixin caching the serialized payload per model and primary
+    key.
+
+    GET is a read-through, successful PUT/PATCH write the new payload
+    through, and saves or deletes from anywhere evict it (the post_save
+    and post_delete receivers registered by register_object_cache),
+    including payloads of objects that render the changed one. Eviction
+    reaches other processes only through a shared cache backend
+    (CACHE_BACKEND). Scoped views store the row's scope values next to the payload so
+    hits are checked against the caller's scope without a query. Views
+    with object-level permissions bypass the cache.
+    """
+    cache_timeout = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        queryset = getattr(cls, 'queryset', None)
+        serializer_class = getattr(cls, 'serializer_class', None)
+        if queryset is not None and serializer_class is not None:
+            register_object_cache(queryset.model, serializer_class)
+
+    def object_cache_enabled(self):
+        return not any(
+            type(permission).has_object_permission is not BasePermission.has_object_permission
+            for permission in self.get_permissions()
+        )
+
+    def make_cache_entry(self, instance, data):
+        entry = {'data': data}
+        if hasattr(self, 'get_scope_values'):
+            entry['scope'] = self.get_scope_values(instance)
+        return entry
+
+    def retrieve(self, request, *args, **kwargs):
+        if not self.object_cache_enabled():
+            return super().retrieve(request, *args, **kwargs)
+
+        def build():
+            instance = self.get_object()
+            return self.make_cache_entry(instance, self.get_serializer(instance).data)
+
+        lookup = self.kwargs[self.lookup_url_kwarg or self.lookup_field]
+        match = request.resolver_match
+        entry = read_through(
+            object_cache_key(self.get_queryset().model, lookup),
+            build,
+            timeout=self.cache_timeout,
+            endpoint=match.url_name if match else self.__class__.__name__,
+        )
+        if 'scope' in entry and not self.scope_allows(entry['scope']):
+            raise Http404
+        return Response(entry['data'])
+
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        if self.object_cache_enabled():
+            instance = serializer.instance
+            key = object_cache_key(instance.__class__, instance.pk)
+            entry = self.make_cache_entry(instance, serializer.data)
+            timeout = self.cache_timeout if self.cache_timeout is not None else getattr(settings, 'API_CACHE_TIMEOUT', 300)
+            get_cache().set(key, entry, timeout)
+            # Again after the eviction the save queued for commit, if any
+            transaction.on_commit(lambda: get_cache().set(key, entry, timeout))
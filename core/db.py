@@ -0,0 +1,121 @@
+import random
+import threading
+import time
+
+from django.db import DatabaseError, close_old_connections, connections, transaction
+
+from colleges.models import College
+from core.sqlite import summarize
+from courses.models import Course
+from departments.models import Department
+from enrollments.models import Enrollment
+from students.models import Student
+
+GRADES = ('A', 'B+', 'B', 'C', 'D', 'F')
+
+
+def connection_profile(using='default'):
+    """Describe how a database alias connects, for benchmark output"""
+    settings_dict = connections[using].settings_dict
+    pool = settings_dict.get('OPTIONS', {}).get('pool')
+    return {
+        'vendor': connections[using].vendor,
+        'name': str(settings_dict['NAME']),
+        'conn_max_age': settings_dict.get('CONN_MAX_AGE', 0),
+        'health_checks': settings_dict.get('CONN_HEALTH_CHECKS', False),
+        'pool': pool if isinstance(pool, dict) else bool(pool),
+    }
+
+
+def seed_workload(rows=20000, courses=200):
+    """
+    Create one college and department with courses, students and rows
+    enrollments for run_workload; returns (student IDs, enrollment IDs)
+    """
+    college = College.objects.create(name='Benchmark College')
+    department = Department.objects.create(college=college, name='Benchmark Department')
+    course_objects = Course.objects.bulk_create([
+        Course(department=department, name=f'Benchmark Course {i}', code=f'BM{i}')
+        for i in range(courses)
+    ])
+    students = max(rows // 8, 1)
+    student_objects = Student.objects.bulk_create([
+        Student(
+            department=department,
+            first_name=f'First{i}',
+            last_name=f'Last{i}',
+            student_id=f'BM-{i}',
+            email=f'bm{i}@example.com',
+            contact_number='000',
+        )
+        for i in range(students)
+    ], batch_size=1000)
+    # Spread each student's enrollments over distinct courses
+    Enrollment.objects.bulk_create([
+        Enrollment(
+            student=student_objects[i % students],
+            course=course_objects[(i // students + i) % courses],
+        )
+        for i in range(min(rows, students * courses))
+    ], batch_size=1000)
+    return (
+        [student.pk for student in student_objects],
+        list(Enrollment.objects.filter(student__department=department).values_list('pk', flat=True)),
+    )
+
+
+def _worker(write, student_ids, enrollment_ids, deadline, results, seed):
+    rng = random.Random(seed)
+    ops = errors = 0
+    latencies = []
+    try:
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                if write:
+                    with transaction.atomic():
+                        enrollment = Enrollment.objects.get(pk=rng.choice(enrollment_ids))
+                        enrollment.grade = rng.choice(GRADES)
+                        enrollment.save(update_fields=['grade', 'last_updated'])
+                        Student.objects.filter(pk=enrollment.student_id).update(contact_number=str(rng.randrange(1000)))
+                else:
+                    student_id = rng.choice(student_ids)
+                    list(Enrollment.objects.filter(student_id=student_id).select_related('course')[:25])
+                    Enrollment.objects.filter(student_id=student_id, status='enrolled').count()
+            except DatabaseError:
+                errors += 1
+            else:
+                ops += 1
+                latencies.append(time.perf_counter() - started)
+            finally:
+                # End of a "request": CONN_MAX_AGE, health checks and the
+                # pool decide whether the next one reuses the connection
+                close_old_connections()
+    finally:
+        connections.close_all()
+    results.append((write, ops, errors, latencies))
+
+
+def run_workload(student_ids, enrollment_ids, readers=8, writers=2, duration=5.0, seed=0):
+    """
+    Run readers + writers threads of ORM requests against the current
+    database for duration seconds. Readers list a student's enrollments,
+    writers grade one inside a transaction. Every operation ends like a
+    request does, so connection reuse is part of what is measured.
+
+    Returns the same report as core.sqlite.benchmark.
+    """
+    results = []
+    deadline = time.perf_counter() + duration
+    threads = [
+        threading.Thread(
+            target=_worker,
+            args=(i < writers, student_ids, enrollment_ids, deadline, results, seed + i),
+        )
+        for i in range(readers + writers)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return summarize(results, duration)
@@ -0,0 +1,105 @@
+"""
+API documentation: Swagger UI and the OpenAPI document it reads.
+
+Only imported when API_DOCS is on (conf/urls.py) or by generate_openapi,
+so workers don't load the schema generator otherwise.
+"""
+import hashlib
+import os
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.http import Http404, HttpResponse
+from django.urls import path
+from django.utils.cache import add_never_cache_headers, get_conditional_response, patch_cache_control
+from django.views.decorators.http import require_safe
+from drf_yasg import openapi
+from drf_yasg.codecs import OpenAPICodecJson
+from drf_yasg.renderers import SwaggerUIRenderer
+from drf_yasg.views import get_schema_view
+from rest_framework import permissions
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+API_INFO = openapi.Info(
+    title="schoolmgmt API Documentation",
+    default_version='v1',
+    description="schoolmgmt API Description",
+)
+
+schema_view = get_schema_view(
+    API_INFO,
+    public=True,
+    permission_classes=(permissions.AllowAny,),
+)
+
+# (path, mtime) of the schema file and its contents and ETag
+_schema_file = (None, None, None, None)
+
+
+def build_schema(request=None):
+    """
+    Generate the OpenAPI document of every endpoint as JSON bytes, as seen
+    by an anonymous request for it unless request is given. It names no
+    host, so Swagger UI calls the host that served it.
+    """
+    if request is None:
+        request = APIRequestFactory().get('/api/v1/docs/openapi.json')
+        request.user = AnonymousUser()
+    generator = schema_view.generator_class(API_INFO, url='')
+    schema = generator.get_schema(request=Request(request), public=True)
+    return OpenAPICodecJson(validators=[]).encode(schema)
+
+
+def write_schema(filename):
+    """Generate the OpenAPI document into filename (atomically)"""
+    body = build_schema()
+    temporary = f'{filename}.tmp'
+    with open(temporary, 'wb') as schema_file:
+        schema_file.write(body)
+    os.replace(temporary, filename)
+    return body
+
+
+def _load_schema_file(filename):
+    # Read once per process, again only when the file is replaced
+    global _schema_file
+    try:
+        mtime = os.stat(filename).st_mtime_ns
+    except FileNotFoundError:
+        return None, None
+    if _schema_file[:2] != (filename, mtime):
+        with open(filename, 'rb') as schema_file:
+            body = schema_file.read()
+        _schema_file = (filename, mtime, body, '"{}"'.format(hashlib.sha256(body).hexdigest()[:32]))
+    return _schema_file[2:]
+
+
+@require_safe
+def openapi_schema(request):
+    """
+    The OpenAPI document written by `manage.py generate_openapi` to
+    OPENAPI_SCHEMA_FILE, cacheable for OPENAPI_CACHE_SECONDS and revalidated
+    by ETag. Without the file it is generated per request, with DEBUG only.
+    """
+    body, etag = _load_schema_file(settings.OPENAPI_SCHEMA_FILE)
+    if body is None:
+        if not settings.DEBUG:
+            raise Http404('The OpenAPI schema has not been generated (manage.py generate_openapi)')
+        response = HttpResponse(build_schema(request), content_type='application/json')
+        add_never_cache_headers(response)
+        return response
+
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = HttpResponse(body, content_type='application/json')
+    response['ETag'] = etag
+    patch_cache_control(response, public=True, max_age=getattr(settings, 'OPENAPI_CACHE_SECONDS', 300))
+    return response
+
+
+urlpatterns = [
+    # The page only; it loads the document from schema-json (SPEC_URL)
+    path('', schema_view.as_cached_view(renderer_classes=[SwaggerUIRenderer]), name='schema-swagger-ui'),
+    path('openapi.json', openapi_schema, name='schema-json'),
+]
@@ -0,0 +1,256 @@
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import DEFAULT_DB_ALIAS, connections
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.db import seed_workload
+
+# How benchmark_serving starts each server; {workers} and {port} are
+# filled in. Sync gunicorn workers (wsgi) handle one request at a time.
+SERVER_COMMANDS = {
+    'wsgi': [
+        sys.executable, '-m', 'gunicorn', 'conf.wsgi:application',
+        '--workers', '{workers}', '--bind', '127.0.0.1:{port}', '--log-level', 'warning',
+    ],
+    'asgi': [
+        sys.executable, '-m', 'uvicorn', 'conf.asgi:application',
+        '--workers', '{workers}', '--host', '127.0.0.1', '--port', '{port}',
+        '--log-level', 'warning', '--no-access-log',
+    ],
+    # conf/gunicorn.conf.py: uvicorn workers forked from a preloaded master
+    'production': [
+        sys.executable, '-m', 'gunicorn', 'conf.asgi:application', '--config', 'conf/gunicorn.conf.py',
+        '--workers', '{workers}', '--bind', '127.0.0.1:{port}', '--log-level', 'warning', '--access-logfile', os.devnull,
+    ],
+}
+
+
+# Read endpoints the benchmarks request, round robin
+BENCHMARK_PATHS = [
+    '/api/v1/students/{student}/enrollments/',
+    '/api/v1/enrollments/stats/',
+    '/api/v1/auth/profile/',
+]
+
+# Pieces a slow client's request is sent in
+TRICKLE_CHUNKS = 10
+
+
+@contextmanager
+def scratch_site(rows=5000, interactive=True):
+    """
+    Create and seed a scratch test database with an admin user for
+    servers started by start_server; yields (server environment, paths,
+    request headers) and drops the database afterwards
+    """
+    connection = connections[DEFAULT_DB_ALIAS]
+    with tempfile.TemporaryDirectory() as directory:
+        if connection.vendor == 'sqlite':
+            connection.settings_dict['TEST']['NAME'] = os.path.join(directory, 'benchmark.sqlite3')
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=not interactive, serialize=False)
+        try:
+            student_ids, _ = seed_workload(rows=rows)
+            user = get_user_model().objects.create_user(username='benchmark', role='admin', password=None)
+            headers = {'Authorization': f'Bearer {RefreshToken.for_user(user).access_token}'}
+            paths = [path.format(student=student_ids[0]) for path in BENCHMARK_PATHS]
+            # The servers read the scratch database, from the primary only,
+            # and share a cache between their workers
+            env = {
+                'DB_NAME': str(connection.settings_dict['NAME']),
+                'DB_REPLICAS': '',
+                'CACHE_BACKEND': 'file',
+                'CACHE_LOCATION': os.path.join(directory, 'cache'),
+            }
+            connection.close()
+            yield env, paths, headers
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(kind, workers, port, env=None):
+    """Start one of SERVER_COMMANDS in the project directory"""
+    command = [part.format(workers=workers, port=port) for part in SERVER_COMMANDS[kind]]
+    return subprocess.Popen(command, cwd=settings.BASE_DIR, env={**os.environ, **(env or {})})
+
+
+def wait_for_port(port, process, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'Server exited with status {process.returncode}')
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f'Server did not listen on port {port} within {timeout}s')
+
+
+def stop_server(process):
+    process.terminate()
+    try:
+        process.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def worker_pids(pid):
+    """PIDs of the child processes of pid (a server's workers)"""
+    try:
+        with open(f'/proc/{pid}/task/{pid}/children') as children:
+            return [int(child) for child in children.read().split()]
+    except FileNotFoundError:
+        return []
+
+
+def process_memory(pid):
+    """
+    Memory of a process in KiB from /proc/<pid>/smaps_rollup (Linux): rss,
+    pss (shared pages divided among the processes sharing them) and uss
+    (pages only this process uses)
+    """
+    fields = {}
+    with open(f'/proc/{pid}/smaps_rollup') as rollup:
+        for line in rollup:
+            name, _, value = line.partition(':')
+            if value.strip().endswith('kB'):
+                fields[name] = int(value.split()[0])
+    return {
+        'rss': fields['Rss'],
+        'pss': fields['Pss'],
+        'uss': fields['Private_Clean'] + fields['Private_Dirty'],
+    }
+
+
+async def _read_response(reader):
+    """Read one HTTP/1.1 response; returns (status, keep the connection)"""
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError('Connection closed')
+    status = int(status_line.split()[1])
+    length = None
+    chunked = False
+    keep_alive = status_line.startswith(b'HTTP/1.1')
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        name, value = name.strip().lower(), value.strip().lower()
+        if name == 'content-length':
+            length = int(value)
+        elif name == 'transfer-encoding':
+            chunked = 'chunked' in value
+        elif name == 'connection':
+            keep_alive = value != 'close'
+    if chunked:
+        while True:
+            size = int((await reader.readline()).split(b';')[0], 16)
+            await reader.readexactly(size + 2)
+            if not size:
+                break
+    elif length is not None:
+        await reader.readexactly(length)
+    else:
+        await reader.read()
+        keep_alive = False
+    return status, keep_alive
+
+
+async def _send(writer, head, slow):
+    if not slow:
+        writer.write(head)
+        await writer.drain()
+        return
+    # A slow client: the request trickles in over slow seconds
+    step = max(len(head) // TRICKLE_CHUNKS, 1)
+    for start in range(0, len(head), step):
+        writer.write(head[start:start + step])
+        await writer.drain()
+        await asyncio.sleep(slow / TRICKLE_CHUNKS)
+
+
+async def _client(port, requests, deadline, slow, results):
+    connection = None
+    index = 0
+    while time.perf_counter() < deadline:
+        head = requests[index % len(requests)]
+        index += 1
+        started = time.perf_counter()
+        try:
+            if connection is None:
+                connection = await asyncio.open_connection('127.0.0.1', port)
+            reader, writer = connection
+            await _send(writer, head, slow)
+            status, keep_alive = await _read_response(reader)
+        except (OSError, ConnectionError, asyncio.IncompleteReadError, ValueError, IndexError):
+            results.append((None, time.perf_counter() - started))
+            if connection is not None:
+                connection[1].close()
+            connection = None
+            continue
+        results.append((status, time.perf_counter() - started))
+        if not keep_alive:
+            writer.close()
+            connection = None
+    if connection is not None:
+        connection[1].close()
+
+
+async def _run(port, requests, clients, slow_clients, duration, slow):
+    results = []
+    slow_results = []
+    deadline = time.perf_counter() + duration
+    await asyncio.gather(
+        *(_client(port, requests, deadline, 0, results) for _ in range(clients)),
+        *(_client(port, requests, deadline, slow, slow_results) for _ in range(slow_clients)),
+    )
+    return results, slow_results
+
+
+def _summarize(results, duration):
+    latencies = [latency for status, latency in results if status == 200]
+    return {
+        'requests': len(latencies),
+        'per_second': round(len(latencies) / duration, 1),
+        'errors': len(results) - len(latencies),
+        'p50_ms': round(statistics.median(latencies) * 1000, 1) if latencies else 0.0,
+        'p99_ms': round(statistics.quantiles(latencies, n=100)[98] * 1000, 1) if len(latencies) > 1 else 0.0,
+    }
+
+
+def run_load(port, paths, headers=None, clients=50, slow_clients=0, duration=5.0, slow=1.0):
+    """
+    Keep clients concurrent connections busy with GET requests for paths
+    (round robin) for duration seconds, next to slow_clients connections
+    whose every request takes slow seconds to arrive, like clients on a
+    bad network.
+
+    Returns requests, requests per second, errors (non-200 responses and
+    connection failures) and latency percentiles in milliseconds, for the
+    normal clients and under 'slow' for the slow ones.
+    """
+    extra = ''.join(f'{name}: {value}\r\n' for name, value in (headers or {}).items())
+    requests = [
+        f'GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\n{extra}\r\n'.encode('latin-1')
+        for path in paths
+    ]
+    results, slow_results = asyncio.run(_run(port, requests, clients, slow_clients, duration, slow))
+    return dict(_summarize(results, duration), slow=_summarize(slow_results, duration))
@@ -0,0 +1,63 @@
+import os
+import tempfile
+
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from core.db import connection_profile, run_workload, seed_workload
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure concurrent ORM read/write throughput of the configured database on a scratch '
+        'test database; run once per DB_ENGINE to compare SQLite and PostgreSQL'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS, help='Database alias (default: default)')
+        parser.add_argument('--readers', type=int, default=8, help='Reader threads (default: 8)')
+        parser.add_argument('--writers', type=int, default=2, help='Writer threads (default: 2)')
+        parser.add_argument('--duration', type=float, default=5.0, help='Seconds to run (default: 5)')
+        parser.add_argument('--rows', type=int, default=20000, help='Enrollment rows to start with (default: 20000)')
+        parser.add_argument(
+            '--noinput', '--no-input',
+            action='store_false',
+            dest='interactive',
+            help='Drop a leftover scratch database without asking',
+        )
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        profile = connection_profile(options['database'])
+        with tempfile.TemporaryDirectory() as directory:
+            if connection.vendor == 'sqlite':
+                # An in-memory test database can't be shared by threads the
+                # way a file is; benchmark a file next to nothing else
+                connection.settings_dict['TEST']['NAME'] = os.path.join(directory, 'benchmark.sqlite3')
+            old_name = connection.creation.create_test_db(
+                verbosity=0, autoclobber=not options['interactive'], serialize=False
+            )
+            try:
+                student_ids, enrollment_ids = seed_workload(rows=options['rows'])
+                report = run_workload(
+                    student_ids,
+                    enrollment_ids,
+                    readers=options['readers'],
+                    writers=options['writers'],
+                    duration=options['duration'],
+                )
+            finally:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        self.stdout.write(
+            '{vendor}: CONN_MAX_AGE={conn_max_age}, health checks {health_checks}, pool {pool}'.format(**profile)
+        )
+        self.stdout.write(
+            f'{options["readers"]} readers, {options["writers"]} writers, '
+            f'{options["duration"]:g}s, {len(enrollment_ids)} enrollments'
+        )
+        self.stdout.write(f'{"kind":<8}{"ops/s":>10}{"errors":>8}{"p50 ms":>10}{"p99 ms":>10}')
+        for kind in ('reads', 'writes'):
+            row = report[kind]
+            line = f'{kind:<8}{row["per_second"]:>10}{row["errors"]:>8}{row["p50_ms"]:>10}{row["p99_ms"]:>10}'
+            self.stdout.write(self.style.WARNING(line) if row['errors'] else line)
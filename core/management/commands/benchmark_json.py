@@ -0,0 +1,92 @@
+import gc
+import io
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from colleges.models import College
+from core.parsers import FastJSONParser
+from core.renderers import FastJSONRenderer, orjson
+from courses.models import Course
+from departments.models import Department
+from enrollments.api.v1.serializers import EnrollmentSerializer
+from enrollments.models import Enrollment
+from students.models import Student
+
+
+def enrollments(rows):
+    """rows enrollments with their students, courses and departments, built in memory"""
+    now = timezone.now()
+    college = College(id=1, name='Benchmark College')
+    departments = [Department(id=index, college=college, name=f'Department {index}') for index in range(1, 11)]
+    courses = [
+        Course(id=index, department=departments[index % 10], name=f'Course {index}', code=f'C{index:04}')
+        for index in range(1, 201)
+    ]
+    result = []
+    for index in range(1, rows + 1):
+        student = Student(
+            id=index, department=departments[index % 10], first_name=f'First{index}', last_name=f'Last{index}',
+            student_id=f'S{index:07}', email=f's{index}@example.com',
+        )
+        result.append(Enrollment(
+            id=index, student=student, course=courses[index % 200], status='enrolled',
+            enrollment_date=now, last_updated=now, grade='A' if index % 3 else None, notes='',
+        ))
+    return result
+
+
+def page(results):
+    return {'count': len(results), 'next': None, 'previous': None, 'results': results}
+
+
+def best_of(repeat, function):
+    """Best time of repeat calls in milliseconds, without garbage collection (as timeit)"""
+    timings = []
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            function()
+            timings.append(time.perf_counter() - started)
+    finally:
+        gc.enable()
+    return min(timings) * 1000
+
+
+class Command(BaseCommand):
+    help = 'Compare JSON encode and decode time of the stock and orjson renderers on a large enrollment page'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000, help='Enrollments on the page (default: 10000)')
+        parser.add_argument('--repeat', type=int, default=10, help='Runs per measurement; the best counts (default: 10)')
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            self.stdout.write(self.style.WARNING('orjson is not installed: both renderers use the json module'))
+        instances = enrollments(options['rows'])
+        serialize = best_of(options['repeat'], lambda: EnrollmentSerializer(instances, many=True).data)
+        data = page(EnrollmentSerializer(instances, many=True).data)
+        body = JSONRenderer().render(data)
+        if FastJSONRenderer().render(data) != body:
+            self.stdout.write(self.style.WARNING('The renderers produced different output'))
+
+        encode = {
+            'stock': best_of(options['repeat'], lambda: JSONRenderer().render(data)),
+            'orjson': best_of(options['repeat'], lambda: FastJSONRenderer().render(data)),
+        }
+        decode = {
+            'stock': best_of(options['repeat'], lambda: JSONParser().parse(io.BytesIO(body))),
+            'orjson': best_of(options['repeat'], lambda: FastJSONParser().parse(io.BytesIO(body))),
+        }
+        self.stdout.write(f'{options["rows"]} enrollments, {len(body) / 1024:.0f} KiB, best of {options["repeat"]}')
+        self.stdout.write(f'{"":<8}{"stock ms":>10}{"orjson ms":>11}{"speedup":>9}')
+        for name, timings in (('encode', encode), ('decode', decode)):
+            self.stdout.write(
+                f'{name:<8}{timings["stock"]:>10.1f}{timings["orjson"]:>11.1f}'
+                f'{timings["stock"] / timings["orjson"]:>8.1f}x'
+            )
+        self.stdout.write(f'For comparison, EnrollmentSerializer took {serialize:.1f} ms')
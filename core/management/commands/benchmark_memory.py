@@ -0,0 +1,73 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.loadtest import (
+    free_port, process_memory, run_load, scratch_site, start_server, stop_server, wait_for_port, worker_pids,
+)
+
+# (name, GUNICORN_PRELOAD, GUNICORN_GC_FREEZE)
+CONFIGURATIONS = [
+    ('no preload', '0', '0'),
+    ('preload', '1', '0'),
+    ('preload + freeze', '1', '1'),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure the memory of production server workers (conf/gunicorn.conf.py) with and without '
+        'preloading the application and gc.freeze() before fork'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4, help='Server worker processes (default: 4)')
+        parser.add_argument(
+            '--duration',
+            type=float,
+            default=10.0,
+            help=(
+                'Seconds of requests before measuring, long enough for the workers to run full '
+                'garbage collections (default: 10)'
+            ),
+        )
+        parser.add_argument(
+            '--noinput', '--no-input',
+            action='store_false',
+            dest='interactive',
+            help='Drop a leftover scratch database without asking',
+        )
+
+    def handle(self, *args, **options):
+        results = []
+        with scratch_site(rows=1000, interactive=options['interactive']) as (env, paths, headers):
+            for name, preload, freeze in CONFIGURATIONS:
+                port = free_port()
+                process = start_server(
+                    'production',
+                    options['workers'],
+                    port,
+                    env=dict(env, GUNICORN_PRELOAD=preload, GUNICORN_GC_FREEZE=freeze),
+                )
+                try:
+                    wait_for_port(port, process)
+                    deadline = time.monotonic() + 30
+                    while len(worker_pids(process.pid)) < options['workers'] and time.monotonic() < deadline:
+                        time.sleep(0.1)
+                    run_load(port, paths, headers=headers, clients=options['workers'] * 4, duration=options['duration'])
+                    workers = [process_memory(pid) for pid in worker_pids(process.pid)]
+                    master = process_memory(process.pid)
+                finally:
+                    stop_server(process)
+                results.append((name, master, workers))
+
+        self.stdout.write(f'{options["workers"]} workers, KiB per worker (average)')
+        self.stdout.write(f'{"":<18}{"rss":>10}{"pss":>10}{"uss":>10}{"total pss":>12}')
+        uss = {}
+        for name, master, workers in results:
+            average = {key: sum(worker[key] for worker in workers) // len(workers) for key in ('rss', 'pss', 'uss')}
+            total = master['pss'] + sum(worker['pss'] for worker in workers)
+            uss[name] = average['uss']
+            self.stdout.write(f'{name:<18}{average["rss"]:>10}{average["pss"]:>10}{average["uss"]:>10}{total:>12}')
+        saved = uss['no preload'] - uss['preload + freeze']
+        self.stdout.write(self.style.SUCCESS(f'Private memory saved per worker: {saved} KiB'))
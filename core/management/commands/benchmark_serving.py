@@ -0,0 +1,74 @@
+from django.core.management.base import BaseCommand
+
+from core.loadtest import (
+    SERVER_COMMANDS, free_port, run_load, scratch_site, start_server, stop_server, wait_for_port,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare the async read endpoints served by WSGI (gunicorn sync workers) and ASGI (uvicorn) '
+        'under many concurrent, optionally slow, clients'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--server', choices=list(SERVER_COMMANDS), action='append', help='Only run this server (repeatable)')
+        parser.add_argument('--workers', type=int, default=2, help='Server worker processes (default: 2)')
+        parser.add_argument('--clients', type=int, default=50, help='Concurrent connections (default: 50)')
+        parser.add_argument('--duration', type=float, default=5.0, help='Seconds per server (default: 5)')
+        parser.add_argument(
+            '--slow-clients',
+            type=int,
+            default=0,
+            help='Extra connections that each take --slow-ms to send every request (default: 0)',
+        )
+        parser.add_argument(
+            '--slow-ms',
+            type=float,
+            default=1000,
+            help='Milliseconds a slow client takes to send a request (default: 1000)',
+        )
+        parser.add_argument('--rows', type=int, default=5000, help='Enrollment rows to seed (default: 5000)')
+        parser.add_argument(
+            '--noinput', '--no-input',
+            action='store_false',
+            dest='interactive',
+            help='Drop a leftover scratch database without asking',
+        )
+
+    def handle(self, *args, **options):
+        reports = []
+        with scratch_site(rows=options['rows'], interactive=options['interactive']) as (env, paths, headers):
+            for kind in options['server'] or list(SERVER_COMMANDS):
+                port = free_port()
+                process = start_server(kind, options['workers'], port, env=env)
+                try:
+                    wait_for_port(port, process)
+                    report = run_load(
+                        port,
+                        paths,
+                        headers=headers,
+                        clients=options['clients'],
+                        slow_clients=options['slow_clients'],
+                        duration=options['duration'],
+                        slow=options['slow_ms'] / 1000,
+                    )
+                finally:
+                    stop_server(process)
+                reports.append((kind, report))
+
+        self.stdout.write(
+            f'{options["workers"]} workers, {options["clients"]} clients, {options["slow_clients"]} slow clients '
+            f'({options["slow_ms"]:g} ms per request), {options["duration"]:g}s per server'
+        )
+        self.stdout.write(f'{"server":<8}{"clients":<9}{"req/s":>10}{"errors":>8}{"p50 ms":>10}{"p99 ms":>10}')
+        for kind, report in reports:
+            rows = [('normal', report)]
+            if options['slow_clients']:
+                rows.append(('slow', report['slow']))
+            for clients, row in rows:
+                line = (
+                    f'{kind:<8}{clients:<9}{row["per_second"]:>10}{row["errors"]:>8}'
+                    f'{row["p50_ms"]:>10}{row["p99_ms"]:>10}'
+                )
+                self.stdout.write(self.style.WARNING(line) if row['errors'] else line)
@@ -0,0 +1,40 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.sqlite import benchmark, sqlite_options
+
+
+class Command(BaseCommand):
+    help = 'Compare concurrent read/write throughput of SQLite with default and production settings'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--readers', type=int, default=8, help='Reader threads (default: 8)')
+        parser.add_argument('--writers', type=int, default=2, help='Writer threads (default: 2)')
+        parser.add_argument('--duration', type=float, default=5.0, help='Seconds per run (default: 5)')
+        parser.add_argument('--rows', type=int, default=20000, help='Enrollment rows to start with (default: 20000)')
+
+    def handle(self, *args, **options):
+        profiles = [
+            ('default', {}),
+            ('production', sqlite_options(getattr(settings, 'SQLITE_PRAGMAS', None))),
+        ]
+        self.stdout.write(
+            f'{options["readers"]} readers, {options["writers"]} writers, '
+            f'{options["duration"]:g}s per run, {options["rows"]} rows'
+        )
+        self.stdout.write(f'{"profile":<12}{"kind":<8}{"ops/s":>10}{"errors":>8}{"p50 ms":>10}{"p99 ms":>10}')
+        for name, db_options in profiles:
+            report = benchmark(
+                db_options,
+                readers=options['readers'],
+                writers=options['writers'],
+                duration=options['duration'],
+                rows=options['rows'],
+            )
+            for kind in ('reads', 'writes'):
+                row = report[kind]
+                line = (
+                    f'{name:<12}{kind:<8}{row["per_second"]:>10}{row["errors"]:>8}'
+                    f'{row["p50_ms"]:>10}{row["p99_ms"]:>10}'
+                )
+                self.stdout.write(self.style.WARNING(line) if row['errors'] else line)
@@ -0,0 +1,45 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from core.sqlite import CHECKPOINT_MODES, run_maintenance
+
+
+class Command(BaseCommand):
+    help = 'Checkpoint the SQLite write-ahead log and run PRAGMA optimize'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS, help='Database alias (default: default)')
+        parser.add_argument(
+            '--mode',
+            choices=[mode.lower() for mode in CHECKPOINT_MODES],
+            default='truncate',
+            help='wal_checkpoint mode; truncate also shrinks the -wal file (default: truncate)',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=None,
+            help='Keep running, once every this many seconds (default: run once)',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            result = run_maintenance(using=options['database'], mode=options['mode'])
+            if result is None:
+                raise CommandError(f'Database {options["database"]!r} is not SQLite')
+            if result['wal_pages'] < 0:
+                self.stdout.write(self.style.WARNING('Database is not in WAL mode; ran PRAGMA optimize only'))
+            elif result['busy']:
+                self.stdout.write(self.style.WARNING(
+                    f'Checkpoint blocked by readers: {result["checkpointed_pages"]} of '
+                    f'{result["wal_pages"]} WAL pages copied'
+                ))
+            else:
+                self.stdout.write(self.style.SUCCESS(
+                    f'Checkpointed {result["checkpointed_pages"]} WAL pages and optimized'
+                ))
+            if options['interval'] is None:
+                return
+            time.sleep(options['interval'])
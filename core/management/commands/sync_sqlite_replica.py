@@ -0,0 +1,38 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from core.routing import replica_aliases
+from core.sqlite import copy_database
+
+
+class Command(BaseCommand):
+    help = 'Copy the SQLite primary database to the replica files in DB_REPLICAS (for local replica testing)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=None,
+            help='Keep copying, once every this many seconds, to simulate replication lag (default: copy once)',
+        )
+
+    def handle(self, *args, **options):
+        primary = connections[DEFAULT_DB_ALIAS]
+        if primary.vendor != 'sqlite':
+            raise CommandError('The primary database is not SQLite')
+        targets = [
+            connections[alias].settings_dict['NAME']
+            for alias in replica_aliases()
+            if connections[alias].vendor == 'sqlite'
+        ]
+        if not targets:
+            raise CommandError('No SQLite replicas configured; set DB_REPLICAS, e.g. DB_REPLICAS=db-replica.sqlite3')
+        while True:
+            for target in targets:
+                copy_database(primary.settings_dict['NAME'], target)
+            self.stdout.write(self.style.SUCCESS(f'Copied {primary.settings_dict["NAME"]} to {", ".join(map(str, targets))}'))
+            if options['interval'] is None:
+                return
+            time.sleep(options['interval'])
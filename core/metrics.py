@@ -0,0 +1,133 @@
+import os
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest, multiprocess,
+)
+
+# Under gunicorn every worker writes its samples to files in
+# PROMETHEUS_MULTIPROC_DIR (conf/gunicorn.conf.py sets it), and a scrape of
+# any worker adds up all of them. Must be set before prometheus_client is
+# imported.
+MULTIPROCESS_DIR_ENV = 'PROMETHEUS_MULTIPROC_DIR'
+
+REQUEST_LATENCY = Histogram(
+    'http_request_duration_seconds',
+    'Time to handle a request, by URL name',
+    ['url_name', 'method'],
+)
+REQUEST_ERRORS = Counter(
+    'http_request_errors_total',
+    'Responses with a 4xx or 5xx status, by URL name',
+    ['url_name', 'status'],
+)
+DB_QUERIES = Histogram(
+    'http_request_db_queries',
+    'SQL queries per request, by URL name',
+    ['url_name'],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 200, 500),
+)
+CACHE_LOOKUPS = Counter(
+    'api_cache_lookups_total',
+    'API cache lookups (core.cache.read_through) by endpoint and outcome: hit, miss, or wait (served by another rebuild)',
+    ['endpoint', 'outcome'],
+)
+PAGE_NUMBER = Histogram(
+    'api_page_number',
+    'Page requested from paginated lists, by URL name',
+    ['url_name'],
+    buckets=(1, 2, 3, 5, 10, 20, 50, 100, 500, 1000),
+)
+
+# URL name label for requests that resolved to no named pattern
+UNNAMED = 'unnamed'
+
+_queries = ContextVar('request_queries', default=None)
+
+
+def url_name(request):
+    match = getattr(request, 'resolver_match', None)
+    return (match.url_name if match else None) or UNNAMED
+
+
+def count_queries(execute, sql, params, many, context):
+    """Database execute wrapper counting the queries of the current request"""
+    counter = _queries.get()
+    if counter is not None:
+        counter[0] += 1
+    return execute(sql, params, many, context)
+
+
+def install_query_counter(sender, connection, **kwargs):
+    """connection_created receiver adding count_queries to every connection"""
+    if count_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(count_queries)
+
+
+def observe_page(request, number):
+    """Record the page number a paginated list was asked for"""
+    PAGE_NUMBER.labels(url_name(request)).observe(number)
+
+
+def observe_cache_lookup(endpoint, outcome):
+    CACHE_LOOKUPS.labels(endpoint, outcome).inc()
+
+
+def exposition():
+    """
+    The metrics in Prometheus text format, and their content type. In
+    multiprocess mode the samples of every worker are added up.
+    """
+    if os.environ.get(MULTIPROCESS_DIR_ENV):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+class MetricsMiddleware:
+    """
+    Record every request's latency, SQL query count and error status for
+    the /metrics endpoint, labeled by URL name
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        counter = [0]
+        token = _queries.set(counter)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _queries.reset(token)
+        self.observe(request, response, time.perf_counter() - started, counter[0])
+        return response
+
+    async def __acall__(self, request):
+        counter = [0]
+        token = _queries.set(counter)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _queries.reset(token)
+        self.observe(request, response, time.perf_counter() - started, counter[0])
+        return response
+
+    def observe(self, request, response, seconds, queries):
+        name = url_name(request)
+        REQUEST_LATENCY.labels(name, request.method).observe(seconds)
+        DB_QUERIES.labels(name).observe(queries)
+        if response.status_code >= 400:
+            REQUEST_ERRORS.labels(name, str(response.status_code)).inc()
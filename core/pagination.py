@@ -0,0 +1,34 @@
+import time
+
+from rest_framework.pagination import PageNumberPagination as BasePageNumberPagination
+
+from core.metrics import observe_page
+from core.timing import current_timing
+
+
+class PageNumberPagination(BasePageNumberPagination):
+    """
+    PageNumberPagination that records the page asked for (core.metrics)
+    and times the serializer for core.timing.
+
+    List views serialize the page between paginate_queryset() and
+    get_paginated_response(), so the time in between, minus any SQL, is the
+    serializer's ('serialize' in Server-Timing).
+    """
+
+    def paginate_queryset(self, queryset, request, view=None):
+        page = super().paginate_queryset(queryset, request, view)
+        if page is not None:
+            observe_page(request, self.page.number)
+        timing = current_timing()
+        if timing is not None:
+            self._serialize_started = (time.perf_counter(), timing.db)
+        return page
+
+    def get_paginated_response(self, data):
+        timing = current_timing()
+        started = getattr(self, '_serialize_started', None)
+        if timing is not None and started is not None:
+            timing.add('serialize', time.perf_counter() - started[0] - (timing.db - started[1]))
+            self._serialize_started = None
+        return super().get_paginated_response(data)
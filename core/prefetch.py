@@ -0,0 +1,186 @@
+import re
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+DISPLAY_METHOD = re.compile(r'get_(\w+)_display')
+
+
+def _join(*parts):
+    return '__'.join(part for part in parts if part)
+
+
+class QueryPlan:
+    """
+    The select_related, prefetch_related and only() lookups needed to render
+    a serializer without per-row queries.
+
+    columns is None when the serializer reads something the planner cannot
+    see through (a method field, a property, ...), in which case every
+    column is loaded. Fields a view adds with annotate() can be listed in
+    the serializer's Meta.annotated_fields so they don't count as such.
+    """
+    def __init__(self, select_related=(), prefetches=(), columns=None):
+        self.select_related = tuple(select_related)
+        self.prefetches = tuple(prefetches)
+        self.columns = tuple(columns) if columns is not None else None
+
+    def __repr__(self):
+        return '<QueryPlan select_related={} prefetch_related={} only={}>'.format(
+            list(self.select_related),
+            [lookup for lookup, _, _ in self.prefetches],
+            list(self.columns) if self.columns is not None else None,
+        )
+
+    def apply(self, queryset, restrict_columns=True):
+        """
+        Apply the plan to queryset; restrict_columns=False skips only() for
+        querysets whose instances will be saved
+        """
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        for lookup, model, plan in self.prefetches:
+            # Build the inner queryset per call; Prefetch objects keep state
+            queryset = queryset.prefetch_related(
+                Prefetch(lookup, queryset=plan.apply(model._default_manager.all(), restrict_columns))
+            )
+        if restrict_columns and self.columns is not None:
+            queryset = queryset.only(*self.columns)
+        return queryset
+
+
+class _Planner:
+    """
+    Walks serializer fields and their dotted sources against the model
+    """
+    def __init__(self, model):
+        self.model = model
+        self.select_related = set()
+        self.prefetches = []
+        self.columns = set()
+        self.full = set()
+
+    def plan(self):
+        if '' in self.full:
+            columns = None
+        else:
+            columns = {
+                column for column in self.columns
+                if not any(column.startswith(prefix + '__') for prefix in self.full)
+            }
+        return QueryPlan(sorted(self.select_related), self.prefetches, sorted(columns) if columns is not None else None)
+
+    def add_serializer(self, serializer, model, prefix=''):
+        annotated = getattr(getattr(serializer, 'Meta', None), 'annotated_fields', ())
+        for name, field in serializer.fields.items():
+            if field.write_only or name in annotated:
+                continue
+            if field.source == '*':
+                if isinstance(field, serializers.BaseSerializer):
+                    self.add_serializer(field, model, prefix)
+                else:
+                    self.full.add(prefix)
+                continue
+            self.add_source(field, field.source_attrs, model, prefix)
+
+    def add_source(self, field, attrs, model, prefix):
+        for index, attr in enumerate(attrs):
+            last = index == len(attrs) - 1
+            try:
+                model_field = model._meta.get_field(attr)
+            except FieldDoesNotExist:
+                display = DISPLAY_METHOD.fullmatch(attr)
+                if display and self._has_field(model, display.group(1)):
+                    self.columns.add(_join(prefix, display.group(1)))
+                else:
+                    # A property or method: its inputs are unknown
+                    self.full.add(prefix)
+                return
+
+            path = _join(prefix, model_field.name)
+            if not model_field.is_relation:
+                self.columns.add(path)
+                return
+
+            if model_field.many_to_one or (model_field.one_to_one and model_field.concrete):
+                self.columns.add(path)
+                if last and isinstance(field, serializers.PrimaryKeyRelatedField):
+                    # Rendered from the local <field>_id column alone
+                    return
+                self.select_related.add(path)
+            elif model_field.one_to_one:
+                self.select_related.add(path)
+            else:
+                self.add_prefetch(field if last else None, model_field, path)
+                return
+
+            model, prefix = model_field.related_model, path
+            if last:
+                if isinstance(field, serializers.BaseSerializer):
+                    self.add_serializer(field, model, prefix)
+                else:
+                    self.full.add(prefix)
+
+    def add_prefetch(self, field, model_field, path):
+        related_model = model_field.related_model
+        child = _Planner(related_model)
+        if isinstance(field, serializers.ListSerializer):
+            child.add_serializer(field.child, related_model)
+        elif isinstance(field, serializers.ManyRelatedField) and \
+                isinstance(field.child_relation, serializers.PrimaryKeyRelatedField):
+            child.columns.add(related_model._meta.pk.name)
+        else:
+            child.full.add('')
+        if model_field.one_to_many:
+            # The prefetch joins rows back to their parent on this column
+            child.columns.add(model_field.field.name)
+        self.prefetches.append((path, related_model, child.plan()))
+
+    @staticmethod
+    def _has_field(model, name):
+        try:
+            model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return False
+        return True
+
+
+@lru_cache(maxsize=None)
+def get_query_plan(serializer_class):
+    """
+    Return the QueryPlan for a ModelSerializer class (computed once)
+    """
+    meta = getattr(serializer_class, 'Meta', None)
+    model = getattr(meta, 'model', None)
+    if model is None:
+        return QueryPlan()
+    planner = _Planner(model)
+    planner.add_serializer(serializer_class(), model)
+    return planner.plan()
+
+
+def prefetch_for_serializer(queryset, serializer_class, restrict_columns=True):
+    """
+    Load everything serializer_class renders for queryset, and nothing else
+    """
+    return get_query_plan(serializer_class).apply(queryset, restrict_columns)
+
+
+class AutoPrefetchMixin:
+    """
+    View mixin that plans get_queryset() from the view's serializer.
+
+    Related rows the serializer reads through dotted sources or nested
+    serializers are joined or prefetched, and reads fetch only the rendered
+    columns. Writes load full rows so save() and validation see every field.
+    """
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        return prefetch_for_serializer(
+            queryset,
+            self.get_serializer_class(),
+            restrict_columns=self.request.method in SAFE_METHODS,
+        )
@@ -0,0 +1,41 @@
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # Optional; JSON then goes through the json module
+    orjson = None
+
+# Datetimes go through DRF's encoder ('Z' for UTC) like everything else
+# orjson doesn't handle natively: lazy strings, Decimal, date, time, ...
+ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME if orjson else 0
+
+_encoder = JSONEncoder()
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer encoding with orjson, several times faster on large lists.
+
+    The output is the same as JSONRenderer's: compact UTF-8 with \\u2028
+    and \\u2029 escaped, and the types orjson doesn't handle natively are
+    converted by DRF's encoder. Pretty printing (?indent, the browsable
+    API), UNICODE_JSON = False and data orjson rejects (integers beyond 64
+    bits, non-string keys) fall back to JSONRenderer, as does everything
+    when orjson isn't installed.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=_encoder.default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Escape U+2028 and U+2029 like JSONRenderer; both start with byte
+        # E2, and a one-byte search is far cheaper than two replace() scans
+        if b'\xe2' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
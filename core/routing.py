@@ -0,0 +1,166 @@
+import random
+from contextlib import contextmanager
+
+from asgiref.local import Local
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils.functional import LazyObject, empty
+from rest_framework.permissions import SAFE_METHODS
+
+# Set while a user's writes may not have reached the replicas yet
+STICKY_KEY = 'db-primary:{user_id}'
+
+_state = Local()
+
+
+def replica_aliases():
+    """Database aliases of the read replicas (DATABASE_REPLICAS)"""
+    return list(getattr(settings, 'DATABASE_REPLICAS', []))
+
+
+def replica_alias():
+    """A replica alias to read from, or the primary when there are none"""
+    replicas = replica_aliases()
+    return random.choice(replicas) if replicas else DEFAULT_DB_ALIAS
+
+
+def _sticky_cache():
+    # Must be shared between processes for stickiness to hold across them
+    return caches[getattr(settings, 'REPLICA_STICKY_CACHE_ALIAS', 'default')]
+
+
+@contextmanager
+def _routing(target):
+    previous = getattr(_state, 'target', None)
+    _state.target = target
+    try:
+        yield
+    finally:
+        _state.target = previous
+
+
+def use_primary():
+    """Context manager (or decorator) sending reads to the primary"""
+    return _routing(DEFAULT_DB_ALIAS)
+
+
+def use_replica():
+    """
+    Context manager (or decorator) sending reads to a replica, for
+    reporting code that tolerates a little replication lag
+    """
+    return _routing('replica')
+
+
+def _request_user(request):
+    """
+    The user of request once authentication has run, else None. Doesn't
+    trigger authentication: that lookup is itself a read being routed.
+    """
+    user = request.__dict__.get('user')
+    if isinstance(user, LazyObject) and user._wrapped is empty:
+        return None
+    return user
+
+
+def _request_reads_from_primary(request):
+    if request.method not in SAFE_METHODS:
+        return True  # Writes and whatever the response reads back
+    sticky = getattr(request, '_reads_from_primary', None)
+    if sticky is not None:
+        return sticky
+    user = _request_user(request)
+    if user is None or not user.is_authenticated:
+        return False
+    request._reads_from_primary = _sticky_cache().get(STICKY_KEY.format(user_id=user.pk)) is not None
+    return request._reads_from_primary
+
+
+def stick_to_primary(user):
+    """Read user's requests from the primary for REPLICA_STICKY_SECONDS"""
+    timeout = getattr(settings, 'REPLICA_STICKY_SECONDS', 5)
+    if timeout and user is not None and user.is_authenticated:
+        _sticky_cache().set(STICKY_KEY.format(user_id=user.pk), 1, timeout)
+
+
+class ReplicaRouter:
+    """
+    Database router for read replicas.
+
+    Writes always go to the primary. Reads go to a replica only inside a
+    safe-method (GET, HEAD, OPTIONS) request of a user who has not written
+    in the last REPLICA_STICKY_SECONDS, or inside use_replica(). Everything
+    else, including management commands and reads inside a transaction on
+    the primary, reads from the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        replicas = replica_aliases()
+        if not replicas:
+            return DEFAULT_DB_ALIAS
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        target = getattr(_state, 'target', None)
+        if target == DEFAULT_DB_ALIAS:
+            return DEFAULT_DB_ALIAS
+        if target != 'replica':
+            request = getattr(_state, 'request', None)
+            if request is None or _request_reads_from_primary(request):
+                return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True  # Replicas hold the same data as the primary
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in replica_aliases()
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Let ReplicaRouter see the current request, and keep the user on the
+    primary for a while after a successful write
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not replica_aliases():
+            return self.get_response(request)
+        previous = getattr(_state, 'request', None)
+        _state.request = request
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.request = previous
+        if self.wrote(request, response):
+            stick_to_primary(_request_user(request))
+        return response
+
+    async def __acall__(self, request):
+        if not replica_aliases():
+            return await self.get_response(request)
+        previous = getattr(_state, 'request', None)
+        _state.request = request
+        try:
+            response = await self.get_response(request)
+        finally:
+            _state.request = previous
+        if self.wrote(request, response):
+            await sync_to_async(stick_to_primary)(_request_user(request))
+        return response
+
+    def wrote(self, request, response):
+        return request.method not in SAFE_METHODS and response.status_code < 400
@@ -0,0 +1,231 @@
+import os
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+
+from django.db import connections
+
+# Applied to every new connection by the production profile (see
+# sqlite_options). journal_mode=WAL lets readers run alongside the single
+# writer; synchronous=NORMAL is durable in WAL mode except for the last
+# transactions on power loss; a negative cache_size is in KiB.
+PRODUCTION_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,           # ms
+    'cache_size': -65536,           # 64 MiB per connection
+    'mmap_size': 268435456,         # 256 MiB
+    'temp_store': 'MEMORY',
+}
+
+CHECKPOINT_MODES = ('PASSIVE', 'FULL', 'RESTART', 'TRUNCATE')
+
+
+def pragma_command(pragmas):
+    """Return the PRAGMA statements for a {name: value} dict, ';' separated"""
+    return ';'.join(f'PRAGMA {name}={value}' for name, value in pragmas.items())
+
+
+def sqlite_options(pragmas=None):
+    """
+    Return OPTIONS for a sqlite3 DATABASES entry that apply pragmas (merged
+    over PRODUCTION_PRAGMAS) on every new connection.
+
+    Transactions start with BEGIN IMMEDIATE, so a request that writes takes
+    the write lock up front and waits up to busy_timeout for it, instead of
+    failing with "database is locked" when it tries to upgrade a read lock
+    another writer is waiting on.
+    """
+    pragmas = {**PRODUCTION_PRAGMAS, **(pragmas or {})}
+    return {
+        'init_command': pragma_command(pragmas),
+        'transaction_mode': 'IMMEDIATE',
+        'timeout': int(pragmas['busy_timeout']) / 1000,
+    }
+
+
+def run_maintenance(using='default', mode='TRUNCATE'):
+    """
+    Checkpoint the WAL into the database file and let SQLite refresh the
+    statistics of tables whose contents changed a lot (PRAGMA optimize).
+
+    Returns {'busy', 'wal_pages', 'checkpointed_pages'}, or None when the
+    database is not SQLite. wal_pages is -1 when the database is not in
+    WAL mode. busy is True when readers kept the checkpoint from finishing;
+    it is retried on the next run.
+    """
+    mode = mode.upper()
+    if mode not in CHECKPOINT_MODES:
+        raise ValueError(f'Unknown checkpoint mode {mode!r}')
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(f'PRAGMA wal_checkpoint({mode})')
+        busy, wal_pages, checkpointed = cursor.fetchone()
+        cursor.execute('PRAGMA optimize')
+    return {'busy': bool(busy), 'wal_pages': wal_pages, 'checkpointed_pages': checkpointed}
+
+
+def copy_database(source, target):
+    """
+    Copy the SQLite database at source to target with the online backup
+    API, which gives a consistent snapshot while source is being written
+    """
+    source_conn = sqlite3.connect(source)
+    target_conn = sqlite3.connect(target)
+    try:
+        source_conn.backup(target_conn)
+    finally:
+        target_conn.close()
+        source_conn.close()
+
+
+# Benchmark
+
+BENCHMARK_SCHEMA = """
+CREATE TABLE student (id INTEGER PRIMARY KEY, department_id INTEGER NOT NULL, name TEXT NOT NULL);
+CREATE TABLE enrollment (
+    id INTEGER PRIMARY KEY,
+    student_id INTEGER NOT NULL REFERENCES student (id),
+    course_id INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    grade TEXT NOT NULL DEFAULT '',
+    last_updated REAL NOT NULL
+);
+CREATE INDEX enrollment_student ON enrollment (student_id);
+CREATE INDEX enrollment_course ON enrollment (course_id, status);
+CREATE INDEX student_department ON student (department_id);
+"""
+
+
+def _create_benchmark_database(path, rows):
+    conn = sqlite3.connect(path)
+    conn.executescript(BENCHMARK_SCHEMA)
+    students = max(rows // 8, 1)
+    conn.executemany(
+        'INSERT INTO student (id, department_id, name) VALUES (?, ?, ?)',
+        ((i, i % 50, f'student {i}') for i in range(1, students + 1)),
+    )
+    conn.executemany(
+        'INSERT INTO enrollment (student_id, course_id, status, last_updated) VALUES (?, ?, ?, ?)',
+        ((i % students + 1, i % 400, 'enrolled', time.time()) for i in range(rows)),
+    )
+    conn.commit()
+    conn.close()
+    return students
+
+
+def _connect(path, options):
+    # Same connection settings as Django's sqlite3 backend: autocommit
+    # mode with explicit BEGIN, statements from init_command run once
+    conn = sqlite3.connect(
+        path, timeout=options.get('timeout', 5), isolation_level=None, check_same_thread=False
+    )
+    for statement in options.get('init_command', '').split(';'):
+        if statement.strip():
+            conn.execute(statement)
+    return conn
+
+
+def _worker(path, options, write, students, deadline, results, seed):
+    rng = random.Random(seed)
+    begin = f'BEGIN {options["transaction_mode"]}' if options.get('transaction_mode') else 'BEGIN'
+    ops = errors = 0
+    latencies = []
+    conn = _connect(path, options)
+    try:
+        while time.perf_counter() < deadline:
+            student_id = rng.randint(1, students)
+            started = time.perf_counter()
+            try:
+                if write:
+                    # Read then write in one transaction, like a model save
+                    conn.execute(begin)
+                    try:
+                        conn.execute('SELECT id FROM enrollment WHERE student_id = ?', (student_id,)).fetchall()
+                        conn.execute(
+                            'UPDATE enrollment SET grade = ?, last_updated = ? WHERE student_id = ?',
+                            (rng.choice('ABCDF'), time.time(), student_id),
+                        )
+                        conn.execute(
+                            'INSERT INTO enrollment (student_id, course_id, status, last_updated) VALUES (?, ?, ?, ?)',
+                            (student_id, rng.randrange(400), 'enrolled', time.time()),
+                        )
+                        conn.execute('COMMIT')
+                    except BaseException:
+                        if conn.in_transaction:
+                            conn.execute('ROLLBACK')
+                        raise
+                else:
+                    conn.execute(
+                        'SELECT s.department_id, COUNT(*) FROM enrollment e JOIN student s ON s.id = e.student_id '
+                        'WHERE e.course_id = ? AND e.status = ? GROUP BY s.department_id',
+                        (rng.randrange(400), 'enrolled'),
+                    ).fetchall()
+                    conn.execute('SELECT * FROM enrollment WHERE student_id = ?', (student_id,)).fetchall()
+            except sqlite3.OperationalError:
+                errors += 1
+                continue
+            ops += 1
+            latencies.append(time.perf_counter() - started)
+    finally:
+        conn.close()
+    results.append((write, ops, errors, latencies))
+
+
+def _percentile(values, fraction):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def summarize(results, duration):
+    """
+    Turn per-thread (write, ops, errors, latencies) tuples into the
+    benchmark report: throughput, failures and latency percentiles in
+    milliseconds for reads and writes
+    """
+    report = {}
+    for kind, write in (('reads', False), ('writes', True)):
+        ops = sum(r[1] for r in results if r[0] == write)
+        latencies = [latency for r in results if r[0] == write for latency in r[3]]
+        report[kind] = {
+            'ops': ops,
+            'per_second': round(ops / duration, 1),
+            'errors': sum(r[2] for r in results if r[0] == write),
+            'p50_ms': round(_percentile(latencies, 0.5) * 1000, 2),
+            'p99_ms': round(_percentile(latencies, 0.99) * 1000, 2),
+        }
+    return report
+
+
+def benchmark(options, readers=8, writers=2, duration=5.0, rows=20000, seed=0):
+    """
+    Run readers + writers threads against a fresh SQLite file for duration
+    seconds, each on its own connection opened with a DATABASES OPTIONS
+    dict (e.g. {} for SQLite's defaults or sqlite_options()).
+
+    Returns per-kind throughput, failures ("database is locked") and
+    latency percentiles in milliseconds.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'benchmark.sqlite3')
+        students = _create_benchmark_database(path, rows)
+        results = []
+        deadline = time.perf_counter() + duration
+        threads = [
+            threading.Thread(
+                target=_worker,
+                args=(path, options, i < writers, students, deadline, results, seed + i),
+            )
+            for i in range(readers + writers)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    return summarize(results, duration)
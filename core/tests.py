@@ -0,0 +1,780 @@
+import os
+import tempfile
+from io import StringIO
+from urllib.parse import urlsplit
+from unittest import skipUnless
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve, reverse
+from rest_framework import serializers, status
+from rest_framework.test import APITestCase
+
+from colleges.models import College
+from courses.models import Course
+from departments.models import Department
+from enrollments.models import Enrollment
+from students.models import Student
+from users.models import User
+from core.cache import bump_generation
+from core.db import connection_profile, run_workload, seed_workload
+from core.loadtest import process_memory, worker_pids
+from core.parsers import FastJSONParser
+from core.prefetch import get_query_plan, prefetch_for_serializer
+from core.renderers import FastJSONRenderer
+from core.routing import ReplicaRouter, ReplicaRoutingMiddleware, use_primary, use_replica
+from core.sqlite import PRODUCTION_PRAGMAS, _connect, benchmark, run_maintenance, sqlite_options
+from core.warmup import warm_up
+from enrollments.api.v1.serializers import EnrollmentSerializer
+from students.api.v1.serializers import StudentsSerializer
+from users.api.v1.serializers import UserProfileSerializer
+
+
+class StudentSummarySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Student
+        fields = ['id', 'student_id']
+
+
+class DepartmentRosterSerializer(serializers.ModelSerializer):
+    college = serializers.StringRelatedField()
+    students = StudentSummarySerializer(many=True, read_only=True)
+
+    class Meta:
+        model = Department
+        fields = ['id', 'name', 'college', 'students']
+
+
+class DepartmentMethodSerializer(serializers.ModelSerializer):
+    label = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Department
+        fields = ['id', 'label']
+
+    def get_label(self, obj):
+        return str(obj)
+
+
+def create_catalog(rows=5):
+    college = College.objects.create(name="Plan College")
+    department = Department.objects.create(college=college, name="Plan Dept")
+    for index in range(rows):
+        student = Student.objects.create(
+            department=department,
+            first_name=f"First{index}",
+            last_name=f"Last{index}",
+            student_id=f"P-{index}",
+            email=f"p{index}@example.com",
+            contact_number="123"
+        )
+        course = Course.objects.create(department=department, name=f"Course {index}", code=f"PC{index}")
+        Enrollment.objects.create(student=student, course=course)
+    return college, department
+
+
+class QueryPlanTest(TestCase):
+    """Test cases for serializer-driven query planning"""
+
+    def test_dotted_sources_are_joined(self):
+        """Test dotted sources become select_related and only() columns"""
+        plan = get_query_plan(EnrollmentSerializer)
+        self.assertEqual(plan.select_related, ('course', 'course__department', 'student'))
+        self.assertIn('course__department__name', plan.columns)
+        self.assertIn('student__student_id', plan.columns)
+        self.assertNotIn('student__email', plan.columns)
+
+    def test_write_only_fields_are_ignored(self):
+        """Test write-only fields do not add columns or joins"""
+        plan = get_query_plan(StudentsSerializer)
+        self.assertEqual(plan.select_related, ('department',))
+        self.assertNotIn('department__college', plan.columns)
+
+    def test_display_methods_map_to_their_column(self):
+        """Test get_<field>_display sources load only that field"""
+        plan = get_query_plan(UserProfileSerializer)
+        self.assertIn('role', plan.columns)
+        self.assertNotIn('password', plan.columns)
+
+    def test_nested_many_serializer_is_prefetched(self):
+        """Test nested many=True serializers become planned prefetches"""
+        plan = get_query_plan(DepartmentRosterSerializer)
+        self.assertEqual(plan.select_related, ('college',))
+        (lookup, model, child), = plan.prefetches
+        self.assertEqual(lookup, 'students')
+        self.assertEqual(model, Student)
+        self.assertEqual(set(child.columns), {'department', 'id', 'student_id'})
+
+    def test_nested_many_serializer_query_count(self):
+        """Test rendering nested rows costs one query per relation"""
+        create_catalog()
+        Department.objects.create(college=College.objects.get(), name="Empty Dept")
+        with self.assertNumQueries(2):
+            queryset = prefetch_for_serializer(Department.objects.all(), DepartmentRosterSerializer)
+            data = DepartmentRosterSerializer(queryset, many=True).data
+        self.assertEqual(sum(len(row['students']) for row in data), 5)
+
+    def test_method_fields_load_all_columns(self):
+        """Test opaque fields disable only()"""
+        self.assertIsNone(get_query_plan(DepartmentMethodSerializer).columns)
+
+
+class PlannedListQueryTest(APITestCase):
+    """Test cases for per-row query elimination on list endpoints"""
+
+    def setUp(self):
+        """Set up test data"""
+        from django.core.cache import cache
+        cache.clear()
+        self.college, self.department = create_catalog()
+        self.admin = User.objects.create_user(username='admin', role='admin')
+        self.client.force_authenticate(user=self.admin)
+
+    def assertListQueries(self, url, expected):
+        # Warm the access scope cache first, then drop cached responses
+        self.client.get(url)
+        self.drop_cached_responses(url)
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(context.captured_queries), expected, [q['sql'] for q in context.captured_queries])
+        return response
+
+    def drop_cached_responses(self, url):
+        view = getattr(resolve(urlsplit(url).path).func, 'view_class', None)
+        if hasattr(view, 'get_cache_namespace'):
+            bump_generation(view.get_cache_namespace())
+
+    def test_list_endpoints_do_not_query_per_row(self):
+        """Test list endpoints use a COUNT and a single page query"""
+        for name in ['student-list-create', 'course-list-create', 'department-list-create',
+                     'enrollment-list-create']:
+            response = self.assertListQueries(reverse(name), 2)
+            self.assertGreater(response.data['count'], 0)
+
+    def test_only_rendered_columns_are_selected(self):
+        """Test unrendered columns are deferred"""
+        self.client.get(reverse('student-list-create'))
+        self.drop_cached_responses(reverse('student-list-create'))
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(reverse('student-list-create'))
+        page_sql = context.captured_queries[-1]['sql']
+        self.assertIn('"departments_department"."name"', page_sql)
+        self.assertNotIn('"departments_department"."description"', page_sql)
+
+    def test_by_role_uses_profile_plan(self):
+        """Test the by_role action joins college and department"""
+        for index in range(3):
+            User.objects.create_user(
+                username=f'teacher{index}', role='teacher',
+                college=self.college, department=self.department
+            )
+        response = self.assertListQueries(reverse('users_v1:user-by-role') + '?role=teacher', 2)
+        self.assertEqual(response.data['results'][0]['department_name'], 'Plan Dept')
+
+    def test_updates_load_full_rows(self):
+        """Test writes are not restricted to rendered columns"""
+        student = Student.objects.first()
+        response = self.client.patch(
+            reverse('student-update-delete', args=[student.id]),
+            {'first_name': 'Changed'},
+            format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        student.refresh_from_db()
+        self.assertEqual(student.first_name, 'Changed')
+        self.assertEqual(student.email, 'p0@example.com')
+
+
+class ReadThroughCacheTest(APITestCase):
+    """Test cases for the versioned read-through cache"""
+
+    def setUp(self):
+        from core.cache import cache_metrics, get_cache
+        get_cache().clear()
+        cache_metrics.reset()
+        self.college, self.department = create_catalog(rows=2)
+        self.admin = User.objects.create_user(username='admin', role='admin')
+        self.client.force_authenticate(user=self.admin)
+
+    def test_read_through(self):
+        """Test values are built once and then served from cache"""
+        from core.cache import cache_metrics, read_through
+        calls = []
+        build = lambda: calls.append(1) or 'value'
+        self.assertEqual(read_through('test:key', build, endpoint='test'), 'value')
+        self.assertEqual(read_through('test:key', build, endpoint='test'), 'value')
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(cache_metrics.snapshot()['test']['hit_ratio'], 0.5)
+
+    def test_cold_key_is_rebuilt_once(self):
+        """Test concurrent misses wait for a single rebuild"""
+        import threading
+        import time
+        from core.cache import cache_metrics, read_through
+        calls = []
+
+        def build():
+            calls.append(1)
+            time.sleep(0.2)
+            return 'value'
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(read_through('test:cold', build, endpoint='cold')))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, ['value'] * 8)
+        self.assertEqual(len(calls), 1)
+        stats = cache_metrics.snapshot()['cold']
+        self.assertEqual((stats['misses'], stats['coalesced']), (1, 7))
+
+    def test_list_and_detail_are_cached(self):
+        """Test repeated reads skip the database"""
+        for url in [reverse('college-list-create'), reverse('course-list-create'),
+                    reverse('department-update-delete', args=[self.department.id])]:
+            first = self.client.get(url)
+            with self.assertNumQueries(0):
+                second = self.client.get(url)
+            self.assertEqual(first.data, second.data)
+
+    def test_writes_invalidate(self):
+        """Test saving a related model refreshes cached responses"""
+        url = reverse('course-list-create')
+        self.client.get(url)
+        self.department.name = "Renamed Dept"
+        self.department.save()
+        response = self.client.get(url)
+        self.assertEqual(response.data['results'][0]['department_name'], "Renamed Dept")
+
+    def test_cache_varies_on_scope(self):
+        """Test users with different scopes get different entries"""
+        other = Department.objects.create(college=self.college, name="Other Dept")
+        teacher = User.objects.create_user(username='teacher', role='teacher', department=other)
+        url = reverse('department-list-create')
+        self.assertEqual(self.client.get(url).data['count'], 2)
+        self.client.force_authenticate(user=teacher)
+        self.assertEqual(self.client.get(url).data['count'], 1)
+
+    def test_counts_are_not_cached(self):
+        """Test ?with_counts=1 bypasses the cache"""
+        url = reverse('department-list-create')
+        self.client.get(url, {'with_counts': 1})
+        Student.objects.filter(department=self.department).delete()
+        response = self.client.get(url, {'with_counts': 1})
+        self.assertEqual(response.data['results'][0]['student_count'], 0)
+
+    def test_cache_stats(self):
+        """Test hit ratios are reported per endpoint"""
+        url = reverse('college-list-create')
+        self.client.get(url)
+        self.client.get(url)
+        response = self.client.get(reverse('cache-stats'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['college-list-create']['hits'], 1)
+        self.assertEqual(response.data['college-list-create']['hit_ratio'], 0.5)
+
+
+class ListResponseCacheTest(APITestCase):
+    """Test cases for scope-keyed list response caching"""
+
+    def setUp(self):
+        from core.cache import get_cache
+        get_cache().clear()
+        self.college, self.department = create_catalog(rows=3)
+        self.other = Department.objects.create(college=self.college, name="Other Dept")
+        self.teachers = [
+            User.objects.create_user(username=f'teacher{index}', role='teacher', department=self.department)
+            for index in range(2)
+        ]
+        self.url = reverse('student-list-create')
+
+    def test_same_scope_shares_pages(self):
+        """Test users with identical visibility share a cached page"""
+        self.client.force_authenticate(user=self.teachers[0])
+        first = self.client.get(self.url)
+        self.assertEqual(first.data['count'], 3)
+        self.client.force_authenticate(user=self.teachers[1])
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url)
+        self.assertEqual(first.data, second.data)
+
+    def test_different_scope_is_not_shared(self):
+        """Test a teacher of another department gets their own page"""
+        self.client.force_authenticate(user=self.teachers[0])
+        self.client.get(self.url)
+        outsider = User.objects.create_user(username='outsider', role='teacher', department=self.other)
+        self.client.force_authenticate(user=outsider)
+        self.assertEqual(self.client.get(self.url).data['count'], 0)
+
+    def test_equivalent_query_strings_share_pages(self):
+        """Test ?page=1, ?format=json and blank parameters hit the same entry"""
+        self.client.force_authenticate(user=self.teachers[0])
+        self.client.get(self.url)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, {'page': 1, 'format': 'json', 'search': ''})
+        self.assertEqual(response.data['count'], 3)
+
+    def test_model_changes_invalidate(self):
+        """Test saving the listed model or a rendered one drops cached pages"""
+        self.client.force_authenticate(user=self.teachers[0])
+        self.client.get(self.url)
+        student = Student.objects.get(student_id='P-0')
+        student.first_name = 'Changed'
+        student.save()
+        response = self.client.get(self.url)
+        self.assertIn('Changed', [row['first_name'] for row in response.data['results']])
+        self.department.name = 'Renamed Dept'
+        self.department.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['results'][0]['department_name'], 'Renamed Dept')
+
+    def test_bulk_writes_invalidate_explicitly(self):
+        """Test invalidate_response_cache covers writes without signals"""
+        from core.caching import invalidate_response_cache
+        self.client.force_authenticate(user=self.teachers[0])
+        self.client.get(self.url)
+        Student.objects.filter(department=self.department).update(last_name='Bulk')
+        invalidate_response_cache(Student)
+        response = self.client.get(self.url)
+        self.assertEqual({row['last_name'] for row in response.data['results']}, {'Bulk'})
+
+
+class ObjectCacheTest(APITestCase):
+    """Test cases for cached detail payloads"""
+
+    def setUp(self):
+        from core.cache import cache_metrics, get_cache
+        get_cache().clear()
+        cache_metrics.reset()
+        self.college, self.department = create_catalog(rows=2)
+        self.student = Student.objects.first()
+        self.enrollment = Enrollment.objects.get(student=self.student)
+        self.admin = User.objects.create_user(username='admin', role='admin')
+        self.client.force_authenticate(user=self.admin)
+        self.url = reverse('student-update-delete', args=[self.student.id])
+
+    def test_detail_is_cached(self):
+        """Test repeated detail reads skip the database"""
+        first = self.client.get(self.url)
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url)
+        self.assertEqual(first.data, second.data)
+
+    def test_update_writes_through(self):
+        """Test PATCH stores the new payload"""
+        self.client.get(self.url)
+        response = self.client.patch(self.url, {'first_name': 'Updated'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertEqual(response.data['first_name'], 'Updated')
+
+    def test_related_change_fans_out(self):
+        """Test renaming a department refreshes payloads that render it"""
+        enrollment_url = reverse('enrollment-detail', args=[self.enrollment.id])
+        self.client.get(self.url)
+        self.client.get(enrollment_url)
+        self.department.name = "Renamed Dept"
+        self.department.save()
+        self.assertEqual(self.client.get(self.url).data['department_name'], "Renamed Dept")
+        self.assertEqual(self.client.get(enrollment_url).data['department_name'], "Renamed Dept")
+
+    def test_unrendered_change_keeps_dependents(self):
+        """Test saving a field no dependent renders leaves their payloads cached"""
+        self.client.get(self.url)
+        self.department.description = "Only shown on the department"
+        self.department.save()
+        department = Department.objects.get(pk=self.department.pk)
+        department.description = "Loaded, then changed"
+        department.save()
+        Department.objects.get(pk=self.department.pk).save(update_fields=['description'])
+        with self.assertNumQueries(0):
+            self.client.get(self.url)
+
+    def test_eviction_repeats_on_commit(self):
+        """Test a payload cached before the rename commits is dropped on commit"""
+        from django.db import transaction
+        from core.cache import get_cache
+        from core.caching import object_cache_key
+        stale = self.client.get(self.url).data
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                self.department.name = "Renamed Dept"
+                self.department.save()
+                get_cache().set(object_cache_key(Student, self.student.pk), {'data': stale})
+        self.assertEqual(self.client.get(self.url).data['department_name'], "Renamed Dept")
+
+    def test_delete_evicts(self):
+        """Test deleted objects are no longer served"""
+        self.client.get(self.url)
+        response = self.client.delete(self.url)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cached_payload_respects_scope(self):
+        """Test a cache hit is still checked against the caller's scope"""
+        other = Department.objects.create(college=self.college, name="Other Dept")
+        teacher = User.objects.create_user(username='teacher', role='teacher', department=other)
+        self.client.get(self.url)
+        self.client.force_authenticate(user=teacher)
+        self.client.get(reverse('department-list-create'))  # resolve the teacher's scope
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class SqliteProfileTest(TestCase):
+    def test_options_apply_pragmas(self):
+        """Test the production options set every pragma on a new connection"""
+        options = sqlite_options({'busy_timeout': 2500})
+        self.assertEqual(options['transaction_mode'], 'IMMEDIATE')
+        self.assertEqual(options['timeout'], 2.5)
+        with tempfile.TemporaryDirectory() as directory:
+            conn = _connect(os.path.join(directory, 'test.sqlite3'), options)
+            try:
+                self.assertEqual(conn.execute('PRAGMA journal_mode').fetchone()[0], 'wal')
+                self.assertEqual(conn.execute('PRAGMA busy_timeout').fetchone()[0], 2500)
+                self.assertEqual(conn.execute('PRAGMA synchronous').fetchone()[0], 1)  # NORMAL
+                self.assertEqual(conn.execute('PRAGMA cache_size').fetchone()[0], PRODUCTION_PRAGMAS['cache_size'])
+                self.assertEqual(conn.execute('PRAGMA temp_store').fetchone()[0], 2)  # MEMORY
+            finally:
+                conn.close()
+
+    def test_benchmark(self):
+        """Test the benchmark reports both kinds of work and no lock errors in production mode"""
+        report = benchmark(sqlite_options(), readers=2, writers=2, duration=0.3, rows=500)
+        self.assertGreater(report['reads']['ops'], 0)
+        self.assertGreater(report['writes']['ops'], 0)
+        self.assertEqual(report['writes']['errors'], 0)
+
+
+@skipUnless(connection.vendor == 'sqlite', 'SQLite maintenance')
+class SqliteMaintenanceTest(TransactionTestCase):
+    def test_maintenance(self):
+        """Test maintenance runs a checkpoint and optimize on the default database"""
+        result = run_maintenance()
+        self.assertEqual(set(result), {'busy', 'wal_pages', 'checkpointed_pages'})
+        with self.assertRaises(ValueError):
+            run_maintenance(mode='sometimes')
+        out = StringIO()
+        call_command('sqlite_maintenance', stdout=out)
+        self.assertTrue(out.getvalue())
+
+
+class DatabaseBenchmarkTest(TransactionTestCase):
+    def test_profile(self):
+        """Test the connection profile reflects the configured alias"""
+        profile = connection_profile()
+        self.assertEqual(profile['vendor'], connection.vendor)
+        self.assertIn('pool', profile)
+
+    def test_workload(self):
+        """Test the ORM workload reads and writes on the current database"""
+        student_ids, enrollment_ids = seed_workload(rows=80, courses=10)
+        self.assertEqual(len(student_ids), 10)
+        self.assertEqual(len(enrollment_ids), 80)
+        report = run_workload(student_ids, enrollment_ids, readers=1, writers=1, duration=0.3)
+        self.assertGreater(report['reads']['ops'], 0)
+        self.assertGreater(report['writes']['ops'], 0)
+        self.assertTrue(Enrollment.objects.exclude(grade=None).exists())
+
+
+@override_settings(DATABASE_REPLICAS=['replica1'], REPLICA_STICKY_SECONDS=5)
+class ReplicaRouterTest(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.router = ReplicaRouter()
+        self.factory = RequestFactory()
+        self.user = User(pk=1, username='router', role='admin')
+
+    def route(self, request):
+        """Return the alias Student reads use while request is handled"""
+        def view(request):
+            response = HttpResponse()
+            response.alias = self.router.db_for_read(Student)
+            return response
+        return ReplicaRoutingMiddleware(view)(request).alias
+
+    def test_outside_requests_read_primary(self):
+        """Test commands and shells read from the primary"""
+        self.assertEqual(self.router.db_for_read(Student), 'default')
+        self.assertEqual(self.router.db_for_write(Student), 'default')
+
+    def test_safe_methods_read_replica(self):
+        """Test GET requests read from a replica and writes from the primary"""
+        self.assertEqual(self.route(self.factory.get('/')), 'replica1')
+        self.assertEqual(self.route(self.factory.post('/')), 'default')
+
+    def test_sticky_after_write(self):
+        """Test a user reads from the primary for a while after writing"""
+        request = self.factory.get('/')
+        request.user = self.user
+        self.assertEqual(self.route(request), 'replica1')
+        write = self.factory.post('/')
+        write.user = self.user
+        self.route(write)
+        request = self.factory.get('/')
+        request.user = self.user
+        self.assertEqual(self.route(request), 'default')
+        request = self.factory.get('/')
+        request.user = User(pk=2, username='other', role='admin')
+        self.assertEqual(self.route(request), 'replica1')
+
+    def test_forced_routing(self):
+        """Test use_primary and use_replica override the request"""
+        with use_replica():
+            self.assertEqual(self.router.db_for_read(Student), 'replica1')
+            with use_primary():
+                self.assertEqual(self.router.db_for_read(Student), 'default')
+
+    def test_no_replicas(self):
+        """Test everything reads from the primary without replicas"""
+        with self.settings(DATABASE_REPLICAS=[]):
+            self.assertEqual(self.route(self.factory.get('/')), 'default')
+            with use_replica():
+                self.assertEqual(self.router.db_for_read(Student), 'default')
+
+
+class WarmUpTest(TestCase):
+    def test_warm_up(self):
+        """Test the pre-fork warm-up resolves URLs and plans serializers"""
+        get_query_plan.cache_clear()
+        warmed = warm_up()
+        self.assertGreater(warmed['url_patterns'], 0)
+        self.assertGreater(warmed['models'], 0)
+        self.assertGreater(warmed['serializers'], 0)
+        self.assertGreaterEqual(get_query_plan.cache_info().currsize, warmed['serializers'])
+
+    @skipUnless(os.path.exists('/proc/self/smaps_rollup'), 'Needs /proc/<pid>/smaps_rollup')
+    def test_process_memory(self):
+        """Test worker memory is read from /proc"""
+        memory = process_memory(os.getpid())
+        self.assertGreater(memory['rss'], 0)
+        self.assertLessEqual(memory['uss'], memory['pss'])
+        self.assertLessEqual(memory['pss'], memory['rss'])
+        self.assertEqual(worker_pids(os.getpid()), [])
+
+
+class FastJSONTest(SimpleTestCase):
+    def test_matches_stock_renderer(self):
+        """Test the orjson renderer produces JSONRenderer's bytes"""
+        import datetime
+        import decimal
+        import uuid
+        from django.utils import timezone
+        from django.utils.translation import gettext_lazy
+        from rest_framework.renderers import JSONRenderer
+        data = {
+            'aware': datetime.datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=datetime.timezone.utc),
+            'naive': datetime.datetime(2024, 5, 1, 12, 30),
+            'local': timezone.localtime(timezone.now()),
+            'date': datetime.date(2024, 5, 1),
+            'time': datetime.time(8, 15),
+            'decimal': decimal.Decimal('3.50'),
+            'lazy': gettext_lazy('Enrollment'),
+            'uuid': uuid.UUID(int=1),
+            'separators': 'a\u2028b\u2029c – d',
+            'nested': [{'grade': None, 'ok': True, 'count': 3, 'ratio': 0.25}],
+        }
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_falls_back_to_stock_renderer(self):
+        """Test indentation and values orjson rejects still render"""
+        from rest_framework.renderers import JSONRenderer
+        for data, media_type in [({'a': [1, 2]}, 'application/json; indent=4'), ({'big': 2 ** 70}, None),
+                                 ({1: 'int key'}, None)]:
+            self.assertEqual(FastJSONRenderer().render(data, media_type), JSONRenderer().render(data, media_type))
+        self.assertEqual(FastJSONRenderer().render(None), b'')
+
+    def test_parser(self):
+        """Test the orjson parser reads JSON and reports errors like JSONParser"""
+        from io import BytesIO
+        from rest_framework.exceptions import ParseError
+        from rest_framework.parsers import JSONParser
+        body = '{"name": "Düsseldorf", "items": [1, 2.5, null]}'.encode()
+        self.assertEqual(FastJSONParser().parse(BytesIO(body)), JSONParser().parse(BytesIO(body)))
+        for invalid in [b'{"a": NaN}', b'{"a": ']:
+            with self.assertRaises(ParseError) as fast:
+                FastJSONParser().parse(BytesIO(invalid))
+            with self.assertRaises(ParseError) as stock:
+                JSONParser().parse(BytesIO(invalid))
+            self.assertEqual(str(fast.exception), str(stock.exception))
+
+
+@override_settings(REQUEST_TIMING_SAMPLE_RATE=1.0, REQUEST_TIMING_HEADER=True, SLOW_QUERY_MS=None)
+class RequestTimingTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        create_catalog(rows=3)
+        self.client.force_authenticate(user=User.objects.create_user(username='admin', role='admin'))
+
+    def test_server_timing_header(self):
+        """Test sampled responses report db, serializer and total time"""
+        response = self.client.get(reverse('enrollment-list-create'))
+        header = response['Server-Timing']
+        self.assertRegex(header, r'db;dur=[0-9.]+;desc="[1-9][0-9]* queries"')
+        self.assertRegex(header, r'serialize;dur=[0-9.]+')
+        self.assertRegex(header, r'total;dur=[0-9.]+$')
+
+    def test_log_line(self):
+        """Test each sampled request logs one structured line"""
+        import json
+        with self.assertLogs('core.timing', 'INFO') as logs:
+            response = self.client.get(reverse('enrollment-list-create'))
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record['view'], 'enrollment-list-create')
+        self.assertEqual(record['status'], 200)
+        self.assertEqual(record['bytes'], len(response.content))
+        self.assertEqual(record['db_queries'], 2)
+
+    def test_slow_queries_are_logged(self):
+        """Test queries over SLOW_QUERY_MS are logged with the view name"""
+        import json
+        with self.settings(SLOW_QUERY_MS=0), self.assertLogs('core.slow_queries', 'WARNING') as logs:
+            self.client.get(reverse('enrollment-list-create'))
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record['view'], 'enrollment-list-create')
+        self.assertIn('SELECT', record['sql'])
+
+    def test_unsampled_requests_are_untouched(self):
+        """Test requests outside the sample get no header"""
+        with self.settings(REQUEST_TIMING_SAMPLE_RATE=0.0):
+            response = self.client.get(reverse('enrollment-list-create'))
+        self.assertNotIn('Server-Timing', response)
+
+    def test_header_is_opt_in(self):
+        """Test sampled requests are logged without a header unless enabled"""
+        with self.settings(REQUEST_TIMING_HEADER=False), self.assertLogs('core.timing', 'INFO'):
+            response = self.client.get(reverse('enrollment-list-create'))
+        self.assertNotIn('Server-Timing', response)
+
+
+class MetricsTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        create_catalog(rows=3)
+        self.admin = User.objects.create_user(username='admin', role='admin')
+
+    def sample(self, name, **labels):
+        from prometheus_client import REGISTRY
+        return REGISTRY.get_sample_value(name, labels) or 0
+
+    def test_access(self):
+        """Test /metrics is for admins and holders of METRICS_TOKEN"""
+        url = reverse('metrics')
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_401_UNAUTHORIZED)
+        teacher = User.objects.create_user(username='teacher', role='teacher')
+        self.client.force_authenticate(user=teacher)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
+        self.client.force_authenticate(user=None)
+        with self.settings(METRICS_TOKEN='scrape-token'):
+            self.assertEqual(self.client.get(url, HTTP_AUTHORIZATION='Bearer wrong').status_code, 401)
+            response = self.client.get(url, HTTP_AUTHORIZATION='Bearer scrape-token')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        self.assertIn(b'http_request_duration_seconds_bucket', response.content)
+
+    def test_requests_are_recorded(self):
+        """Test latency, query count, page depth, errors and cache lookups are labeled by URL name"""
+        self.client.force_authenticate(user=self.admin)
+        url = reverse('course-list-create')
+        before = {
+            'requests': self.sample('http_request_duration_seconds_count', url_name='course-list-create', method='GET'),
+            'queries': self.sample('http_request_db_queries_sum', url_name='course-list-create'),
+            'pages': self.sample('api_page_number_count', url_name='course-list-create'),
+            'misses': self.sample('api_cache_lookups_total', endpoint='course-list-create', outcome='miss'),
+            'hits': self.sample('api_cache_lookups_total', endpoint='course-list-create', outcome='hit'),
+            'errors': self.sample('http_request_errors_total', url_name='course-update-delete', status='404'),
+        }
+        self.client.get(url)
+        self.client.get(url)
+        self.client.get(reverse('course-update-delete', args=[999999]))
+        self.assertEqual(
+            self.sample('http_request_duration_seconds_count', url_name='course-list-create', method='GET'),
+            before['requests'] + 2,
+        )
+        self.assertEqual(self.sample('http_request_db_queries_sum', url_name='course-list-create'), before['queries'] + 2)
+        self.assertEqual(self.sample('api_page_number_count', url_name='course-list-create'), before['pages'] + 1)
+        self.assertEqual(
+            self.sample('api_cache_lookups_total', endpoint='course-list-create', outcome='miss'), before['misses'] + 1
+        )
+        self.assertEqual(
+            self.sample('api_cache_lookups_total', endpoint='course-list-create', outcome='hit'), before['hits'] + 1
+        )
+        self.assertEqual(
+            self.sample('http_request_errors_total', url_name='course-update-delete', status='404'),
+            before['errors'] + 1,
+        )
+
+
+class OpenAPIDocsTest(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.schema_file = os.path.join(directory.name, 'openapi.json')
+        override = self.settings(OPENAPI_SCHEMA_FILE=self.schema_file, OPENAPI_CACHE_SECONDS=300)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def test_generate_and_serve(self):
+        """Test generate_openapi writes the document and the endpoint serves it cacheably"""
+        out = StringIO()
+        call_command('generate_openapi', stdout=out)
+        self.assertIn(self.schema_file, out.getvalue())
+        with open(self.schema_file, 'rb') as schema_file:
+            body = schema_file.read()
+        self.assertIn(b'"/api/v1/courses/"', body)
+        self.assertNotIn(b'"host"', body)  # Served from whichever host
+
+        url = reverse('schema-json')
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.content, body)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertIn('max-age=300', response['Cache-Control'])
+        self.assertIn('public', response['Cache-Control'])
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+
+    def test_missing_file(self):
+        """Test a missing document is generated per request with DEBUG only"""
+        url = reverse('schema-json')
+        with self.settings(DEBUG=False):
+            self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+        with self.settings(DEBUG=True):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn(b'"/api/v1/courses/"', response.content)
+        self.assertIn('no-cache', response['Cache-Control'])
+
+    def test_ui_reads_the_document(self):
+        """Test the Swagger UI page points at the served document"""
+        response = self.client.get(reverse('schema-swagger-ui'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn(reverse('schema-json').encode(), response.content)
+
+
+class SharedCacheCheckTest(SimpleTestCase):
+    def test_process_local_cache_is_refused(self):
+        """Test several workers are refused a per-process API or sticky cache"""
+        from django.core.exceptions import ImproperlyConfigured
+        from core.cache import check_shared_caches
+
+        local = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+        with self.settings(CACHES=local, API_CACHE_ALIAS='default', REPLICA_STICKY_CACHE_ALIAS='default'):
+            with self.assertRaisesMessage(ImproperlyConfigured, 'REPLICA_STICKY_CACHE_ALIAS'):
+                check_shared_caches()
+        shared = {'default': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': '/tmp'}}
+        with self.settings(CACHES=shared, API_CACHE_ALIAS='default', REPLICA_STICKY_CACHE_ALIAS='default'):
+            check_shared_caches()
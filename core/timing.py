@@ -0,0 +1,144 @@
+import json
+import logging
+import random
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+logger = logging.getLogger('core.timing')
+slow_query_logger = logging.getLogger('core.slow_queries')
+
+_current = ContextVar('request_timing', default=None)
+
+
+class RequestTiming:
+    """
+    What one sampled request spent: SQL queries and their time, named spans
+    (e.g. 'serialize') and the queries slower than slow_query_ms
+    """
+    def __init__(self, slow_query_ms):
+        self.started = time.perf_counter()
+        self.slow_query_ms = slow_query_ms
+        self.queries = 0
+        self.db = 0.0
+        self.spans = {}
+        self.slow_queries = []
+
+    def add(self, name, seconds):
+        self.spans[name] = self.spans.get(name, 0.0) + seconds
+
+    def record_query(self, sql, seconds):
+        self.queries += 1
+        self.db += seconds
+        if self.slow_query_ms is not None and seconds * 1000 >= self.slow_query_ms:
+            self.slow_queries.append((sql, seconds))
+
+
+def current_timing():
+    """The RequestTiming of the request being handled, if it is sampled"""
+    return _current.get()
+
+
+def time_queries(execute, sql, params, many, context):
+    """Database execute wrapper counting the queries of sampled requests"""
+    timing = _current.get()
+    if timing is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timing.record_query(sql, time.perf_counter() - started)
+
+
+def install_query_timer(sender, connection, **kwargs):
+    """connection_created receiver adding time_queries to every connection"""
+    if time_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(time_queries)
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 1)
+
+
+class RequestTimingMiddleware:
+    """
+    Measure a sample of requests (REQUEST_TIMING_SAMPLE_RATE): total time,
+    SQL query count and time, serializer time (core.pagination) and
+    response size.
+
+    Sampled responses get a Server-Timing header (with
+    REQUEST_TIMING_HEADER) and one JSON log line on the
+    'core.timing' logger; queries slower than SLOW_QUERY_MS are logged
+    with the view name on 'core.slow_queries'. Requests that aren't
+    sampled cost one random() call. Goes first in MIDDLEWARE.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timing = self.start()
+        if timing is None:
+            return self.get_response(request)
+        token = _current.set(timing)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        self.finish(request, response, timing)
+        return response
+
+    async def __acall__(self, request):
+        timing = self.start()
+        if timing is None:
+            return await self.get_response(request)
+        # sync_to_async copies the context, so views and queries in worker
+        # threads see the same RequestTiming
+        token = _current.set(timing)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        self.finish(request, response, timing)
+        return response
+
+    def start(self):
+        rate = getattr(settings, 'REQUEST_TIMING_SAMPLE_RATE', 0.0)
+        if rate <= 0 or (rate < 1 and random.random() >= rate):
+            return None
+        return RequestTiming(getattr(settings, 'SLOW_QUERY_MS', None))
+
+    def finish(self, request, response, timing):
+        total = time.perf_counter() - timing.started
+        size = None if response.streaming else len(response.content)
+        match = getattr(request, 'resolver_match', None)
+        view = match.view_name if match else None
+
+        if getattr(settings, 'REQUEST_TIMING_HEADER', False):
+            metrics = [f'db;dur={_ms(timing.db)};desc="{timing.queries} queries"']
+            metrics.extend(f'{name};dur={_ms(seconds)}' for name, seconds in timing.spans.items())
+            metrics.append(f'total;dur={_ms(total)}')
+            response['Server-Timing'] = ', '.join(metrics)
+
+        logger.info(json.dumps({
+            'method': request.method,
+            'path': request.path,
+            'view': view,
+            'status': response.status_code,
+            'total_ms': _ms(total),
+            'db_queries': timing.queries,
+            'db_ms': _ms(timing.db),
+            **{f'{name}_ms': _ms(seconds) for name, seconds in timing.spans.items()},
+            'bytes': size,
+        }))
+        for sql, seconds in timing.slow_queries:
+            slow_query_logger.warning(json.dumps({'view': view, 'path': request.path, 'ms': _ms(seconds), 'sql': sql}))
@@ -0,0 +1,68 @@
+from django.apps import apps
+from django.conf import settings
+from django.db import connections
+from django.urls import get_resolver
+from rest_framework import serializers
+from rest_framework.settings import api_settings
+
+from core.prefetch import get_query_plan
+
+# DRF settings that name classes, imported on first use
+DRF_CLASS_SETTINGS = [
+    'DEFAULT_RENDERER_CLASSES',
+    'DEFAULT_PARSER_CLASSES',
+    'DEFAULT_AUTHENTICATION_CLASSES',
+    'DEFAULT_PERMISSION_CLASSES',
+    'DEFAULT_THROTTLE_CLASSES',
+    'DEFAULT_CONTENT_NEGOTIATION_CLASS',
+    'DEFAULT_METADATA_CLASS',
+    'DEFAULT_PAGINATION_CLASS',
+    'DEFAULT_SCHEMA_CLASS',
+    'EXCEPTION_HANDLER',
+]
+
+
+def _subclasses(cls):
+    for subclass in cls.__subclasses__():
+        yield subclass
+        yield from _subclasses(subclass)
+
+
+def warm_up():
+    """
+    Do the lazy, per-process work of the first requests once: resolve the
+    URL patterns (importing every view and serializer), import DRF's
+    configured classes, build model metadata and plan every project
+    ModelSerializer (core.prefetch).
+
+    Meant to run in the server's master process before it forks, so the
+    workers share the result. Touches no database; any connection opened
+    anyway is closed so no worker inherits it. Returns what was warmed.
+    """
+    resolver = get_resolver()
+    url_patterns = len(resolver.reverse_dict)
+
+    for name in DRF_CLASS_SETTINGS:
+        getattr(api_settings, name)
+
+    models = apps.get_models()
+    for model in models:
+        model._meta.get_fields()
+
+    planned = 0
+    project_apps = {
+        config.name for config in apps.get_app_configs() if config.path.startswith(str(settings.BASE_DIR))
+    }
+    for serializer_class in set(_subclasses(serializers.ModelSerializer)):
+        if serializer_class.__module__.split('.')[0] not in project_apps:
+            continue
+        if getattr(getattr(serializer_class, 'Meta', None), 'model', None) is None:
+            continue
+        try:
+            get_query_plan(serializer_class)
+        except Exception:
+            continue  # Needs a request or other context to build its fields
+        planned += 1
+
+    connections.close_all()
+    return {'url_patterns': url_patterns, 'models': len(models), 'serializers': planned}
@@ -2,13 +2,18 @@ from rest_framework import generics
 from rest_framework.response import Response
 from rest_framework import status
 from drf_yasg.utils import swagger_auto_schema
+from core.cache import REFERENCE_NAMESPACE
+from core.caching import CachedReadMixin, ObjectCacheMixin
+from core.prefetch import AutoPrefetchMixin
+from users.scoping import ScopedQuerysetMixin
 from courses.models import Course
 from .serializers import CoursesSerializer
 
 # get all courses and create a new course
-class CourseListCreate(generics.ListCreateAPIView):
+class CourseListCreate(CachedReadMixin, ScopedQuerysetMixin, AutoPrefetchMixin, generics.ListCreateAPIView):
     queryset = Course.objects.all()
     serializer_class = CoursesSerializer
+    cache_namespace = REFERENCE_NAMESPACE
 
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -18,20 +23,18 @@ class CourseListCreate(generics.ListCreateAPIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
 # get, update, delete course by ID
-class CourseRetrieveUpdateDestroy(generics.RetrieveUpdateDestroyAPIView):
+class CourseRetrieveUpdateDestroy(ObjectCacheMixin, ScopedQuerysetMixin, AutoPrefetchMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Course.objects.all()
     serializer_class = CoursesSerializer
 
     def get(self, request, *args, **kwargs):
-        course = self.get_object()
-        serializer = self.get_serializer(course)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return self.retrieve(request, *args, **kwargs)
 
     def put(self, request, *args, **kwargs):
         course = self.get_object()
         serializer = self.get_serializer(course, data=request.data)
         if serializer.is_valid():
-            serializer.save()
+            self.perform_update(serializer)
             return Response(serializer.data, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -39,7 +42,7 @@ class CourseRetrieveUpdateDestroy(generics.RetrieveUpdateDestroyAPIView):
         course = self.get_object()
         serializer = self.get_serializer(course, data=request.data, partial=True)
         if serializer.is_valid():
-            serializer.save()
+            self.perform_update(serializer)
             return Response(serializer.data, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
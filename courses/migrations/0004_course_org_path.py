@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:55
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Cast, Concat
+
+
+def backfill_org_path(apps, schema_editor):
+    Course = apps.get_model('courses', 'Course')
+    Department = apps.get_model('departments', 'Department')
+    parent_path = Subquery(Department.objects.filter(pk=OuterRef('department_id')).values('org_path')[:1])
+    Course.objects.update(
+        org_path=Concat(parent_path, Cast('department_id', models.CharField()), Value('/'), output_field=models.CharField())
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('departments', '0003_department_org_path'),
+        ('courses', '0003_alter_course_code'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='org_path',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=64),
+        ),
+        migrations.RunPython(backfill_org_path, migrations.RunPython.noop),
+    ]
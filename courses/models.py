@@ -2,14 +2,16 @@ from django.db import models
 from django.utils.translation import gettext_lazy as _
 from django.urls import reverse
 from departments.models import Department
+from colleges.models import OrgPathModel
 
 # Create your models here.
-class Course(models.Model):
+class Course(OrgPathModel):
     def clean(self):
         from django.core.exceptions import ValidationError
         if not self.name or not self.name.strip():
             raise ValidationError({'name': 'Name cannot be empty or whitespace.'})
     department = models.ForeignKey('departments.Department', on_delete=models.CASCADE, related_name='courses')
+    org_path = models.CharField(max_length=64, default='', editable=False, db_index=True)  # Ancestor IDs, see colleges.hierarchy
     name = models.CharField(max_length=255, blank=False, null=False)
     code = models.CharField(max_length=20, unique=True, blank=False)  # Example: "CS101"
     description = models.TextField(blank=True, null=True)
@@ -1,9 +1,14 @@
 from django.contrib import admin
-from departments.models import Department
+from departments.models import Department, DepartmentSummary
 
 # Register your models here.
 class DepartmentAdmin(admin.ModelAdmin):
     list_display = ('id', 'college', 'name', 'description', 'date_created', 'date_updated')
     list_filter = ('college',)
     
-admin.site.register(Department, DepartmentAdmin)
\ No newline at end of file
+admin.site.register(Department, DepartmentAdmin)
+
+class DepartmentSummaryAdmin(admin.ModelAdmin):
+    list_display = ('department', 'student_count', 'professor_count', 'course_count', 'active_enrollment_count', 'date_refreshed')
+
+admin.site.register(DepartmentSummary, DepartmentSummaryAdmin)
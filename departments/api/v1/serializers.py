@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from departments.models import Department
+from departments.counts import COUNT_FIELDS
         
 class DepartmentsSerializer(serializers.ModelSerializer):
     college_name = serializers.CharField(source='college.name', read_only=True)
@@ -33,4 +34,19 @@ class DepartmentsSerializer(serializers.ModelSerializer):
         college_id = validated_data.pop('college_id', None)
         if college_id is not None:
             instance.college_id = college_id
-        return super().update(instance, validated_data)
\ No newline at end of file
+        return super().update(instance, validated_data)
+
+
+class DepartmentCountsSerializer(DepartmentsSerializer):
+    """
+    Department with student, professor, course and active enrollment counts
+    (annotated by the view)
+    """
+    student_count = serializers.IntegerField(read_only=True)
+    professor_count = serializers.IntegerField(read_only=True)
+    course_count = serializers.IntegerField(read_only=True)
+    active_enrollment_count = serializers.IntegerField(read_only=True)
+
+    class Meta(DepartmentsSerializer.Meta):
+        fields = DepartmentsSerializer.Meta.fields + COUNT_FIELDS
+        annotated_fields = COUNT_FIELDS
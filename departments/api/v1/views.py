@@ -2,15 +2,41 @@ from rest_framework import generics
 from rest_framework.response import Response
 from rest_framework import status
 from drf_yasg.utils import swagger_auto_schema
+from core.cache import REFERENCE_NAMESPACE
+from core.caching import CachedReadMixin, ObjectCacheMixin
+from core.prefetch import AutoPrefetchMixin
+from users.scoping import ScopedQuerysetMixin
+from colleges.api.v1.serializers import DeletionJobSerializer
+from colleges.deletion import create_deletion_job, start_deletion_job
 from departments.models import Department
-from .serializers import DepartmentsSerializer
+from departments.counts import annotate_department_counts
+from .serializers import DepartmentsSerializer, DepartmentCountsSerializer
 
 # get all departments and create a new department
-class DepartmentListCreate(generics.ListCreateAPIView):
+class DepartmentListCreate(CachedReadMixin, ScopedQuerysetMixin, AutoPrefetchMixin, generics.ListCreateAPIView):
     queryset = Department.objects.all()
     serializer_class = DepartmentsSerializer
+    cache_namespace = REFERENCE_NAMESPACE
+    scope_department_field = 'id'
+
+    def with_counts(self):
+        return self.request.method == 'GET' and self.request.query_params.get('with_counts') in ('1', 'true')
+
+    def should_cache(self, request):
+        # Counts follow students and enrollments, which don't bump the cache
+        return not self.with_counts()
+
+    def get_serializer_class(self):
+        if self.with_counts():
+            return DepartmentCountsSerializer
+        return DepartmentsSerializer
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.with_counts():
+            queryset = annotate_department_counts(queryset)
+        return queryset
 
-    
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         if serializer.is_valid():
@@ -19,20 +45,19 @@ class DepartmentListCreate(generics.ListCreateAPIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 # get, update, delete department by ID 
-class DepartmentRetrieveUpdateDestroy(generics.RetrieveUpdateDestroyAPIView):
+class DepartmentRetrieveUpdateDestroy(ObjectCacheMixin, ScopedQuerysetMixin, AutoPrefetchMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Department.objects.all()
     serializer_class = DepartmentsSerializer
+    scope_department_field = 'id'
 
     def get(self, request, *args, **kwargs):
-        department = self.get_object()
-        serializer = self.get_serializer(department)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return self.retrieve(request, *args, **kwargs)
 
     def put(self, request, *args, **kwargs):
         department = self.get_object()
         serializer = self.get_serializer(department, data=request.data)
         if serializer.is_valid():
-            serializer.save()
+            self.perform_update(serializer)
             return Response(serializer.data, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -40,11 +65,16 @@ class DepartmentRetrieveUpdateDestroy(generics.RetrieveUpdateDestroyAPIView):
         department = self.get_object()
         serializer = self.get_serializer(department, data=request.data, partial=True)
         if serializer.is_valid():
-            serializer.save()
+            self.perform_update(serializer)
             return Response(serializer.data, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     def delete(self, request, *args, **kwargs):
         department = self.get_object()
+        if request.query_params.get('background') in ('1', 'true'):
+            # Large subtrees: delete in batches on a background job
+            job = create_deletion_job(department, requested_by=request.user)
+            start_deletion_job(job)
+            return Response(DeletionJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
         department.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
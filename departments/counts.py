@@ -0,0 +1,115 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from core.routing import use_replica
+from courses.models import Course
+from departments.models import Department, DepartmentSummary
+from enrollments.models import Enrollment
+from professors.models import Professor
+from students.models import Student
+
+COUNT_FIELDS = ['student_count', 'professor_count', 'course_count', 'active_enrollment_count']
+
+# How each count reaches a department
+COUNT_SOURCES = {
+    'student_count': (Student.objects.all(), 'department'),
+    'professor_count': (Professor.objects.all(), 'department'),
+    'course_count': (Course.objects.all(), 'department'),
+    'active_enrollment_count': (Enrollment.objects.filter(status='enrolled'), 'course__department'),
+}
+
+
+def _grouped_count(queryset, group_by, outer_field='pk'):
+    """
+    Correlated subquery counting queryset rows per group_by value.
+
+    One subquery per count, rather than several Count() over joins, keeps
+    the counts independent (joins would multiply them) and lets each use
+    its own foreign-key index.
+    """
+    counted = (
+        queryset
+        .filter(**{group_by: OuterRef(outer_field)})
+        .order_by()
+        .values(group_by)
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    return Coalesce(Subquery(counted, output_field=IntegerField()), Value(0))
+
+
+def counts_from_summary():
+    return getattr(settings, 'ORG_COUNTS_FROM_SUMMARY', False)
+
+
+def annotate_department_counts(queryset, from_summary=None):
+    """
+    Add COUNT_FIELDS to a Department queryset without extra queries
+    """
+    if from_summary is None:
+        from_summary = counts_from_summary()
+    if from_summary:
+        return queryset.annotate(**{
+            name: Coalesce(F(f'summary__{name}'), Value(0)) for name in COUNT_FIELDS
+        })
+    return queryset.annotate(**{
+        name: _grouped_count(source, group_by)
+        for name, (source, group_by) in COUNT_SOURCES.items()
+    })
+
+
+def annotate_college_counts(queryset, from_summary=None):
+    """
+    Add COUNT_FIELDS to a College queryset without extra queries
+    """
+    if from_summary is None:
+        from_summary = counts_from_summary()
+    if from_summary:
+        annotations = {}
+        for name in COUNT_FIELDS:
+            totals = (
+                DepartmentSummary.objects
+                .filter(department__college=OuterRef('pk'))
+                .order_by()
+                .values('department__college')
+                .annotate(total=Sum(name))
+                .values('total')
+            )
+            annotations[name] = Coalesce(Subquery(totals, output_field=IntegerField()), Value(0))
+        return queryset.annotate(**annotations)
+    return queryset.annotate(**{
+        name: _grouped_count(source, f'{group_by}__college')
+        for name, (source, group_by) in COUNT_SOURCES.items()
+    })
+
+
+def refresh_department_summaries():
+    """
+    Recompute DepartmentSummary for every department: one grouped read and
+    one upsert. Returns the number of departments refreshed.
+    """
+    now = timezone.now()
+    with use_replica():
+        rows = list(
+            annotate_department_counts(Department.objects.order_by(), from_summary=False).values('pk', *COUNT_FIELDS)
+        )
+    summaries = [
+        DepartmentSummary(
+            department_id=row['pk'],
+            date_refreshed=now,
+            **{name: row[name] for name in COUNT_FIELDS}
+        )
+        for row in rows
+    ]
+    with transaction.atomic():
+        DepartmentSummary.objects.bulk_create(
+            summaries,
+            batch_size=500,
+            update_conflicts=True,
+            unique_fields=['department'],
+            update_fields=COUNT_FIELDS + ['date_refreshed'],
+        )
+    return len(summaries)
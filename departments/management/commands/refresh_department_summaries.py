@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from departments.counts import refresh_department_summaries
+
+
+class Command(BaseCommand):
+    help = 'Recompute the per-department counts served when ORG_COUNTS_FROM_SUMMARY is on'
+
+    def handle(self, *args, **options):
+        refreshed = refresh_department_summaries()
+        self.stdout.write(self.style.SUCCESS(f'Refreshed summaries for {refreshed} departments'))
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:55
+
+from django.db import migrations, models
+from django.db.models import Value
+from django.db.models.functions import Cast, Concat
+
+
+def backfill_org_path(apps, schema_editor):
+    Department = apps.get_model('departments', 'Department')
+    Department.objects.update(
+        org_path=Concat(Cast('college_id', models.CharField()), Value('/'), output_field=models.CharField())
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('departments', '0002_department_date_created_department_date_updated'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='department',
+            name='org_path',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=64),
+        ),
+        migrations.RunPython(backfill_org_path, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:58
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('departments', '0003_department_org_path'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DepartmentSummary',
+            fields=[
+                ('department', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='summary', serialize=False, to='departments.department')),
+                ('student_count', models.PositiveIntegerField(default=0)),
+                ('professor_count', models.PositiveIntegerField(default=0)),
+                ('course_count', models.PositiveIntegerField(default=0)),
+                ('active_enrollment_count', models.PositiveIntegerField(default=0)),
+                ('date_refreshed', models.DateTimeField()),
+            ],
+            options={
+                'verbose_name': 'Department summary',
+                'verbose_name_plural': 'Department summaries',
+            },
+        ),
+    ]
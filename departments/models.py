@@ -1,15 +1,16 @@
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 from django.urls import reverse
-from colleges.models import College
+from colleges.models import College, OrgPathModel
 
 # Create your models here.
-class Department(models.Model):
+class Department(OrgPathModel):
     def clean(self):
         from django.core.exceptions import ValidationError
         if not self.name or not self.name.strip():
             raise ValidationError({'name': 'Name cannot be empty or whitespace.'})
     college = models.ForeignKey("colleges.College", on_delete=models.CASCADE)
+    org_path = models.CharField(max_length=64, default='', editable=False, db_index=True)  # Ancestor IDs, see colleges.hierarchy
     name = models.CharField(max_length=255, blank=False, null=False)
     description = models.TextField(blank=True, null=True)
     date_created = models.DateTimeField(auto_now_add=True)
@@ -24,3 +25,28 @@ class Department(models.Model):
 
     def get_absolute_url(self):
         return reverse("Department_detail", kwargs={"pk": self.pk})
+
+
+class DepartmentSummary(models.Model):
+    """
+    Precomputed per-department counts for list endpoints on large datasets.
+    Refreshed by the refresh_department_summaries command.
+    """
+    department = models.OneToOneField(
+        Department,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='summary'
+    )
+    student_count = models.PositiveIntegerField(default=0)
+    professor_count = models.PositiveIntegerField(default=0)
+    course_count = models.PositiveIntegerField(default=0)
+    active_enrollment_count = models.PositiveIntegerField(default=0)
+    date_refreshed = models.DateTimeField()
+
+    class Meta:
+        verbose_name = _("Department summary")
+        verbose_name_plural = _("Department summaries")
+
+    def __str__(self):
+        return f"Summary of {self.department_id}"
@@ -140,3 +140,93 @@ class DepartmentAPITest(APITestCase):
         response = self.client.post(url, invalid_data, format='json')
         
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class DepartmentCountsTest(APITestCase):
+    """Test cases for annotated counts on department and college lists"""
+
+    def setUp(self):
+        from django.contrib.auth import get_user_model
+        from django.core.cache import cache
+        from courses.models import Course
+        from enrollments.models import Enrollment
+        from professors.models import Professor
+        from students.models import Student
+        cache.clear()
+        self.college = College.objects.create(name="Counts College")
+        self.departments = []
+        for index in range(3):
+            department = Department.objects.create(college=self.college, name=f"Dept {index}")
+            self.departments.append(department)
+            course = Course.objects.create(department=department, name=f"Course {index}", code=f"CC{index}")
+            for number in range(index + 1):
+                student = Student.objects.create(
+                    department=department,
+                    first_name="Student",
+                    last_name=str(number),
+                    student_id=f"CS-{index}-{number}",
+                    email="student@example.com",
+                    contact_number="123"
+                )
+                Enrollment.objects.create(
+                    student=student, course=course, status='enrolled' if number else 'dropped'
+                )
+            Professor.objects.create(
+                department=department,
+                first_name="Prof",
+                last_name=str(index),
+                specialization="Any",
+                contact_number="123"
+            )
+        self.empty = Department.objects.create(college=self.college, name="Empty")
+        admin = get_user_model().objects.create_user(username='admin', role='admin')
+        self.client.force_authenticate(user=admin)
+        self.url = reverse('department-list-create')
+
+    def counts_by_name(self, response):
+        return {
+            row['name']: (row['student_count'], row['professor_count'], row['course_count'], row['active_enrollment_count'])
+            for row in response.data['results']
+        }
+
+    def test_counts_are_opt_in(self):
+        """Test plain lists are unchanged"""
+        response = self.client.get(self.url)
+        self.assertNotIn('student_count', response.data['results'][0])
+
+    def test_department_counts(self):
+        """Test counts are correct and cost no extra queries"""
+        self.client.get(self.url)
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url, {'with_counts': 1})
+        counts = self.counts_by_name(response)
+        self.assertEqual(counts['Dept 0'], (1, 1, 1, 0))
+        self.assertEqual(counts['Dept 2'], (3, 1, 1, 2))
+        self.assertEqual(counts['Empty'], (0, 0, 0, 0))
+
+    def test_college_counts(self):
+        """Test college counts add up their departments"""
+        response = self.client.get(reverse('college-list-create'), {'with_counts': 'true'})
+        row = response.data['results'][0]
+        self.assertEqual(
+            (row['student_count'], row['professor_count'], row['course_count'], row['active_enrollment_count']),
+            (6, 3, 3, 3)
+        )
+
+    def test_counts_from_summary_table(self):
+        """Test counts can be served from the refreshed summary table"""
+        from io import StringIO
+        from django.core.management import call_command
+        from django.test import override_settings
+        from students.models import Student
+        call_command('refresh_department_summaries', stdout=StringIO())
+        Student.objects.filter(department=self.departments[2]).delete()
+        with override_settings(ORG_COUNTS_FROM_SUMMARY=True):
+            counts = self.counts_by_name(self.client.get(self.url, {'with_counts': 1}))
+            # Summary is as of the last refresh
+            self.assertEqual(counts['Dept 2'], (3, 1, 1, 2))
+            call_command('refresh_department_summaries', stdout=StringIO())
+            counts = self.counts_by_name(self.client.get(self.url, {'with_counts': 1}))
+            self.assertEqual(counts['Dept 2'], (0, 1, 1, 0))
+            response = self.client.get(reverse('college-list-create'), {'with_counts': 1})
+            self.assertEqual(response.data['results'][0]['student_count'], 3)
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Enrollment
+from .models import ArchivedEnrollment, Enrollment
 
 @admin.register(Enrollment)
 class EnrollmentAdmin(admin.ModelAdmin):
@@ -30,3 +30,15 @@ class EnrollmentAdmin(admin.ModelAdmin):
     
     def get_queryset(self, request):
         return super().get_queryset(request).select_related('student', 'course', 'course__department')
+
+
+
+@admin.register(ArchivedEnrollment)
+class ArchivedEnrollmentAdmin(admin.ModelAdmin):
+    list_display = ['student', 'course', 'status', 'enrollment_date', 'grade', 'archived_at']
+    list_filter = ['status', 'archived_at']
+    search_fields = ['student__student_id', 'course__code']
+    raw_id_fields = ['student', 'course']
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('student', 'course')
@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from enrollments.models import Enrollment
+from enrollments.models import ArchivedEnrollment, Enrollment
 from students.models import Student
 from courses.models import Course
 
@@ -83,6 +83,22 @@ class StudentEnrollmentSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['enrollment_date']
 
+class ArchivedStudentEnrollmentSerializer(StudentEnrollmentSerializer):
+    """Archived enrollment in the same shape, under its original ID"""
+    id = serializers.IntegerField(source='original_id', read_only=True)
+
+    class Meta(StudentEnrollmentSerializer.Meta):
+        model = ArchivedEnrollment
+
+class TranscriptEntrySerializer(serializers.Serializer):
+    """Completed course on a transcript, from either enrollment table"""
+    course = serializers.IntegerField(source='course_id')
+    course_code = serializers.CharField(source='course.code')
+    course_name = serializers.CharField(source='course.name')
+    grade = serializers.CharField(allow_null=True)
+    enrollment_date = serializers.DateTimeField()
+    completed_on = serializers.DateTimeField(source='last_updated')
+
 class CourseEnrollmentSerializer(serializers.ModelSerializer):
     """Serializer for showing enrollments from course perspective"""
     student_name = serializers.CharField(source='student.first_name', read_only=True)
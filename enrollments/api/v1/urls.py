@@ -2,12 +2,14 @@ from django.urls import path
 from .views import (
     EnrollmentListCreate,
     EnrollmentRetrieveUpdateDestroy,
-    student_enrollments,
-    course_enrollments,
+    StudentEnrollments,
+    student_transcript,
+    restore_student_enrollments,
+    CourseEnrollments,
     enroll_student,
     drop_enrollment,
     complete_enrollment,
-    enrollment_stats,
+    EnrollmentStats,
 )
 
 urlpatterns = [
@@ -16,10 +18,12 @@ urlpatterns = [
     path('enrollments/<int:pk>/', EnrollmentRetrieveUpdateDestroy.as_view(), name='enrollment-detail'),
     
     # Student-specific enrollments
-    path('students/<int:student_id>/enrollments/', student_enrollments, name='student-enrollments'),
+    path('students/<int:student_id>/enrollments/', StudentEnrollments.as_view(), name='student-enrollments'),
+    path('students/<int:student_id>/enrollments/restore/', restore_student_enrollments, name='student-enrollments-restore'),
+    path('students/<int:student_id>/transcript/', student_transcript, name='student-transcript'),
     
     # Course-specific enrollments
-    path('courses/<int:course_id>/enrollments/', course_enrollments, name='course-enrollments'),
+    path('courses/<int:course_id>/enrollments/', CourseEnrollments.as_view(), name='course-enrollments'),
     
     # Enrollment actions
     path('enroll/', enroll_student, name='enroll-student'),
@@ -27,5 +31,5 @@ urlpatterns = [
     path('enrollments/<int:enrollment_id>/complete/', complete_enrollment, name='complete-enrollment'),
     
     # Statistics
-    path('enrollments/stats/', enrollment_stats, name='enrollment-stats'),
+    path('enrollments/stats/', EnrollmentStats.as_view(), name='enrollment-stats'),
 ]
@@ -1,21 +1,35 @@
+from asgiref.sync import sync_to_async
 from rest_framework import generics, status
 from rest_framework.response import Response
-from rest_framework.decorators import api_view
-from django.shortcuts import get_object_or_404
-from enrollments.models import Enrollment
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from django.db.models import Count, Q
+from django.shortcuts import aget_object_or_404, get_object_or_404
+from core.async_views import AsyncAPIView
+from core.caching import ObjectCacheMixin
+from core.prefetch import AutoPrefetchMixin, prefetch_for_serializer
+from users.scoping import ScopedQuerysetMixin
+from enrollments.archive import restore_enrollments
+from enrollments.models import ArchivedEnrollment, Enrollment
+from users.permissions import IsAdmin
+from users.scope import get_request_scope
 from students.models import Student
 from courses.models import Course
 from .serializers import (
     EnrollmentSerializer, 
     EnrollmentCreateSerializer,
     StudentEnrollmentSerializer,
-    CourseEnrollmentSerializer
+    ArchivedStudentEnrollmentSerializer,
+    CourseEnrollmentSerializer,
+    TranscriptEntrySerializer,
 )
 
-class EnrollmentListCreate(generics.ListCreateAPIView):
+class EnrollmentListCreate(ScopedQuerysetMixin, AutoPrefetchMixin, generics.ListCreateAPIView):
     """List all enrollments and create new enrollment"""
-    queryset = Enrollment.objects.all().select_related('student', 'course', 'course__department')
+    queryset = Enrollment.objects.all()
     serializer_class = EnrollmentSerializer
+    scope_department_field = 'course__department_id'
+    scope_student_field = 'student__student_id'
     
     def get_serializer_class(self):
         if self.request.method == 'POST':
@@ -42,38 +56,96 @@ class EnrollmentListCreate(generics.ListCreateAPIView):
         
         return queryset
 
-class EnrollmentRetrieveUpdateDestroy(generics.RetrieveUpdateDestroyAPIView):
+class EnrollmentRetrieveUpdateDestroy(ObjectCacheMixin, ScopedQuerysetMixin, AutoPrefetchMixin, generics.RetrieveUpdateDestroyAPIView):
     """Retrieve, update, or delete enrollment by ID"""
-    queryset = Enrollment.objects.all().select_related('student', 'course', 'course__department')
+    queryset = Enrollment.objects.all()
     serializer_class = EnrollmentSerializer
+    scope_department_field = 'course__department_id'
+    scope_student_field = 'student__student_id'
+
+class StudentEnrollments(AsyncAPIView):
+    """Get all enrollments for a specific student, including archived ones"""
+
+    async def get(self, request, student_id):
+        student = await aget_object_or_404(Student, id=student_id)
+        scope = await sync_to_async(get_request_scope)(request)
+        if not scope.can_view_student(student):
+            return Response({'detail': 'Not found.'}, status=status.HTTP_404_NOT_FOUND)
+        enrollments = prefetch_for_serializer(
+            Enrollment.objects.filter(student=student),
+            StudentEnrollmentSerializer
+        )
+        archived = prefetch_for_serializer(
+            ArchivedEnrollment.objects.filter(student=student),
+            ArchivedStudentEnrollmentSerializer
+        )
+
+        # Filter by status if provided
+        enrollment_status = request.query_params.get('status', None)
+        if enrollment_status:
+            enrollments = enrollments.filter(status=enrollment_status)
+            archived = archived.filter(status=enrollment_status)
+
+        enrollments = [enrollment async for enrollment in enrollments]
+        archived = [enrollment async for enrollment in archived]
+        data = [dict(row, archived=False) for row in StudentEnrollmentSerializer(enrollments, many=True).data]
+        data.extend(dict(row, archived=True) for row in ArchivedStudentEnrollmentSerializer(archived, many=True).data)
+        data.sort(key=lambda row: row['enrollment_date'] or '', reverse=True)
+        return Response(data)
 
 @api_view(['GET'])
-def student_enrollments(request, student_id):
-    """Get all enrollments for a specific student"""
+def student_transcript(request, student_id):
+    """Get the completed courses and grades of a student, including archived ones"""
     student = get_object_or_404(Student, id=student_id)
-    enrollments = Enrollment.objects.filter(student=student).select_related('course', 'course__department')
-    
-    # Filter by status if provided
-    status = request.query_params.get('status', None)
-    if status:
-        enrollments = enrollments.filter(status=status)
-    
-    serializer = StudentEnrollmentSerializer(enrollments, many=True)
-    return Response(serializer.data)
+    if not get_request_scope(request).can_view_student(student):
+        return Response({'detail': 'Not found.'}, status=status.HTTP_404_NOT_FOUND)
+    entries = list(Enrollment.objects.filter(student=student, status='completed').select_related('course'))
+    entries.extend(ArchivedEnrollment.objects.filter(student=student, status='completed').select_related('course'))
+    entries.sort(key=lambda entry: entry.last_updated)
+    return Response({
+        'student': student.id,
+        'student_id_number': student.student_id,
+        'student_name': f'{student.first_name} {student.last_name}',
+        'completed_count': len(entries),
+        'courses': TranscriptEntrySerializer(entries, many=True).data,
+    })
 
-@api_view(['GET'])
-def course_enrollments(request, course_id):
+@api_view(['POST'])
+@permission_classes([IsAuthenticated, IsAdmin])
+def restore_student_enrollments(request, student_id):
+    """Move a student's archived enrollments (optionally for one course) back"""
+    student = get_object_or_404(Student, id=student_id)
+    archived = ArchivedEnrollment.objects.filter(student=student)
+    course_id = request.data.get('course')
+    if course_id not in (None, ''):
+        try:
+            course_id = int(course_id)
+        except (TypeError, ValueError):
+            return Response({'course': ['A valid integer is required.']}, status=status.HTTP_400_BAD_REQUEST)
+        archived = archived.filter(course_id=course_id)
+    restored, skipped = restore_enrollments(archived)
+    return Response({'restored': restored, 'skipped': skipped})
+
+class CourseEnrollments(AsyncAPIView):
     """Get all enrollments for a specific course"""
-    course = get_object_or_404(Course, id=course_id)
-    enrollments = Enrollment.objects.filter(course=course).select_related('student')
-    
-    # Filter by status if provided
-    status = request.query_params.get('status', None)
-    if status:
-        enrollments = enrollments.filter(status=status)
-    
-    serializer = CourseEnrollmentSerializer(enrollments, many=True)
-    return Response(serializer.data)
+
+    async def get(self, request, course_id):
+        course = await aget_object_or_404(Course, id=course_id)
+        scope = await sync_to_async(get_request_scope)(request)
+        if not scope.allows(course.department_id):
+            return Response({'detail': 'Not found.'}, status=status.HTTP_404_NOT_FOUND)
+        enrollments = prefetch_for_serializer(
+            Enrollment.objects.filter(course=course),
+            CourseEnrollmentSerializer
+        )
+
+        # Filter by status if provided
+        enrollment_status = request.query_params.get('status', None)
+        if enrollment_status:
+            enrollments = enrollments.filter(status=enrollment_status)
+
+        serializer = CourseEnrollmentSerializer([enrollment async for enrollment in enrollments], many=True)
+        return Response(serializer.data)
 
 @api_view(['POST'])
 def enroll_student(request):
@@ -108,17 +180,15 @@ def complete_enrollment(request, enrollment_id):
     serializer = EnrollmentSerializer(enrollment)
     return Response(serializer.data)
 
-@api_view(['GET'])
-def enrollment_stats(request):
+class EnrollmentStats(AsyncAPIView):
     """Get enrollment statistics"""
-    total_enrollments = Enrollment.objects.count()
-    active_enrollments = Enrollment.objects.filter(status='enrolled').count()
-    completed_enrollments = Enrollment.objects.filter(status='completed').count()
-    dropped_enrollments = Enrollment.objects.filter(status='dropped').count()
-    
-    return Response({
-        'total_enrollments': total_enrollments,
-        'active_enrollments': active_enrollments,
-        'completed_enrollments': completed_enrollments,
-        'dropped_enrollments': dropped_enrollments,
-    })
+
+    async def get(self, request):
+        # One pass over the table instead of a COUNT per status
+        counts = await Enrollment.objects.aaggregate(
+            total_enrollments=Count('pk'),
+            active_enrollments=Count('pk', filter=Q(status='enrolled')),
+            completed_enrollments=Count('pk', filter=Q(status='completed')),
+            dropped_enrollments=Count('pk', filter=Q(status='dropped')),
+        )
+        return Response(counts)
@@ -0,0 +1,114 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from enrollments.models import ArchivedEnrollment, Enrollment
+
+# Enrollments that can no longer change and are only kept as history
+CLOSED_STATUSES = ('completed', 'dropped', 'withdrawn')
+
+# Columns copied between the two tables (besides the ID)
+COPIED_FIELDS = [
+    'student_id',
+    'course_id',
+    'status',
+    'enrollment_date',
+    'last_updated',
+    'grade',
+    'notes',
+]
+
+
+def default_cutoff():
+    """Closed enrollments untouched since this moment are archived"""
+    return timezone.now() - timedelta(days=getattr(settings, 'ENROLLMENT_ARCHIVE_AFTER_DAYS', 730))
+
+
+def archivable(before):
+    """Closed enrollments last updated before the cutoff"""
+    return Enrollment.objects.filter(status__in=CLOSED_STATUSES, last_updated__lt=before)
+
+
+def archive_enrollments(before=None, batch_size=None, dry_run=False):
+    """
+    Move closed enrollments older than before into ArchivedEnrollment.
+
+    Works in batches, each copied and deleted in one short transaction, so
+    a run can be stopped at any point and repeated. Returns the number of
+    rows archived (or that would be, for a dry run).
+    """
+    before = before or default_cutoff()
+    batch_size = batch_size or getattr(settings, 'ENROLLMENT_ARCHIVE_BATCH_SIZE', 1000)
+    if dry_run:
+        return archivable(before).count()
+
+    archived = 0
+    while True:
+        rows = list(
+            archivable(before).order_by('pk').values('id', *COPIED_FIELDS)[:batch_size]
+        )
+        if not rows:
+            return archived
+        now = timezone.now()
+        with transaction.atomic():
+            ArchivedEnrollment.objects.bulk_create([
+                ArchivedEnrollment(
+                    original_id=row['id'],
+                    archived_at=now,
+                    **{field: row[field] for field in COPIED_FIELDS}
+                )
+                for row in rows
+            ])
+            Enrollment.objects.filter(pk__in=[row['id'] for row in rows]).delete()
+        archived += len(rows)
+
+
+def restore_enrollments(queryset, batch_size=None):
+    """
+    Move archived enrollments (an ArchivedEnrollment queryset) back into
+    Enrollment under their original IDs.
+
+    Rows whose student is enrolled in the same course again are left in
+    the archive (the pair must be unique). Returns (restored, skipped).
+    """
+    batch_size = batch_size or getattr(settings, 'ENROLLMENT_ARCHIVE_BATCH_SIZE', 1000)
+    restored = skipped = 0
+    last_id = 0
+    while True:
+        batch = list(queryset.filter(pk__gt=last_id).order_by('pk')[:batch_size])
+        if not batch:
+            return restored, skipped
+        last_id = batch[-1].pk
+        taken = set(
+            Enrollment.objects.filter(
+                student_id__in={row.student_id for row in batch},
+                course_id__in={row.course_id for row in batch},
+            ).values_list('student_id', 'course_id')
+        )
+        movable = []
+        for row in batch:
+            pair = (row.student_id, row.course_id)
+            if pair not in taken:
+                taken.add(pair)
+                movable.append(row)
+        skipped += len(batch) - len(movable)
+        if not movable:
+            continue
+        enrollments = [
+            Enrollment(pk=row.original_id, **{field: getattr(row, field) for field in COPIED_FIELDS})
+            for row in movable
+        ]
+        with transaction.atomic():
+            Enrollment.objects.bulk_create(enrollments)
+            # bulk_create stamps the auto_now(_add) fields; put the originals back
+            Enrollment.objects.bulk_update(
+                [
+                    Enrollment(pk=row.original_id, enrollment_date=row.enrollment_date, last_updated=row.last_updated)
+                    for row in movable
+                ],
+                ['enrollment_date', 'last_updated'],
+            )
+            ArchivedEnrollment.objects.filter(pk__in=[row.pk for row in movable]).delete()
+        restored += len(movable)
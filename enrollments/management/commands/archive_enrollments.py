@@ -0,0 +1,42 @@
+from datetime import datetime, time, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from enrollments.archive import archive_enrollments, default_cutoff
+
+
+class Command(BaseCommand):
+    help = 'Move closed enrollments (completed, dropped, withdrawn) older than a cutoff to the archive table'
+
+    def add_arguments(self, parser):
+        cutoff = parser.add_mutually_exclusive_group()
+        cutoff.add_argument('--before', help='Archive rows last updated before this date (YYYY-MM-DD)')
+        cutoff.add_argument(
+            '--older-than-days',
+            type=int,
+            help='Archive rows last updated more than this many days ago (default: ENROLLMENT_ARCHIVE_AFTER_DAYS)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=None,
+            help='Rows moved per transaction (default: ENROLLMENT_ARCHIVE_BATCH_SIZE)',
+        )
+        parser.add_argument('--dry-run', action='store_true', help='Only count the rows that would be archived')
+
+    def handle(self, *args, **options):
+        if options['before']:
+            try:
+                day = datetime.strptime(options['before'], '%Y-%m-%d').date()
+            except ValueError:
+                raise CommandError('--before must be a date in YYYY-MM-DD format')
+            before = timezone.make_aware(datetime.combine(day, time.min))
+        elif options['older_than_days'] is not None:
+            before = timezone.now() - timedelta(days=options['older_than_days'])
+        else:
+            before = default_cutoff()
+
+        count = archive_enrollments(before=before, batch_size=options['batch_size'], dry_run=options['dry_run'])
+        verb = 'Would archive' if options['dry_run'] else 'Archived'
+        self.stdout.write(self.style.SUCCESS(f'{verb} {count} enrollments closed before {before:%Y-%m-%d %H:%M}'))
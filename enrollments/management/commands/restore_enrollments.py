@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from enrollments.archive import restore_enrollments
+from enrollments.models import ArchivedEnrollment
+
+
+class Command(BaseCommand):
+    help = 'Move archived enrollments back into the enrollments table'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--student', type=int, help='Only this student (database ID)')
+        parser.add_argument('--course', type=int, help='Only this course (database ID)')
+        parser.add_argument('--all', action='store_true', help='Restore the whole archive')
+
+    def handle(self, *args, **options):
+        if not (options['student'] or options['course'] or options['all']):
+            raise CommandError('Pass --student, --course or --all')
+
+        archived = ArchivedEnrollment.objects.all()
+        if options['student']:
+            archived = archived.filter(student_id=options['student'])
+        if options['course']:
+            archived = archived.filter(course_id=options['course'])
+
+        restored, skipped = restore_enrollments(archived)
+        if skipped:
+            self.stdout.write(self.style.WARNING(
+                f'{skipped} archived enrollments kept: the student is enrolled in that course again'
+            ))
+        self.stdout.write(self.style.SUCCESS(f'Restored {restored} enrollments'))
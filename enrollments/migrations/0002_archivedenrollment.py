@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:22
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0004_course_org_path'),
+        ('enrollments', '0001_initial'),
+        ('students', '0002_student_org_path'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedEnrollment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('original_id', models.PositiveBigIntegerField(unique=True)),
+                ('status', models.CharField(choices=[('enrolled', 'Enrolled'), ('dropped', 'Dropped'), ('completed', 'Completed'), ('withdrawn', 'Withdrawn')], max_length=20)),
+                ('enrollment_date', models.DateTimeField()),
+                ('last_updated', models.DateTimeField()),
+                ('grade', models.CharField(blank=True, max_length=5, null=True)),
+                ('notes', models.TextField(blank=True, null=True)),
+                ('archived_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_enrollments', to='courses.course')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_enrollments', to='students.student')),
+            ],
+            options={
+                'verbose_name': 'Archived enrollment',
+                'verbose_name_plural': 'Archived enrollments',
+                'ordering': ['-enrollment_date'],
+            },
+        ),
+    ]
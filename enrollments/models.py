@@ -2,6 +2,7 @@ from django.db import models
 from django.utils.translation import gettext_lazy as _
 from django.urls import reverse
 from django.core.exceptions import ValidationError
+from django.utils import timezone
 from students.models import Student
 from courses.models import Course
 
@@ -63,3 +64,27 @@ class Enrollment(models.Model):
         if grade:
             self.grade = grade
         self.save()
+
+
+class ArchivedEnrollment(models.Model):
+    """
+    A closed enrollment moved out of the Enrollment table by
+    enrollments.archive; keeps the original ID so it can be restored
+    """
+    original_id = models.PositiveBigIntegerField(unique=True)
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name='archived_enrollments')
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='archived_enrollments')
+    status = models.CharField(max_length=20, choices=Enrollment.ENROLLMENT_STATUS_CHOICES)
+    enrollment_date = models.DateTimeField()
+    last_updated = models.DateTimeField()
+    grade = models.CharField(max_length=5, blank=True, null=True)
+    notes = models.TextField(blank=True, null=True)
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name = _("Archived enrollment")
+        verbose_name_plural = _("Archived enrollments")
+        ordering = ['-enrollment_date']
+
+    def __str__(self):
+        return f"{self.student} in {self.course} ({self.status}, archived)"
@@ -3,6 +3,7 @@ from django.core.exceptions import ValidationError
 from django.urls import reverse
 from rest_framework.test import APITestCase
 from rest_framework import status
+from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import get_user_model
 from students.models import Student
 from courses.models import Course
@@ -511,3 +512,199 @@ class EnrollmentAPITest(APITestCase):
         self.assertFalse(duplicate_serializer.is_valid())
         # The error comes from database unique constraint, not our custom validation
         self.assertIn('unique', str(duplicate_serializer.errors).lower())
+
+
+class EnrollmentArchiveTest(APITestCase):
+    """Test cases for archiving and restoring closed enrollments"""
+
+    def setUp(self):
+        from datetime import timedelta
+        from django.core.cache import cache
+        from django.utils import timezone
+        cache.clear()
+        self.college = College.objects.create(name="Archive College")
+        self.department = Department.objects.create(name="History", college=self.college)
+        self.courses = [
+            Course.objects.create(name=f"Course {index}", code=f"AR{index}", department=self.department)
+            for index in range(4)
+        ]
+        self.student = Student.objects.create(
+            department=self.department,
+            first_name="Old",
+            last_name="Timer",
+            student_id="ARC-1",
+            email="old@example.com",
+            contact_number="123"
+        )
+        self.old = timezone.now() - timedelta(days=1000)
+        statuses = ['completed', 'dropped', 'enrolled', 'completed']
+        self.enrollments = []
+        for course, enrollment_status in zip(self.courses, statuses):
+            enrollment = Enrollment.objects.create(student=self.student, course=course, status=enrollment_status)
+            self.enrollments.append(enrollment)
+        self.enrollments[0].grade = 'A'
+        self.enrollments[0].save()
+        # The first three are old; the last completed one is recent
+        Enrollment.objects.filter(pk__in=[e.pk for e in self.enrollments[:3]]).update(
+            last_updated=self.old, enrollment_date=self.old
+        )
+        self.admin = User.objects.create_user(username='admin', role='admin')
+        self.client.force_authenticate(user=self.admin)
+
+    def test_archive_moves_only_old_closed_rows(self):
+        """Test archiving keeps active and recent rows in place"""
+        from enrollments.archive import archive_enrollments
+        from enrollments.models import ArchivedEnrollment
+
+        self.assertEqual(archive_enrollments(dry_run=True), 2)
+        self.assertEqual(archive_enrollments(batch_size=1), 2)
+        self.assertEqual(
+            set(Enrollment.objects.values_list('pk', flat=True)),
+            {self.enrollments[2].pk, self.enrollments[3].pk}
+        )
+        archived = ArchivedEnrollment.objects.get(original_id=self.enrollments[0].pk)
+        self.assertEqual((archived.status, archived.grade, archived.enrollment_date), ('completed', 'A', self.old))
+        self.assertEqual(archive_enrollments(), 0)
+
+    def test_history_and_transcript_read_both_tables(self):
+        """Test student endpoints include archived enrollments"""
+        from enrollments.archive import archive_enrollments
+        archive_enrollments()
+
+        response = self.client.get(reverse('student-enrollments', kwargs={'student_id': self.student.pk}))
+        self.assertEqual(len(response.data), 4)
+        by_id = {row['id']: row for row in response.data}
+        self.assertTrue(by_id[self.enrollments[0].pk]['archived'])
+        self.assertFalse(by_id[self.enrollments[3].pk]['archived'])
+
+        response = self.client.get(
+            reverse('student-enrollments', kwargs={'student_id': self.student.pk}), {'status': 'completed'}
+        )
+        self.assertEqual(len(response.data), 2)
+
+        response = self.client.get(reverse('student-transcript', kwargs={'student_id': self.student.pk}))
+        self.assertEqual(response.data['completed_count'], 2)
+        self.assertEqual([row['course_code'] for row in response.data['courses']], ['AR0', 'AR3'])
+        self.assertEqual(response.data['courses'][0]['grade'], 'A')
+
+    def test_restore_keeps_ids_and_dates(self):
+        """Test restored enrollments come back unchanged, except re-enrollments"""
+        from enrollments.archive import archive_enrollments
+        from enrollments.models import ArchivedEnrollment
+        archive_enrollments()
+        # Re-enrolled in the dropped course since
+        Enrollment.objects.create(student=self.student, course=self.courses[1])
+
+        response = self.client.post(
+            reverse('student-enrollments-restore', kwargs={'student_id': self.student.pk})
+        )
+        self.assertEqual(response.data, {'restored': 1, 'skipped': 1})
+        restored = Enrollment.objects.get(pk=self.enrollments[0].pk)
+        self.assertEqual((restored.grade, restored.enrollment_date, restored.last_updated), ('A', self.old, self.old))
+        self.assertEqual(ArchivedEnrollment.objects.get().course, self.courses[1])
+
+
+    def test_restore_rejects_invalid_course(self):
+        """Test a non-integer course is a 400, not a server error"""
+        url = reverse('student-enrollments-restore', kwargs={'student_id': self.student.pk})
+        for course in ('abc', ['1'], {'id': 1}):
+            response = self.client.post(url, {'course': course}, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn('course', response.data)
+
+class AsyncReadEndpointTest(TestCase):
+    """Test the async read endpoints through the ASGI request path"""
+
+    def setUp(self):
+        self.college = College.objects.create(name="Async College")
+        self.department = Department.objects.create(name="Async Dept", college=self.college)
+        self.student = Student.objects.create(
+            department=self.department,
+            first_name="Async",
+            last_name="Student",
+            student_id="AS-1",
+            email="async@example.com",
+            contact_number="123"
+        )
+        self.course = Course.objects.create(department=self.department, name="Async Course", code="AS101")
+        Enrollment.objects.create(student=self.student, course=self.course)
+        self.user = User.objects.create_user(username='async-admin', role='admin', department=self.department)
+        token = RefreshToken.for_user(self.user).access_token
+        self.headers = {'Authorization': f'Bearer {token}'}
+
+    async def test_requires_authentication(self):
+        """Test authentication and permissions still apply"""
+        response = await self.async_client.get(reverse('enrollment-stats'))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    async def test_read_endpoints(self):
+        """Test each endpoint answers from the async ORM"""
+        response = await self.async_client.get(reverse('enrollment-stats'), headers=self.headers)
+        self.assertEqual(response.json()['total_enrollments'], 1)
+        self.assertEqual(response.json()['active_enrollments'], 1)
+
+        response = await self.async_client.get(
+            reverse('student-enrollments', args=[self.student.id]), headers=self.headers
+        )
+        self.assertEqual([row['course_code'] for row in response.json()], ['AS101'])
+
+        response = await self.async_client.get(
+            reverse('course-enrollments', args=[self.course.id]), headers=self.headers
+        )
+        self.assertEqual(len(response.json()), 1)
+
+        response = await self.async_client.get(reverse('users_v1:profile'), headers=self.headers)
+        self.assertEqual(response.json()['department_name'], "Async Dept")
+
+    async def test_missing_object(self):
+        """Test unknown IDs return 404"""
+        response = await self.async_client.get(reverse('student-enrollments', args=[999]), headers=self.headers)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class EnrollmentListScopeTest(APITestCase):
+    """Test the per-student and per-course enrollment lists respect access scope"""
+
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        college = College.objects.create(name="Scope College")
+        self.department = Department.objects.create(name="Physics", college=college)
+        self.other_department = Department.objects.create(name="Biology", college=college)
+        self.course = Course.objects.create(name="Mechanics", code="PH101", department=self.department)
+        self.other_course = Course.objects.create(name="Cells", code="BI101", department=self.other_department)
+        self.student = Student.objects.create(
+            department=self.department, first_name="Ada", last_name="One",
+            student_id="SC-1", email="ada@example.com", contact_number="123"
+        )
+        self.other_student = Student.objects.create(
+            department=self.department, first_name="Bob", last_name="Two",
+            student_id="SC-2", email="bob@example.com", contact_number="456"
+        )
+        Enrollment.objects.create(student=self.student, course=self.course, status='completed', grade='A')
+        Enrollment.objects.create(student=self.other_student, course=self.course, status='completed', grade='B')
+        self.student_user = User.objects.create_user(
+            username='ada', role='student', department=self.department, student_id='SC-1'
+        )
+
+    def test_student_reads_only_own_enrollments(self):
+        """Test a student gets 404 for another student's enrollments"""
+        self.client.force_authenticate(user=self.student_user)
+        response = self.client.get(reverse('student-enrollments', args=[self.student.id]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row['grade'] for row in response.json()], ['A'])
+
+        response = self.client.get(reverse('student-enrollments', args=[self.other_student.id]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_course_roster_limited_to_department(self):
+        """Test a teacher only reads the rosters of their department's courses"""
+        teacher = User.objects.create_user(username='teacher', role='teacher', department=self.department)
+        self.client.force_authenticate(user=teacher)
+        response = self.client.get(reverse('course-enrollments', args=[self.course.id]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.json()), 2)
+        response = self.client.get(reverse('course-enrollments', args=[self.other_course.id]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.get(reverse('student-enrollments', args=[self.other_student.id]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
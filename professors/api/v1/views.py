@@ -2,11 +2,14 @@ from rest_framework import generics
 from rest_framework.response import Response
 from rest_framework import status
 from drf_yasg.utils import swagger_auto_schema
+from core.caching import CachedReadMixin, ObjectCacheMixin
+from core.prefetch import AutoPrefetchMixin
+from users.scoping import ScopedQuerysetMixin
 from professors.models import Professor
 from .serializers import ProfessorsSerializer
 
 # get all professors and create a new professor
-class ProfessorListCreate(generics.ListCreateAPIView):
+class ProfessorListCreate(CachedReadMixin, ScopedQuerysetMixin, AutoPrefetchMixin, generics.ListCreateAPIView):
     queryset = Professor.objects.all()
     serializer_class = ProfessorsSerializer
 
@@ -18,20 +21,18 @@ class ProfessorListCreate(generics.ListCreateAPIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
 # get, update, delete professor by ID
-class ProfessorRetrieveUpdateDestroy(generics.RetrieveUpdateDestroyAPIView):
+class ProfessorRetrieveUpdateDestroy(ObjectCacheMixin, ScopedQuerysetMixin, AutoPrefetchMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Professor.objects.all()
     serializer_class = ProfessorsSerializer
 
     def get(self, request, *args, **kwargs):
-        professor = self.get_object()
-        serializer = self.get_serializer(professor)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return self.retrieve(request, *args, **kwargs)
 
     def put(self, request, *args, **kwargs):
         professor = self.get_object()
         serializer = self.get_serializer(professor, data=request.data)
         if serializer.is_valid():
-            serializer.save()
+            self.perform_update(serializer)
             return Response(serializer.data, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -39,7 +40,7 @@ class ProfessorRetrieveUpdateDestroy(generics.RetrieveUpdateDestroyAPIView):
         professor = self.get_object()
         serializer = self.get_serializer(professor, data=request.data, partial=True)
         if serializer.is_valid():
-            serializer.save()
+            self.perform_update(serializer)
             return Response(serializer.data, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -2,9 +2,11 @@ from django.db import models
 from django.utils.translation import gettext_lazy as _
 from django.urls import reverse
 from departments.models import Department
+from colleges.models import OrgPathModel
 # Create your models here.
-class Professor(models.Model):
+class Professor(OrgPathModel):
     department = models.ForeignKey('departments.Department', on_delete=models.CASCADE, related_name='professors')
+    org_path = models.CharField(max_length=64, default='', editable=False, db_index=True)  # Ancestor IDs, see colleges.hierarchy
     first_name = models.CharField(max_length=100)
     last_name = models.CharField(max_length=100)
     specialization = models.CharField(max_length=255)
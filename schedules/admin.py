@@ -0,0 +1,45 @@
+from django.contrib import admin
+from .models import Room, Section, MeetingTime, SectionEnrollment, ProfessorAvailability, TimetableJob
+
+
+class MeetingTimeInline(admin.TabularInline):
+    model = MeetingTime
+    extra = 1
+
+
+@admin.register(Room)
+class RoomAdmin(admin.ModelAdmin):
+    list_display = ['name', 'building', 'capacity']
+    search_fields = ['name', 'building']
+
+
+@admin.register(Section)
+class SectionAdmin(admin.ModelAdmin):
+    list_display = ['subject', 'code', 'term', 'professor', 'room', 'capacity']
+    list_filter = ['term']
+    raw_id_fields = ['subject', 'professor', 'room']
+    inlines = [MeetingTimeInline]
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('subject', 'professor', 'room')
+
+
+@admin.register(SectionEnrollment)
+class SectionEnrollmentAdmin(admin.ModelAdmin):
+    list_display = ['section', 'student']
+    raw_id_fields = ['section', 'student']
+
+
+@admin.register(ProfessorAvailability)
+class ProfessorAvailabilityAdmin(admin.ModelAdmin):
+    list_display = ['professor', 'day', 'start_time', 'end_time']
+    list_filter = ['day']
+    raw_id_fields = ['professor']
+
+
+@admin.register(TimetableJob)
+class TimetableJobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'term', 'department', 'status', 'apply', 'created_at', 'finished_at']
+    list_filter = ['status']
+    raw_id_fields = ['department', 'requested_by']
+    readonly_fields = ['result', 'error']
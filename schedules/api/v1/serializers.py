@@ -0,0 +1,140 @@
+from rest_framework import serializers
+from schedules.conflicts import check_section
+from schedules.models import MeetingTime, Room, Section, SectionEnrollment, TimetableJob
+
+
+class RoomSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Room
+        fields = ['id', 'name', 'building', 'capacity']
+
+
+class MeetingTimeSerializer(serializers.ModelSerializer):
+    day_display = serializers.CharField(source='get_day_display', read_only=True)
+
+    class Meta:
+        model = MeetingTime
+        fields = ['id', 'day', 'day_display', 'start_time', 'end_time']
+
+    def validate(self, attrs):
+        if attrs['start_time'] >= attrs['end_time']:
+            raise serializers.ValidationError({'end_time': 'End time must be after start time.'})
+        return attrs
+
+
+class SectionSerializer(serializers.ModelSerializer):
+    """
+    Section with its meeting times; writes replace the meeting list and are
+    rejected when they would double book the professor, the room or an
+    enrolled student, or when two of the meetings overlap
+    """
+    subject_name = serializers.CharField(source='subject.name', read_only=True)
+    professor_name = serializers.CharField(source='professor.__str__', read_only=True, default=None)
+    room_name = serializers.CharField(source='room.name', read_only=True, default=None)
+    meetings = MeetingTimeSerializer(many=True, required=False)
+
+    class Meta:
+        model = Section
+        fields = [
+            'id',
+            'subject',
+            'subject_name',
+            'professor',
+            'professor_name',
+            'room',
+            'room_name',
+            'term',
+            'code',
+            'capacity',
+            'meetings',
+        ]
+
+    def validate(self, attrs):
+        instance = self.instance
+
+        def current(field):
+            if field in attrs:
+                return attrs[field]
+            return getattr(instance, field, None) if instance else None
+
+        if 'meetings' in attrs:
+            meetings = [(m['day'], m['start_time'], m['end_time']) for m in attrs['meetings']]
+        elif instance is not None:
+            meetings = list(instance.meetings.values_list('day', 'start_time', 'end_time'))
+        else:
+            meetings = []
+        professor = current('professor')
+        room = current('room')
+        student_ids = ()
+        if instance is not None:
+            student_ids = SectionEnrollment.objects.filter(section=instance).values_list('student_id', flat=True)
+        conflicts = check_section(
+            current('term'),
+            meetings,
+            professor_id=professor.pk if professor else None,
+            room_id=room.pk if room else None,
+            student_ids=student_ids,
+            exclude_section=instance.pk if instance else None,
+        )
+        if conflicts:
+            raise serializers.ValidationError({'conflicts': conflicts})
+        return attrs
+
+    def create(self, validated_data):
+        meetings = validated_data.pop('meetings', [])
+        section = Section.objects.create(**validated_data)
+        MeetingTime.objects.bulk_create(MeetingTime(section=section, **meeting) for meeting in meetings)
+        return section
+
+    def update(self, instance, validated_data):
+        meetings = validated_data.pop('meetings', None)
+        instance = super().update(instance, validated_data)
+        if meetings is not None:
+            instance.meetings.all().delete()
+            MeetingTime.objects.bulk_create(MeetingTime(section=instance, **meeting) for meeting in meetings)
+            if hasattr(instance, '_prefetched_objects_cache'):
+                instance._prefetched_objects_cache.pop('meetings', None)
+        return instance
+
+
+class SectionValidationSerializer(serializers.Serializer):
+    """
+    A proposed (or edited) section to check against the rest of its term
+    """
+    term = serializers.CharField(max_length=20)
+    section = serializers.IntegerField(required=False, allow_null=True)
+    professor = serializers.IntegerField(required=False, allow_null=True)
+    room = serializers.IntegerField(required=False, allow_null=True)
+    students = serializers.ListField(child=serializers.IntegerField(), required=False, default=list)
+    meetings = MeetingTimeSerializer(many=True)
+
+
+class TimetableRequestSerializer(serializers.Serializer):
+    term = serializers.CharField(max_length=20)
+    department = serializers.IntegerField(required=False, allow_null=True)
+    # Solved on a thread of a web worker (schedules.jobs), which a recycle
+    # only waits graceful_timeout (30s) for
+    time_limit = serializers.FloatField(required=False, min_value=0.1, max_value=25)
+    seed = serializers.IntegerField(required=False, allow_null=True)
+    keep_rooms = serializers.BooleanField(default=False)
+    apply = serializers.BooleanField(default=False)
+
+
+class TimetableJobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = TimetableJob
+        fields = [
+            'id',
+            'term',
+            'department',
+            'time_limit',
+            'seed',
+            'keep_rooms',
+            'apply',
+            'status',
+            'result',
+            'error',
+            'created_at',
+            'finished_at',
+        ]
+        read_only_fields = fields
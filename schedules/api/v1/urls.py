@@ -0,0 +1,26 @@
+from django.urls import path
+from .views import (
+    RoomListCreate,
+    RoomRetrieveUpdateDestroy,
+    SectionListCreate,
+    SectionRetrieveUpdateDestroy,
+    validate_section,
+    section_conflicts,
+    generate_term_timetable,
+    timetable_job_detail,
+)
+
+urlpatterns = [
+    path('rooms/', RoomListCreate.as_view(), name='room-list-create'),
+    path('rooms/<int:pk>/', RoomRetrieveUpdateDestroy.as_view(), name='room-detail'),
+    path('sections/', SectionListCreate.as_view(), name='section-list-create'),
+    path('sections/<int:pk>/', SectionRetrieveUpdateDestroy.as_view(), name='section-detail'),
+
+    # Conflict detection
+    path('sections/validate/', validate_section, name='section-validate'),
+    path('sections/conflicts/', section_conflicts, name='section-conflicts'),
+
+    # Timetable generation
+    path('timetable/generate/', generate_term_timetable, name='timetable-generate'),
+    path('timetable/jobs/<int:pk>/', timetable_job_detail, name='timetable-job-detail'),
+]
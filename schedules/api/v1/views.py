@@ -0,0 +1,154 @@
+from rest_framework import generics, status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from django.shortcuts import get_object_or_404
+from core.prefetch import AutoPrefetchMixin
+from schedules.conflicts import RESOURCES, check_section, find_conflicts
+from departments.models import Department
+from schedules.jobs import fail_abandoned_jobs, start_timetable_job
+from schedules.models import Room, Section, SectionEnrollment, TimetableJob
+from users.permissions import IsDean
+from users.scope import get_request_scope
+from users.scoping import ScopedQuerysetMixin
+from .serializers import (
+    RoomSerializer,
+    SectionSerializer,
+    SectionValidationSerializer,
+    TimetableJobSerializer,
+    TimetableRequestSerializer,
+)
+
+
+class RoomListCreate(generics.ListCreateAPIView):
+    queryset = Room.objects.all()
+    serializer_class = RoomSerializer
+
+
+class RoomRetrieveUpdateDestroy(generics.RetrieveUpdateDestroyAPIView):
+    queryset = Room.objects.all()
+    serializer_class = RoomSerializer
+
+
+class SectionListCreate(ScopedQuerysetMixin, AutoPrefetchMixin, generics.ListCreateAPIView):
+    queryset = Section.objects.all()
+    serializer_class = SectionSerializer
+    scope_department_field = 'subject__course__department_id'
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+
+        # Filter by term if provided
+        term = self.request.query_params.get('term', None)
+        if term:
+            queryset = queryset.filter(term=term)
+
+        # Filter by professor if provided
+        professor_id = self.request.query_params.get('professor', None)
+        if professor_id:
+            queryset = queryset.filter(professor_id=professor_id)
+
+        return queryset
+
+
+class SectionRetrieveUpdateDestroy(ScopedQuerysetMixin, AutoPrefetchMixin, generics.RetrieveUpdateDestroyAPIView):
+    queryset = Section.objects.all()
+    serializer_class = SectionSerializer
+    scope_department_field = 'subject__course__department_id'
+
+
+@api_view(['POST'])
+def validate_section(request):
+    """
+    Check a proposed section's meeting times for professor, room and
+    student double bookings without saving anything
+    """
+    serializer = SectionValidationSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    data = serializer.validated_data
+    students = set(data['students'])
+    if data.get('section'):
+        # An edited section keeps its enrolled students
+        students.update(
+            SectionEnrollment.objects.filter(section_id=data['section']).values_list('student_id', flat=True)
+        )
+    conflicts = check_section(
+        data['term'],
+        [(m['day'], m['start_time'], m['end_time']) for m in data['meetings']],
+        professor_id=data.get('professor'),
+        room_id=data.get('room'),
+        student_ids=students,
+        exclude_section=data.get('section'),
+    )
+    return Response({'valid': not conflicts, 'conflicts': conflicts})
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, IsDean])
+def section_conflicts(request):
+    """
+    Batch report of every double booking in a term (?term=, optional
+    ?resource=professor|room|student)
+    """
+    term = request.query_params.get('term')
+    if not term:
+        return Response({'error': 'term is required.'}, status=status.HTTP_400_BAD_REQUEST)
+    resources = RESOURCES
+    resource = request.query_params.get('resource')
+    if resource:
+        if resource not in RESOURCES:
+            return Response(
+                {'error': f'resource must be one of: {", ".join(RESOURCES)}.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        resources = (resource,)
+    conflicts = find_conflicts(term, resources=resources)
+    return Response({'term': term, 'count': len(conflicts), 'conflicts': conflicts})
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated, IsDean])
+def generate_term_timetable(request):
+    """
+    Assign meeting times and rooms to a term's sections. Only reports the
+    result unless apply is true; non-admins must pick one of their
+    departments. The search runs as a background job: responds 202 with the
+    job, whose result holds the report once it is completed.
+    """
+    serializer = TimetableRequestSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    data = serializer.validated_data
+    department_id = data.get('department')
+    scope = get_request_scope(request)
+    if not scope.is_admin and not scope.can_manage_department(department_id):
+        return Response(
+            {'error': 'You can only generate timetables for your own departments.'},
+            status=status.HTTP_403_FORBIDDEN
+        )
+    if department_id is not None and not Department.objects.filter(pk=department_id).exists():
+        return Response({'department': ['Department not found.']}, status=status.HTTP_400_BAD_REQUEST)
+    job = TimetableJob.objects.create(
+        term=data['term'],
+        department_id=department_id,
+        time_limit=data.get('time_limit'),
+        seed=data.get('seed'),
+        apply=data['apply'],
+        keep_rooms=data['keep_rooms'],
+        requested_by=request.user,
+    )
+    start_timetable_job(job)
+    return Response(TimetableJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, IsDean])
+def timetable_job_detail(request, pk):
+    """Get the status of a timetable job and, once completed, its report"""
+    fail_abandoned_jobs()
+    job = get_object_or_404(TimetableJob, pk=pk)
+    scope = get_request_scope(request)
+    if not scope.is_admin and not scope.can_manage_department(job.department_id):
+        return Response({'detail': 'Not found.'}, status=status.HTTP_404_NOT_FOUND)
+    return Response(TimetableJobSerializer(job).data)
@@ -0,0 +1,226 @@
+from bisect import bisect_left
+from collections import defaultdict
+
+from django.db.models import Q
+
+from core.routing import use_replica
+from schedules.models import MeetingTime, Section, SectionEnrollment
+
+MINUTES_PER_DAY = 24 * 60
+
+# Resources that can only be in one place at a time
+RESOURCES = ('professor', 'room', 'student')
+
+
+def to_week_minutes(day, time):
+    """Encode a weekday and time of day as minutes since Monday 00:00"""
+    return day * MINUTES_PER_DAY + time.hour * 60 + time.minute
+
+
+def format_week_minutes(minutes):
+    """Inverse of to_week_minutes, as (day, 'HH:MM')"""
+    day, minutes = divmod(minutes, MINUTES_PER_DAY)
+    return day, '{:02d}:{:02d}'.format(*divmod(minutes, 60))
+
+
+class IntervalIndex:
+    """
+    Static index of half-open [start, end) intervals.
+
+    Intervals are kept sorted by start with a segment tree of the maximum
+    end over each range, so overlap queries skip every subtree that ends
+    before the query begins: O(log n + k) per query for k matches, and
+    O(n log n + k) to enumerate all overlapping pairs.
+    """
+    def __init__(self, intervals):
+        # intervals: iterable of (start, end, payload)
+        self.intervals = sorted(intervals, key=lambda interval: (interval[0], interval[1]))
+        self.starts = [interval[0] for interval in self.intervals]
+        size = 1
+        while size < len(self.intervals):
+            size *= 2
+        self._size = size
+        self._max_end = [float('-inf')] * (2 * size)
+        for position, interval in enumerate(self.intervals):
+            self._max_end[size + position] = interval[1]
+        for node in range(size - 1, 0, -1):
+            self._max_end[node] = max(self._max_end[2 * node], self._max_end[2 * node + 1])
+
+    def __len__(self):
+        return len(self.intervals)
+
+    def overlapping(self, start, end):
+        """Return the intervals that overlap [start, end)"""
+        # Only intervals starting before `end` can overlap; of those, the
+        # tree prunes the ones that finish by `start`
+        limit = bisect_left(self.starts, end)
+        found = []
+        if limit:
+            self._collect(1, 0, self._size, limit, start, found)
+        return found
+
+    def _collect(self, node, low, high, limit, start, found):
+        if low >= limit or self._max_end[node] <= start:
+            return
+        if high - low == 1:
+            found.append(self.intervals[low])
+            return
+        middle = (low + high) // 2
+        self._collect(2 * node, low, middle, limit, start, found)
+        self._collect(2 * node + 1, middle, high, limit, start, found)
+
+    def overlapping_pairs(self):
+        """
+        Yield every pair of overlapping intervals once, in start order.
+
+        With the intervals sorted by start, everything that starts before an
+        interval ends (and after it starts) overlaps it, so each interval's
+        partners are one contiguous run found by bisection.
+        """
+        for position, first in enumerate(self.intervals):
+            stop = bisect_left(self.starts, first[1], position + 1)
+            for second in self.intervals[position + 1:stop]:
+                yield first, second
+
+
+def _conflict(resource, resource_id, first, second):
+    start = max(first[0], second[0])
+    end = min(first[1], second[1])
+    day, start_text = format_week_minutes(start)
+    _, end_text = format_week_minutes(end)
+    return {
+        'resource': resource,
+        'resource_id': resource_id,
+        # A proposed section has no IDs yet
+        'sections': sorted(pk for pk in (first[2][0], second[2][0]) if pk is not None),
+        'meetings': sorted(pk for pk in (first[2][1], second[2][1]) if pk is not None),
+        'day': day,
+        'start': start_text,
+        'end': end_text,
+    }
+
+
+def _meeting_intervals(meetings):
+    """Group (id, section_id, day, start, end) rows into intervals per section"""
+    by_section = defaultdict(list)
+    for meeting_id, section_id, day, start_time, end_time in meetings:
+        by_section[section_id].append((
+            to_week_minutes(day, start_time),
+            to_week_minutes(day, end_time),
+            (section_id, meeting_id),
+        ))
+    return by_section
+
+
+def _resource_intervals(by_section, sections, memberships):
+    """
+    Map (resource, id) to the intervals of every section that uses it
+    """
+    grouped = defaultdict(list)
+    for section_id, professor_id, room_id in sections:
+        intervals = by_section.get(section_id, ())
+        if professor_id is not None:
+            grouped['professor', professor_id].extend(intervals)
+        if room_id is not None:
+            grouped['room', room_id].extend(intervals)
+    for section_id, student_id in memberships:
+        grouped['student', student_id].extend(by_section.get(section_id, ()))
+    return grouped
+
+
+@use_replica()
+def find_conflicts(term, resources=RESOURCES):
+    """
+    Return every professor, room and student double booking in a term.
+
+    Loads the term with three flat queries, then builds one interval index
+    per resource, so the cost grows with the number of meetings and actual
+    conflicts rather than with the square of the section count.
+    """
+    by_section = _meeting_intervals(
+        MeetingTime.objects.filter(section__term=term)
+        .values_list('id', 'section_id', 'day', 'start_time', 'end_time')
+    )
+    sections = Section.objects.filter(term=term).values_list('id', 'professor_id', 'room_id')
+    memberships = ()
+    if 'student' in resources:
+        memberships = (
+            SectionEnrollment.objects.filter(section__term=term)
+            .values_list('section_id', 'student_id')
+            .iterator(chunk_size=5000)
+        )
+
+    conflicts = []
+    grouped = _resource_intervals(by_section, sections, memberships)
+    for (resource, resource_id), intervals in grouped.items():
+        if resource not in resources or len(intervals) < 2:
+            continue
+        for first, second in IntervalIndex(intervals).overlapping_pairs():
+            if first[2][0] != second[2][0]:
+                conflicts.append(_conflict(resource, resource_id, first, second))
+    conflicts.sort(key=lambda c: (RESOURCES.index(c['resource']), c['resource_id'], c['day'], c['start']))
+    return conflicts
+
+
+def check_section(term, meetings, professor_id=None, room_id=None, student_ids=(), exclude_section=None):
+    """
+    Return the conflicts a proposed section would cause in a term.
+
+    meetings is a list of (day, start_time, end_time). Only the sections
+    sharing the professor, room or one of the students are loaded, and
+    each proposed meeting is one index query per resource. exclude_section
+    is the ID of the section being edited, so it never clashes with its
+    old self. Proposed meetings that overlap each other are reported with
+    resource 'section'.
+    """
+    student_ids = set(student_ids)
+    proposed = [
+        (to_week_minutes(day, start_time), to_week_minutes(day, end_time), (exclude_section, None))
+        for day, start_time, end_time in meetings
+    ]
+    conflicts = [
+        _conflict('section', exclude_section, first, second)
+        for first, second in IntervalIndex(proposed).overlapping_pairs()
+    ]
+    if not meetings or not (professor_id or room_id or student_ids):
+        return conflicts
+
+    memberships = []
+    if student_ids:
+        memberships = list(
+            SectionEnrollment.objects
+            .filter(section__term=term, student_id__in=student_ids)
+            .values_list('section_id', 'student_id')
+        )
+    related = Q(pk__in={section_id for section_id, _ in memberships})
+    if professor_id:
+        related |= Q(professor_id=professor_id)
+    if room_id:
+        related |= Q(room_id=room_id)
+    sections = Section.objects.filter(related, term=term)
+    if exclude_section is not None:
+        sections = sections.exclude(pk=exclude_section)
+    sections = list(sections.values_list('id', 'professor_id', 'room_id'))
+
+    by_section = _meeting_intervals(
+        MeetingTime.objects.filter(section_id__in=[section_id for section_id, _, _ in sections])
+        .values_list('id', 'section_id', 'day', 'start_time', 'end_time')
+    )
+    known = {section_id for section_id, _, _ in sections}
+    grouped = _resource_intervals(
+        by_section,
+        sections,
+        [(section_id, student_id) for section_id, student_id in memberships if section_id in known],
+    )
+
+    wanted = [('professor', professor_id), ('room', room_id)]
+    wanted.extend(('student', student_id) for student_id in sorted(student_ids))
+    for resource, resource_id in wanted:
+        intervals = grouped.get((resource, resource_id))
+        if not resource_id or not intervals:
+            continue
+        index = IntervalIndex(intervals)
+        for interval in proposed:
+            for other in index.overlapping(interval[0], interval[1]):
+                conflicts.append(_conflict(resource, resource_id, interval, other))
+    return conflicts
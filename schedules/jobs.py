@@ -0,0 +1,97 @@
+import logging
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from schedules.models import TimetableJob
+from schedules.timetable import generate_timetable
+
+logger = logging.getLogger(__name__)
+
+
+def run_timetable_job(job):
+    """
+    Solve a claimed job and store the report on it.
+
+    Jobs run inside a web worker, so the search runs its restarts one after
+    another in this process instead of forking a process pool; use
+    `manage.py generate_timetable` for parallel restarts.
+    """
+    try:
+        job.result = generate_timetable(
+            job.term,
+            department_id=job.department_id,
+            workers=1,
+            time_limit=job.time_limit,
+            seed=job.seed,
+            apply=job.apply,
+            keep_rooms=job.keep_rooms,
+        )
+        job.status = 'completed'
+        job.finished_at = timezone.now()
+        job.save(update_fields=['status', 'result', 'finished_at', 'updated_at'])
+    except Exception as e:
+        job.status = 'failed'
+        job.error = str(e)
+        job.finished_at = timezone.now()
+        job.save(update_fields=['status', 'error', 'finished_at', 'updated_at'])
+        raise
+    return job
+
+
+def fail_abandoned_jobs(after=None):
+    """
+    Mark running jobs that have not finished within after seconds (default:
+    three time limits) as failed; their worker exited mid-solve
+    """
+    if after is None:
+        after = 3 * max(getattr(settings, 'TIMETABLE_TIME_LIMIT', 30), 25) + 60
+    cutoff = timezone.now() - timedelta(seconds=after)
+    return TimetableJob.objects.filter(status='running', updated_at__lt=cutoff).update(
+        status='failed', error='Abandoned: the worker running it exited.',
+        finished_at=timezone.now(), updated_at=timezone.now()
+    )
+
+
+def _run_in_thread(job_id):
+    try:
+        run_timetable_job(TimetableJob.objects.get(pk=job_id))
+    except Exception:
+        logger.exception('Timetable job %s failed', job_id)
+        TimetableJob.objects.filter(pk=job_id, status__in=['pending', 'running']).update(
+            status='failed', error='Failed before it could record an error; see the log.',
+            finished_at=timezone.now(), updated_at=timezone.now()
+        )
+    finally:
+        # The thread has its own connection; don't leak it
+        connection.close()
+
+
+def start_timetable_job(job):
+    """
+    Run a pending job: on a background thread when TIMETABLE_JOBS_IN_THREAD
+    is on (the default), otherwise inline
+    """
+    claimed = TimetableJob.objects.filter(pk=job.pk, status='pending').update(
+        status='running', updated_at=timezone.now()
+    )
+    if not claimed:
+        return False
+    job.status = 'running'
+    if getattr(settings, 'TIMETABLE_JOBS_IN_THREAD', True):
+        # Start once the claim is committed, so the thread can see it
+        transaction.on_commit(lambda: threading.Thread(
+            target=_run_in_thread,
+            args=(job.pk,),
+            name=f'timetable-job-{job.pk}',
+            daemon=True,
+        ).start())
+    else:
+        try:
+            run_timetable_job(job)
+        except Exception:
+            logger.exception('Timetable job %s failed', job.pk)
+    return True
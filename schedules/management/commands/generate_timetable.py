@@ -0,0 +1,78 @@
+from django.core.management.base import BaseCommand
+
+from schedules.timetable import generate_timetable
+
+DAYS = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+
+
+class Command(BaseCommand):
+    help = 'Assign meeting times and rooms to the sections of a term'
+
+    def add_arguments(self, parser):
+        parser.add_argument('term', help='Term to schedule, e.g. 2025-FALL')
+        parser.add_argument(
+            '--department',
+            type=int,
+            default=None,
+            help='Only schedule this department\'s sections (others stay as they are)',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=None,
+            help='Parallel search processes (default: TIMETABLE_WORKERS or CPU count)',
+        )
+        parser.add_argument(
+            '--time-limit',
+            type=float,
+            default=None,
+            help='Seconds per search (default: TIMETABLE_TIME_LIMIT)',
+        )
+        parser.add_argument('--seed', type=int, default=None, help='Random seed, for repeatable runs')
+        parser.add_argument(
+            '--keep-rooms',
+            action='store_true',
+            help='Keep rooms already assigned to sections and only choose times',
+        )
+        parser.add_argument(
+            '--apply',
+            action='store_true',
+            help='Save the timetable (default: only report it)',
+        )
+
+    def handle(self, *args, **options):
+        report = generate_timetable(
+            options['term'],
+            department_id=options['department'],
+            workers=options['workers'],
+            time_limit=options['time_limit'],
+            seed=options['seed'],
+            apply=options['apply'],
+            keep_rooms=options['keep_rooms'],
+        )
+        if not report['sections']:
+            self.stdout.write(self.style.WARNING(f'No sections to schedule in {options["term"]}'))
+            return
+
+        if options['verbosity'] > 1:
+            for assignment in report['assignments']:
+                slots = ', '.join(
+                    f'{DAYS[m["day"]]} {m["start_time"]}-{m["end_time"]}' for m in assignment['meetings']
+                )
+                self.stdout.write(f'Section {assignment["section"]}: room {assignment["room"]}, {slots}')
+
+        for violation in report['violations']:
+            sections = ', '.join(str(pk) for pk in violation['sections'])
+            if violation['kind'] == 'student':
+                message = f'student clash: sections {sections} (~{violation["students"]} students)'
+            else:
+                message = f'{violation["kind"]} violation: sections {sections}'
+            self.stdout.write(self.style.WARNING(message))
+
+        style = self.style.SUCCESS if report['hard_violations'] == 0 else self.style.ERROR
+        verb = 'Applied' if report['applied'] else 'Found'
+        self.stdout.write(style(
+            f'{verb} a timetable for {report["sections"]} sections: {report["hard_violations"]} hard '
+            f'violation(s), {report["student_clashes"]} expected student clashes '
+            f'({report["iterations"]} moves in {report["elapsed_seconds"]}s)'
+        ))
@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from schedules.conflicts import RESOURCES, find_conflicts
+
+
+class Command(BaseCommand):
+    help = 'Report professor, room and student double bookings in a term'
+
+    def add_arguments(self, parser):
+        parser.add_argument('term', help='Term to check, e.g. 2025-FALL')
+        parser.add_argument(
+            '--resource',
+            choices=RESOURCES,
+            action='append',
+            help='Only check this resource (repeatable)'
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        conflicts = find_conflicts(options['term'], resources=tuple(options['resource'] or RESOURCES))
+        elapsed = time.perf_counter() - started
+
+        for conflict in conflicts:
+            self.stdout.write(
+                '{resource} {resource_id}: sections {sections} overlap on day {day} {start}-{end}'.format(
+                    resource=conflict['resource'],
+                    resource_id=conflict['resource_id'],
+                    sections=', '.join(str(pk) for pk in conflict['sections']),
+                    day=conflict['day'],
+                    start=conflict['start'],
+                    end=conflict['end'],
+                )
+            )
+        style = self.style.WARNING if conflicts else self.style.SUCCESS
+        self.stdout.write(style(f'{len(conflicts)} conflict(s) in {options["term"]} ({elapsed:.2f}s)'))
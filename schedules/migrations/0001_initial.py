@@ -0,0 +1,85 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('professors', '0002_professor_org_path'),
+        ('students', '0002_student_org_path'),
+        ('subjects', '0002_subject_org_path'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Room',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('building', models.CharField(blank=True, max_length=100)),
+                ('capacity', models.PositiveIntegerField(default=30)),
+            ],
+            options={
+                'verbose_name': 'Room',
+                'verbose_name_plural': 'Rooms',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Section',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(db_index=True, max_length=20)),
+                ('code', models.CharField(max_length=20)),
+                ('capacity', models.PositiveIntegerField(default=30)),
+                ('professor', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='sections', to='professors.professor')),
+                ('room', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='sections', to='schedules.room')),
+                ('subject', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sections', to='subjects.subject')),
+            ],
+            options={
+                'verbose_name': 'Section',
+                'verbose_name_plural': 'Sections',
+            },
+        ),
+        migrations.CreateModel(
+            name='MeetingTime',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.PositiveSmallIntegerField(choices=[(0, 'Monday'), (1, 'Tuesday'), (2, 'Wednesday'), (3, 'Thursday'), (4, 'Friday'), (5, 'Saturday'), (6, 'Sunday')])),
+                ('start_time', models.TimeField()),
+                ('end_time', models.TimeField()),
+                ('section', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='meetings', to='schedules.section')),
+            ],
+            options={
+                'verbose_name': 'Meeting time',
+                'verbose_name_plural': 'Meeting times',
+                'ordering': ['day', 'start_time'],
+            },
+        ),
+        migrations.CreateModel(
+            name='SectionEnrollment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('section', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='memberships', to='schedules.section')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='section_memberships', to='students.student')),
+            ],
+            options={
+                'verbose_name': 'Section enrollment',
+                'verbose_name_plural': 'Section enrollments',
+                'unique_together': {('section', 'student')},
+            },
+        ),
+        migrations.AddField(
+            model_name='section',
+            name='students',
+            field=models.ManyToManyField(blank=True, related_name='sections', through='schedules.SectionEnrollment', to='students.student'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='section',
+            unique_together={('subject', 'term', 'code')},
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:14
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('professors', '0002_professor_org_path'),
+        ('schedules', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProfessorAvailability',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.PositiveSmallIntegerField(choices=[(0, 'Monday'), (1, 'Tuesday'), (2, 'Wednesday'), (3, 'Thursday'), (4, 'Friday'), (5, 'Saturday'), (6, 'Sunday')])),
+                ('start_time', models.TimeField()),
+                ('end_time', models.TimeField()),
+                ('professor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='availability', to='professors.professor')),
+            ],
+            options={
+                'verbose_name': 'Professor availability',
+                'verbose_name_plural': 'Professor availability',
+                'ordering': ['professor', 'day', 'start_time'],
+            },
+        ),
+    ]
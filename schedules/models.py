@@ -0,0 +1,162 @@
+from django.core.exceptions import ValidationError
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class Room(models.Model):
+    name = models.CharField(max_length=100, unique=True)  # Example: "ENG-101"
+    building = models.CharField(max_length=100, blank=True)
+    capacity = models.PositiveIntegerField(default=30)
+
+    class Meta:
+        verbose_name = _("Room")
+        verbose_name_plural = _("Rooms")
+        ordering = ['name']
+
+    def __str__(self):
+        return self.name
+
+
+class Section(models.Model):
+    """
+    One teaching group of a subject in a term: who teaches it, where, and
+    (through its meeting times) when
+    """
+    subject = models.ForeignKey('subjects.Subject', on_delete=models.CASCADE, related_name='sections')
+    professor = models.ForeignKey(
+        'professors.Professor',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='sections'
+    )
+    room = models.ForeignKey(Room, on_delete=models.SET_NULL, null=True, blank=True, related_name='sections')
+    term = models.CharField(max_length=20, db_index=True)  # Example: "2025-FALL"
+    code = models.CharField(max_length=20)  # Example: "A", "LAB-1"
+    capacity = models.PositiveIntegerField(default=30)
+    students = models.ManyToManyField(
+        'students.Student',
+        through='SectionEnrollment',
+        related_name='sections',
+        blank=True
+    )
+
+    class Meta:
+        verbose_name = _("Section")
+        verbose_name_plural = _("Sections")
+        unique_together = ['subject', 'term', 'code']
+
+    def __str__(self):
+        return f"{self.subject} {self.code} ({self.term})"
+
+
+class MeetingTime(models.Model):
+    DAY_CHOICES = [
+        (0, 'Monday'),
+        (1, 'Tuesday'),
+        (2, 'Wednesday'),
+        (3, 'Thursday'),
+        (4, 'Friday'),
+        (5, 'Saturday'),
+        (6, 'Sunday'),
+    ]
+
+    section = models.ForeignKey(Section, on_delete=models.CASCADE, related_name='meetings')
+    day = models.PositiveSmallIntegerField(choices=DAY_CHOICES)
+    start_time = models.TimeField()
+    end_time = models.TimeField()
+
+    class Meta:
+        verbose_name = _("Meeting time")
+        verbose_name_plural = _("Meeting times")
+        ordering = ['day', 'start_time']
+
+    def clean(self):
+        if self.start_time and self.end_time and self.start_time >= self.end_time:
+            raise ValidationError({'end_time': 'End time must be after start time.'})
+
+    def __str__(self):
+        return f"{self.get_day_display()} {self.start_time:%H:%M}-{self.end_time:%H:%M}"
+
+
+class ProfessorAvailability(models.Model):
+    """
+    A weekly window in which a professor can teach; professors without any
+    are treated as always available
+    """
+    professor = models.ForeignKey('professors.Professor', on_delete=models.CASCADE, related_name='availability')
+    day = models.PositiveSmallIntegerField(choices=MeetingTime.DAY_CHOICES)
+    start_time = models.TimeField()
+    end_time = models.TimeField()
+
+    class Meta:
+        verbose_name = _("Professor availability")
+        verbose_name_plural = _("Professor availability")
+        ordering = ['professor', 'day', 'start_time']
+
+    def clean(self):
+        if self.start_time and self.end_time and self.start_time >= self.end_time:
+            raise ValidationError({'end_time': 'End time must be after start time.'})
+
+    def __str__(self):
+        return f"{self.professor} {self.get_day_display()} {self.start_time:%H:%M}-{self.end_time:%H:%M}"
+
+
+class SectionEnrollment(models.Model):
+    section = models.ForeignKey(Section, on_delete=models.CASCADE, related_name='memberships')
+    student = models.ForeignKey('students.Student', on_delete=models.CASCADE, related_name='section_memberships')
+
+    class Meta:
+        verbose_name = _("Section enrollment")
+        verbose_name_plural = _("Section enrollments")
+        unique_together = ['section', 'student']
+
+    def __str__(self):
+        return f"{self.student} in {self.section}"
+
+
+class TimetableJob(models.Model):
+    """
+    A timetable generation requested through the API, solved in the
+    background (see schedules.jobs); result holds the report
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ]
+
+    term = models.CharField(max_length=20)
+    department = models.ForeignKey(
+        'departments.Department',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='timetable_jobs'
+    )
+    time_limit = models.FloatField(null=True, blank=True)  # Seconds; None = TIMETABLE_TIME_LIMIT
+    seed = models.IntegerField(null=True, blank=True)
+    keep_rooms = models.BooleanField(default=False)
+    apply = models.BooleanField(default=False)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending', db_index=True)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    requested_by = models.ForeignKey(
+        'users.User',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='timetable_jobs'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = _("Timetable job")
+        verbose_name_plural = _("Timetable jobs")
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"Timetable {self.term} ({self.status})"
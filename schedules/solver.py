@@ -0,0 +1,364 @@
+"""
+Timetable search engine.
+
+Works on plain Python data only (no ORM), so problems can be shipped to
+worker processes; schedules.timetable builds them from the database and
+writes the solutions back.
+"""
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+# A hard constraint violation outweighs any number of student clashes
+HARD_WEIGHT = 1000
+
+# Candidate rooms tried per section: the smallest ones that fit
+ROOM_SHORTLIST = 10
+
+
+@dataclass
+class TimetableProblem:
+    """
+    Sections to place, each on one slot pattern and in one room.
+
+    patterns are lists of (day, start_minute, end_minute) meetings. Every
+    per-section list is indexed like section_ids; professors are IDs and
+    rooms are indexes into room_ids and room_capacity. Bookings outside the
+    problem (other departments' sections) are precomputed per pattern in
+    the fixed_* penalties, and professor availability in unavailable.
+    """
+    section_ids: list
+    patterns: list
+    professors: list                        # index or None per section
+    sizes: list                             # expected students per section
+    fixed_rooms: list                       # room index or None per section
+    room_ids: list
+    room_capacity: list
+    student_weights: list = field(default_factory=list)   # [{other section: weight}]
+    unavailable: dict = field(default_factory=dict)       # professor -> [meetings outside availability per pattern]
+    fixed_professor: dict = field(default_factory=dict)   # professor -> [clashes per pattern]
+    fixed_room: dict = field(default_factory=dict)        # room -> [clashes per pattern]
+
+    def __post_init__(self):
+        if not self.student_weights:
+            self.student_weights = [{} for _ in self.section_ids]
+
+
+def patterns_overlap(first, second):
+    """Check if two slot patterns share any time"""
+    return any(
+        day == other_day and start < other_end and other_start < end
+        for day, start, end in first
+        for other_day, other_start, other_end in second
+    )
+
+
+@dataclass
+class TimetableSolution:
+    patterns: list      # pattern index per section
+    rooms: list         # room index per section
+    cost: float
+    hard: int
+    soft: float
+    seed: int
+    iterations: int
+    elapsed: float
+
+
+class _Search:
+    def __init__(self, problem, seed):
+        self.problem = problem
+        self.rng = random.Random(seed)
+        count = len(problem.patterns)
+        self.overlaps = [
+            [q for q in range(count) if patterns_overlap(problem.patterns[p], problem.patterns[q])]
+            for p in range(count)
+        ]
+        self.overlap_sets = [set(overlapping) for overlapping in self.overlaps]
+        self.candidate_rooms = [self._shortlist(i) for i in range(len(problem.section_ids))]
+        self.professor_load = {}
+        self.room_load = {}
+        n = len(problem.section_ids)
+        self.pattern = [None] * n
+        self.room = [None] * n
+
+    def _shortlist(self, i):
+        problem = self.problem
+        if problem.fixed_rooms[i] is not None:
+            return [problem.fixed_rooms[i]]
+        by_size = sorted(range(len(problem.room_ids)), key=lambda r: problem.room_capacity[r])
+        fitting = [r for r in by_size if problem.room_capacity[r] >= problem.sizes[i]]
+        if not fitting:
+            # Nothing is big enough; the largest rooms violate least
+            return by_size[-ROOM_SHORTLIST:]
+        return fitting[:ROOM_SHORTLIST]
+
+    def _load(self, loads, key):
+        counts = loads.get(key)
+        if counts is None:
+            counts = loads[key] = [0] * len(self.problem.patterns)
+        return counts
+
+    def place(self, i, p, r):
+        self.pattern[i], self.room[i] = p, r
+        if self.problem.professors[i] is not None:
+            self._load(self.professor_load, self.problem.professors[i])[p] += 1
+        if r is not None:
+            self._load(self.room_load, r)[p] += 1
+
+    def unplace(self, i):
+        p, r = self.pattern[i], self.room[i]
+        if self.problem.professors[i] is not None:
+            self.professor_load[self.problem.professors[i]][p] -= 1
+        if r is not None:
+            self.room_load[r][p] -= 1
+        self.pattern[i] = self.room[i] = None
+
+    def hard_cost(self, i, p, r):
+        """Hard violations of putting (unplaced) section i at p in room r"""
+        problem = self.problem
+        cost = 0
+        professor = problem.professors[i]
+        if professor is not None:
+            load = self.professor_load.get(professor)
+            if load:
+                cost += sum(load[q] for q in self.overlaps[p])
+            if professor in problem.fixed_professor:
+                cost += problem.fixed_professor[professor][p]
+            if professor in problem.unavailable:
+                cost += problem.unavailable[professor][p]
+        if r is not None:
+            load = self.room_load.get(r)
+            if load:
+                cost += sum(load[q] for q in self.overlaps[p])
+            if r in problem.fixed_room:
+                cost += problem.fixed_room[r][p]
+            if problem.room_capacity[r] < problem.sizes[i]:
+                cost += 1
+        return cost
+
+    def soft_cost(self, i, p):
+        """Expected student clashes of putting section i at pattern p"""
+        overlapping = self.overlap_sets[p]
+        pattern = self.pattern
+        return sum(
+            weight for j, weight in self.problem.student_weights[i].items()
+            if pattern[j] is not None and pattern[j] in overlapping
+        )
+
+    def placement_cost(self, i, p, r):
+        return HARD_WEIGHT * self.hard_cost(i, p, r) + self.soft_cost(i, p)
+
+    def best_move(self, i, noise=0.0):
+        """
+        Cheapest (pattern, room) for unplaced section i, ties broken at
+        random; with probability noise a random one instead
+        """
+        if noise and self.rng.random() < noise:
+            p = self.rng.randrange(len(self.problem.patterns))
+            r = self.rng.choice(self.candidate_rooms[i] or [None])
+            return (p, r), self.placement_cost(i, p, r)
+        best, best_cost = [], None
+        for p in range(len(self.problem.patterns)):
+            soft = self.soft_cost(i, p)
+            if best_cost is not None and soft > best_cost:
+                continue
+            for r in self.candidate_rooms[i] or [None]:
+                cost = HARD_WEIGHT * self.hard_cost(i, p, r) + soft
+                if best_cost is None or cost < best_cost:
+                    best, best_cost = [(p, r)], cost
+                elif cost == best_cost:
+                    best.append((p, r))
+        return self.rng.choice(best), best_cost
+
+    def construct(self):
+        """Greedy start: most constrained sections first"""
+        problem = self.problem
+        teaching = {}
+        for professor in problem.professors:
+            teaching[professor] = teaching.get(professor, 0) + 1
+        order = list(range(len(problem.section_ids)))
+        self.rng.shuffle(order)
+        order.sort(key=lambda i: (
+            -(problem.fixed_rooms[i] is not None),
+            -teaching.get(problem.professors[i], 0) if problem.professors[i] is not None else 0,
+            -len(problem.student_weights[i]),
+            -problem.sizes[i],
+        ))
+        cost = 0
+        for i in order:
+            (p, r), placement = self.best_move(i)
+            self.place(i, p, r)
+            cost += placement
+        return cost
+
+    def current_cost(self, i):
+        p, r = self.pattern[i], self.room[i]
+        self.unplace(i)
+        cost = self.placement_cost(i, p, r)
+        self.place(i, p, r)
+        return cost
+
+    def restore(self, patterns, rooms):
+        """Reset the search to a saved assignment"""
+        self.professor_load = {}
+        self.room_load = {}
+        for i, (p, r) in enumerate(zip(patterns, rooms)):
+            self.place(i, p, r)
+
+    def descend(self, cost, deadline, max_stall, noise, tournament):
+        """
+        Min-conflicts local search: repeatedly move the worst of a few
+        sampled sections to its cheapest slot, occasionally at random.
+        Returns the best (cost, patterns, rooms) seen and the move count.
+        """
+        n = len(self.problem.section_ids)
+        best = (cost, list(self.pattern), list(self.room))
+        iterations = stall = 0
+        while best[0] > 0 and stall < max_stall and time.monotonic() < deadline:
+            iterations += 1
+            sample = [self.rng.randrange(n) for _ in range(min(tournament, n))]
+            worst_cost, i = max((self.current_cost(i), i) for i in sample)
+            if worst_cost == 0:
+                stall += 1
+                continue
+            self.unplace(i)
+            (p, r), placement = self.best_move(i, noise=noise)
+            self.place(i, p, r)
+            cost += placement - worst_cost
+            if cost < best[0] - 1e-9:
+                best = (cost, list(self.pattern), list(self.room))
+                stall = 0
+            else:
+                stall += 1
+        return best, iterations
+
+    def run(self, deadline, max_rounds=20, noise=0.05, tournament=8):
+        """
+        Iterated local search: descend, then kick a few sections of the best
+        timetable to random slots and descend again, until the deadline, a
+        perfect timetable or max_rounds kicks without improvement
+        """
+        n = len(self.problem.section_ids)
+        if not n:
+            return (0, [], []), 0
+        max_stall = max(500, 10 * n)
+        best, iterations = self.descend(self.construct(), deadline, max_stall, noise, tournament)
+        rounds = 0
+        while best[0] > 0 and rounds < max_rounds and time.monotonic() < deadline:
+            rounds += 1
+            self.restore(best[1], best[2])
+            cost = best[0]
+            for i in self.rng.sample(range(n), max(1, n // 20)):
+                old = self.current_cost(i)
+                self.unplace(i)
+                (p, r), placement = self.best_move(i, noise=1.0)
+                self.place(i, p, r)
+                cost += placement - old
+            result, moves = self.descend(cost, deadline, max_stall, noise, tournament)
+            iterations += moves
+            if result[0] < best[0] - 1e-9:
+                best, rounds = result, 0
+        return best, iterations
+
+
+def evaluate(problem, patterns, rooms):
+    """
+    Return (hard, soft, violations) for a complete assignment.
+
+    violations lists each broken hard constraint once, plus student
+    clashes as the expected number of students affected.
+    """
+    overlap_cache = {}
+
+    def overlap(p, q):
+        key = (p, q) if p <= q else (q, p)
+        if key not in overlap_cache:
+            overlap_cache[key] = patterns_overlap(problem.patterns[p], problem.patterns[q])
+        return overlap_cache[key]
+
+    def penalty(penalties, key, p):
+        return key in penalties and penalties[key][p]
+
+    violations = []
+    by_resource = {}
+    for i, section_id in enumerate(problem.section_ids):
+        p, r = patterns[i], rooms[i]
+        professor = problem.professors[i]
+        if professor is not None:
+            by_resource.setdefault(('professor', professor), []).append(i)
+            if penalty(problem.unavailable, professor, p):
+                violations.append({'kind': 'availability', 'sections': [section_id]})
+            if penalty(problem.fixed_professor, professor, p):
+                violations.append({'kind': 'professor', 'sections': [section_id], 'external': True})
+        if r is not None:
+            by_resource.setdefault(('room', r), []).append(i)
+            if problem.room_capacity[r] < problem.sizes[i]:
+                violations.append({
+                    'kind': 'capacity',
+                    'sections': [section_id],
+                    'room': problem.room_ids[r],
+                    'students': problem.sizes[i],
+                    'capacity': problem.room_capacity[r],
+                })
+            if penalty(problem.fixed_room, r, p):
+                violations.append({'kind': 'room', 'sections': [section_id], 'external': True})
+
+    for (kind, _), members in by_resource.items():
+        for a, i in enumerate(members):
+            for j in members[a + 1:]:
+                if overlap(patterns[i], patterns[j]):
+                    violations.append({'kind': kind, 'sections': sorted([problem.section_ids[i], problem.section_ids[j]])})
+
+    soft = 0.0
+    for i, weights in enumerate(problem.student_weights):
+        for j, weight in weights.items():
+            if i < j and overlap(patterns[i], patterns[j]):
+                soft += weight
+                violations.append({
+                    'kind': 'student',
+                    'sections': sorted([problem.section_ids[i], problem.section_ids[j]]),
+                    'students': round(weight, 2),
+                })
+    hard = sum(1 for violation in violations if violation['kind'] != 'student')
+    return hard, soft, violations
+
+
+def _solve_once(args):
+    problem, seed, time_limit = args
+    started = time.monotonic()
+    search = _Search(problem, seed)
+    (cost, patterns, rooms), iterations = search.run(started + time_limit)
+    hard, soft, _ = evaluate(problem, patterns, rooms)
+    return TimetableSolution(
+        patterns=patterns,
+        rooms=rooms,
+        cost=HARD_WEIGHT * hard + soft,
+        hard=hard,
+        soft=soft,
+        seed=seed,
+        iterations=iterations,
+        elapsed=time.monotonic() - started,
+    )
+
+
+def solve(problem, workers=None, time_limit=30, seed=None, restarts=None):
+    """
+    Search for a timetable, running independent restarts in parallel.
+
+    Each restart uses its own random seed and stops at time_limit seconds,
+    when it finds a perfect timetable or when it stops improving. The best
+    solution (fewest hard violations, then fewest student clashes) wins.
+    """
+    workers = workers or os.cpu_count() or 1
+    restarts = restarts or workers
+    base = random.Random(seed).randrange(2 ** 31)
+    jobs = [(problem, base + number, time_limit) for number in range(restarts)]
+    if workers <= 1 or restarts <= 1:
+        results = [_solve_once(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, restarts)) as pool:
+            results = list(pool.map(_solve_once, jobs))
+    return min(results, key=lambda solution: (solution.hard, solution.soft, solution.seed))
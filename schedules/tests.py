@@ -0,0 +1,376 @@
+import random
+from datetime import time
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from colleges.models import College
+from courses.models import Course
+from departments.models import Department
+from professors.models import Professor
+from schedules.conflicts import IntervalIndex, check_section, find_conflicts
+from schedules.models import MeetingTime, Room, Section, SectionEnrollment
+from schedules.solver import TimetableProblem, evaluate, solve
+from schedules.timetable import build_problem, generate_timetable
+from students.models import Student
+from subjects.models import Subject
+
+
+class ScheduleFixtureMixin:
+    def create_fixtures(self):
+        cache.clear()
+        self.college = College.objects.create(name="Schedule College")
+        self.department = Department.objects.create(college=self.college, name="Schedule Dept")
+        self.course = Course.objects.create(department=self.department, name="Schedule Course", code="SC1")
+        self.subjects = [
+            Subject.objects.create(course=self.course, name=f"Subject {index}", code=f"SS{index}", description="")
+            for index in range(3)
+        ]
+        self.professor = Professor.objects.create(
+            department=self.department,
+            first_name="Prof",
+            last_name="One",
+            specialization="Any",
+            contact_number="123"
+        )
+        self.room = Room.objects.create(name="R-101")
+        self.student = Student.objects.create(
+            department=self.department,
+            first_name="Student",
+            last_name="One",
+            student_id="SCH-1",
+            email="student@example.com",
+            contact_number="123"
+        )
+
+    def add_section(self, subject, code, meetings, professor=None, room=None, term='2025-FALL'):
+        section = Section.objects.create(subject=subject, code=code, term=term, professor=professor, room=room)
+        for day, start, end in meetings:
+            MeetingTime.objects.create(section=section, day=day, start_time=time(*start), end_time=time(*end))
+        return section
+
+
+class IntervalIndexTest(TestCase):
+    """Test cases for the interval index"""
+
+    def test_matches_pairwise_comparison(self):
+        """Test queries and pair enumeration agree with brute force"""
+        rng = random.Random(7)
+        intervals = []
+        for number in range(300):
+            start = rng.randrange(0, 5000)
+            intervals.append((start, start + rng.randrange(1, 120), number))
+        index = IntervalIndex(intervals)
+
+        for start, end in [(0, 10), (100, 400), (2500, 2501), (4990, 6000)]:
+            expected = {i[2] for i in intervals if i[0] < end and i[1] > start}
+            self.assertEqual({i[2] for i in index.overlapping(start, end)}, expected)
+
+        expected_pairs = {
+            frozenset((a[2], b[2]))
+            for a in intervals for b in intervals
+            if a[2] < b[2] and a[0] < b[1] and b[0] < a[1]
+        }
+        found = [frozenset((a[2], b[2])) for a, b in index.overlapping_pairs()]
+        self.assertEqual(len(found), len(set(found)))
+        self.assertEqual(set(found), expected_pairs)
+
+    def test_touching_intervals_do_not_overlap(self):
+        """Test back-to-back meetings are not a conflict"""
+        index = IntervalIndex([(0, 60, 'a'), (60, 120, 'b')])
+        self.assertEqual(list(index.overlapping_pairs()), [])
+        self.assertEqual(index.overlapping(60, 61), [(60, 120, 'b')])
+
+
+class ConflictDetectionTest(ScheduleFixtureMixin, TestCase):
+    """Test cases for term conflict reports and section checks"""
+
+    def setUp(self):
+        self.create_fixtures()
+
+    def test_professor_room_and_student_conflicts(self):
+        """Test each resource's double booking is reported once"""
+        first = self.add_section(self.subjects[0], 'A', [(0, (9, 0), (10, 30))], professor=self.professor, room=self.room)
+        second = self.add_section(self.subjects[1], 'A', [(0, (10, 0), (11, 0))], professor=self.professor)
+        third = self.add_section(self.subjects[2], 'A', [(0, (10, 15), (11, 0))], room=self.room)
+        SectionEnrollment.objects.create(section=second, student=self.student)
+        SectionEnrollment.objects.create(section=third, student=self.student)
+        # Same slot in another term is not a conflict
+        self.add_section(self.subjects[1], 'B', [(0, (9, 0), (10, 30))], professor=self.professor, term='2026-SPRING')
+
+        conflicts = find_conflicts('2025-FALL')
+        summary = [(c['resource'], c['sections'], c['start'], c['end']) for c in conflicts]
+        self.assertEqual(summary, [
+            ('professor', [first.pk, second.pk], '10:00', '10:30'),
+            ('room', [first.pk, third.pk], '10:15', '10:30'),
+            ('student', [second.pk, third.pk], '10:15', '11:00'),
+        ])
+        self.assertEqual(find_conflicts('2025-FALL', resources=('room',))[0]['resource'], 'room')
+
+    def test_check_section_ignores_its_old_self(self):
+        """Test editing a section does not clash with its stored meetings"""
+        section = self.add_section(self.subjects[0], 'A', [(2, (14, 0), (15, 0))], professor=self.professor)
+        meetings = [(2, time(14, 30), time(15, 30))]
+        self.assertEqual(len(check_section('2025-FALL', meetings, professor_id=self.professor.pk)), 1)
+        self.assertEqual(
+            check_section('2025-FALL', meetings, professor_id=self.professor.pk, exclude_section=section.pk),
+            []
+        )
+
+    def test_report_query_count_is_constant(self):
+        """Test the batch report loads a term in a fixed number of queries"""
+        for index in range(30):
+            self.add_section(
+                self.subjects[index % 3], f'S{index}', [(index % 5, (8 + index % 6, 0), (9 + index % 6, 0))],
+                professor=self.professor, room=self.room
+            )
+        with self.assertNumQueries(3):
+            find_conflicts('2025-FALL')
+
+
+class SectionAPITest(ScheduleFixtureMixin, APITestCase):
+    """Test cases for section endpoints and conflict validation"""
+
+    def setUp(self):
+        self.create_fixtures()
+        admin = get_user_model().objects.create_user(username='admin', role='admin')
+        self.client.force_authenticate(user=admin)
+
+    def section_payload(self, subject, code, start, end):
+        return {
+            'subject': subject.pk,
+            'professor': self.professor.pk,
+            'room': self.room.pk,
+            'term': '2025-FALL',
+            'code': code,
+            'meetings': [{'day': 1, 'start_time': start, 'end_time': end}],
+        }
+
+    def test_create_with_meetings_and_reject_clash(self):
+        """Test sections are created with meetings and clashes are refused"""
+        url = reverse('section-list-create')
+        response = self.client.post(url, self.section_payload(self.subjects[0], 'A', '09:00', '10:00'), format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data['meetings']), 1)
+
+        response = self.client.post(url, self.section_payload(self.subjects[1], 'A', '09:30', '10:30'), format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual({c['resource'] for c in response.data['conflicts']}, {'professor', 'room'})
+
+        response = self.client.post(url, self.section_payload(self.subjects[1], 'A', '10:00', '11:00'), format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_validate_endpoint(self):
+        """Test proposed sections are checked, including enrolled students"""
+        other = self.add_section(self.subjects[0], 'A', [(3, (13, 0), (14, 0))])
+        SectionEnrollment.objects.create(section=other, student=self.student)
+        payload = {
+            'term': '2025-FALL',
+            'students': [self.student.pk],
+            'meetings': [{'day': 3, 'start_time': '13:30', 'end_time': '14:30'}],
+        }
+        response = self.client.post(reverse('section-validate'), payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.data['valid'])
+        self.assertEqual(response.data['conflicts'][0]['resource'], 'student')
+
+        payload['meetings'][0]['start_time'] = '14:00'
+        response = self.client.post(reverse('section-validate'), payload, format='json')
+        self.assertTrue(response.data['valid'])
+
+    def test_update_checks_enrolled_students_and_own_meetings(self):
+        """Test section writes catch student double bookings and overlapping meetings"""
+        other = self.add_section(self.subjects[0], 'A', [(3, (13, 0), (14, 0))])
+        SectionEnrollment.objects.create(section=other, student=self.student)
+        section = self.add_section(self.subjects[1], 'A', [(2, (9, 0), (10, 0))])
+        SectionEnrollment.objects.create(section=section, student=self.student)
+        url = reverse('section-detail', args=[section.pk])
+
+        response = self.client.patch(
+            url, {'meetings': [{'day': 3, 'start_time': '13:30', 'end_time': '14:30'}]}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['conflicts'][0]['resource'], 'student')
+
+        response = self.client.patch(url, {'meetings': [
+            {'day': 4, 'start_time': '09:00', 'end_time': '10:00'},
+            {'day': 4, 'start_time': '09:30', 'end_time': '10:30'},
+        ]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['conflicts'][0]['resource'], 'section')
+
+        response = self.client.post(reverse('section-list-create'), dict(
+            self.section_payload(self.subjects[2], 'B', '09:00', '10:00'),
+            meetings=[
+                {'day': 1, 'start_time': '09:00', 'end_time': '10:00'},
+                {'day': 1, 'start_time': '09:59', 'end_time': '11:00'},
+            ],
+        ), format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_conflict_report_requires_term(self):
+        """Test the batch report endpoint"""
+        self.add_section(self.subjects[0], 'A', [(0, (9, 0), (10, 0))], room=self.room)
+        self.add_section(self.subjects[1], 'A', [(0, (9, 0), (10, 0))], room=self.room)
+        url = reverse('section-conflicts')
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(url, {'term': '2025-FALL'})
+        self.assertEqual(response.data['count'], 1)
+
+
+class TimetableSolverTest(TestCase):
+    """Test cases for the timetable search engine"""
+
+    def test_respects_hard_constraints_when_feasible(self):
+        """Test professor, room, availability and capacity constraints"""
+        patterns = [[(0, 480, 540)], [(0, 540, 600)], [(1, 480, 540)], [(1, 540, 600)]]
+        problem = TimetableProblem(
+            section_ids=[10, 11, 12, 13],
+            patterns=patterns,
+            professors=[1, 1, 1, 2],
+            sizes=[20, 20, 20, 90],
+            fixed_rooms=[None] * 4,
+            room_ids=[100, 101],
+            room_capacity=[30, 100],
+            # Professor 1 cannot teach the first pattern
+            unavailable={1: [1, 0, 0, 0]},
+        )
+        solution = solve(problem, workers=1, time_limit=5, seed=1)
+        self.assertEqual(solution.hard, 0)
+        hard, soft, violations = evaluate(problem, solution.patterns, solution.rooms)
+        self.assertEqual((hard, violations), (0, []))
+        self.assertNotIn(0, solution.patterns[:3])
+        self.assertEqual(problem.room_ids[solution.rooms[3]], 101)
+
+    def test_reports_unavoidable_violations(self):
+        """Test more sections than slots leaves a professor clash"""
+        problem = TimetableProblem(
+            section_ids=[1, 2, 3],
+            patterns=[[(0, 480, 540)], [(0, 600, 660)]],
+            professors=[7, 7, 7],
+            sizes=[10, 10, 10],
+            fixed_rooms=[None] * 3,
+            room_ids=[1, 2, 3],
+            room_capacity=[30, 30, 30],
+        )
+        solution = solve(problem, workers=1, time_limit=2, seed=1)
+        hard, _, violations = evaluate(problem, solution.patterns, solution.rooms)
+        self.assertEqual(hard, 1)
+        self.assertEqual(violations[0]['kind'], 'professor')
+
+    def test_student_clashes_are_avoided(self):
+        """Test sections sharing students are kept apart when possible"""
+        problem = TimetableProblem(
+            section_ids=[1, 2],
+            patterns=[[(0, 480, 540)], [(0, 600, 660)]],
+            professors=[None, None],
+            sizes=[10, 10],
+            fixed_rooms=[None, None],
+            room_ids=[1, 2],
+            room_capacity=[30, 30],
+            student_weights=[{1: 15}, {0: 15}],
+        )
+        solution = solve(problem, workers=1, time_limit=2, seed=3)
+        self.assertNotEqual(solution.patterns[0], solution.patterns[1])
+        self.assertEqual(solution.soft, 0)
+
+
+class TimetableGenerationTest(ScheduleFixtureMixin, APITestCase):
+    """Test cases for building, applying and requesting timetables"""
+
+    def setUp(self):
+        from enrollments.models import Enrollment
+        self.create_fixtures()
+        Room.objects.create(name="R-BIG", capacity=200)
+        self.sections = [
+            Section.objects.create(subject=subject, code='A', term='2025-FALL', professor=self.professor)
+            for subject in self.subjects
+        ]
+        for number in range(40):
+            student = Student.objects.create(
+                department=self.department,
+                first_name="Student",
+                last_name=str(number),
+                student_id=f"TT-{number}",
+                email="student@example.com",
+                contact_number="123"
+            )
+            Enrollment.objects.create(student=student, course=self.course, status='enrolled')
+
+    def test_problem_from_database(self):
+        """Test demand comes from enrollments and other departments are fixed"""
+        other_department = Department.objects.create(college=self.college, name="Other Dept")
+        other_course = Course.objects.create(department=other_department, name="Other", code="OC1")
+        other_subject = Subject.objects.create(course=other_course, name="Other", code="OS1", description="")
+        self.add_section(other_subject, 'A', [(0, (8, 0), (8, 50))], professor=self.professor, room=self.room)
+
+        problem = build_problem('2025-FALL', department_id=self.department.pk)
+        self.assertEqual(problem.section_ids, [section.pk for section in self.sections])
+        self.assertEqual(problem.sizes, [30, 30, 30])  # 40 students, capped at capacity
+        self.assertEqual(problem.student_weights[0], {1: 40, 2: 40})
+        # The Monday 08:00 slot is taken by the other department's section
+        self.assertEqual(problem.fixed_professor[self.professor.pk][0], 1)
+
+    def test_generate_and_apply(self):
+        """Test an applied timetable is free of professor and room conflicts"""
+        Room.objects.filter(pk=self.room.pk).update(capacity=20)
+        report = generate_timetable('2025-FALL', workers=1, time_limit=5, seed=1, apply=True)
+        self.assertEqual(report['hard_violations'], 0)
+        self.assertEqual(report['student_clashes'], 0)
+        self.assertEqual(MeetingTime.objects.filter(section__in=self.sections).count(),
+                         sum(len(a['meetings']) for a in report['assignments']))
+        self.assertEqual(find_conflicts('2025-FALL'), [])
+        # The small room cannot hold 30 students
+        self.assertFalse(Section.objects.filter(room=self.room).exists())
+
+    def test_endpoint_is_limited_to_own_departments(self):
+        """Test deans can only schedule their own department"""
+        dean = get_user_model().objects.create_user(
+            username='dean', role='dean', college=self.college, department=self.department
+        )
+        self.client.force_authenticate(user=dean)
+        url = reverse('timetable-generate')
+        response = self.client.post(url, {'term': '2025-FALL'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        payload = {'term': '2025-FALL', 'department': self.department.pk, 'time_limit': 2, 'seed': 1}
+        with self.settings(TIMETABLE_JOBS_IN_THREAD=False):
+            response = self.client.post(url, payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['status'], 'completed')
+        self.assertEqual(response.data['result']['sections'], 3)
+        self.assertFalse(response.data['result']['applied'])
+        self.assertFalse(MeetingTime.objects.exists())
+
+        response = self.client.get(reverse('timetable-job-detail', args=[response.data['id']]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['result']['sections'], 3)
+
+    def test_endpoint_runs_a_background_job(self):
+        """Test generation is a job the endpoint hands off, not part of the request"""
+        from schedules.jobs import fail_abandoned_jobs
+        from schedules.models import TimetableJob
+
+        admin = get_user_model().objects.create_user(username='admin', role='admin')
+        self.client.force_authenticate(user=admin)
+        url = reverse('timetable-generate')
+        response = self.client.post(url, {'term': '2025-FALL', 'time_limit': 60}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        with mock.patch('schedules.jobs.threading.Thread') as thread:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(url, {'term': '2025-FALL', 'time_limit': 1}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['status'], 'running')
+        thread.return_value.start.assert_called_once()
+
+        # A job whose worker exited is reported as failed
+        job = TimetableJob.objects.get(pk=response.data['id'])
+        self.assertEqual(fail_abandoned_jobs(after=0), 1)
+        response = self.client.get(reverse('timetable-job-detail', args=[job.pk]))
+        self.assertEqual(response.data['status'], 'failed')
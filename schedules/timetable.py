@@ -0,0 +1,245 @@
+import math
+from collections import Counter, defaultdict
+from datetime import time
+from itertools import combinations
+
+from django.conf import settings
+from django.db import transaction
+
+from enrollments.models import Enrollment
+from schedules.models import MeetingTime, ProfessorAvailability, Room, Section
+from schedules.solver import TimetableProblem, evaluate, solve
+
+
+def _pattern(days, start, minutes):
+    hour, minute = map(int, start.split(':'))
+    begin = hour * 60 + minute
+    return [(day, begin, begin + minutes) for day in days]
+
+
+# Monday/Wednesday/Friday 50 minute slots on the hour and
+# Tuesday/Thursday 75 minute slots, 08:00 to 17:00
+DEFAULT_SLOT_PATTERNS = (
+    [_pattern((0, 2, 4), f'{hour:02d}:00', 50) for hour in range(8, 17)] +
+    [_pattern((1, 3), start, 75) for start in ('08:00', '09:30', '11:00', '12:30', '14:00', '15:30')]
+)
+
+
+def get_slot_patterns():
+    """
+    Return the candidate slot patterns as lists of (day, start, end) in
+    minutes; TIMETABLE_SLOT_PATTERNS may list [(day, 'HH:MM', 'HH:MM'), ...]
+    """
+    configured = getattr(settings, 'TIMETABLE_SLOT_PATTERNS', None)
+    if not configured:
+        return [list(pattern) for pattern in DEFAULT_SLOT_PATTERNS]
+
+    def minutes(text):
+        hour, minute = map(int, text.split(':'))
+        return hour * 60 + minute
+
+    return [[(day, minutes(start), minutes(end)) for day, start, end in pattern] for pattern in configured]
+
+
+def _minutes(value):
+    return value.hour * 60 + value.minute
+
+
+def _overlap_counts(patterns, day, start, end):
+    """Number of meetings of each pattern that overlap one booking"""
+    return [
+        sum(1 for d, s, e in pattern if d == day and s < end and start < e)
+        for pattern in patterns
+    ]
+
+
+def build_problem(term, department_id=None, keep_rooms=False, patterns=None):
+    """
+    Load a term (or one department's share of it) as a TimetableProblem.
+
+    Section sizes come from active enrollments in the subject's course,
+    split evenly over the subject's sections and capped at the section's
+    capacity. Two sections of different subjects clash for the students
+    enrolled in both their courses, spread over the sections they could
+    pick. Sections outside the problem keep their meetings, which are
+    charged as fixed bookings against shared professors and rooms.
+    """
+    patterns = patterns or get_slot_patterns()
+    sections = Section.objects.filter(term=term)
+    if department_id is not None:
+        sections = sections.filter(subject__course__department_id=department_id)
+    rows = list(sections.order_by('pk').values_list(
+        'id', 'subject_id', 'subject__course_id', 'professor_id', 'room_id', 'capacity'
+    ))
+    section_ids = [row[0] for row in rows]
+    course_ids = {row[2] for row in rows}
+    professor_ids = {row[3] for row in rows if row[3] is not None}
+
+    # Student demand
+    courses_by_student = defaultdict(set)
+    for student_id, course_id in (
+        Enrollment.objects.filter(status='enrolled', course_id__in=course_ids)
+        .values_list('student_id', 'course_id')
+        .iterator(chunk_size=5000)
+    ):
+        courses_by_student[student_id].add(course_id)
+    shared = Counter()
+    for courses in courses_by_student.values():
+        courses = sorted(courses)
+        for course_id in courses:
+            shared[course_id, course_id] += 1
+        shared.update(combinations(courses, 2))
+
+    sections_per_subject = Counter(row[1] for row in rows)
+    sizes = [
+        min(capacity, math.ceil(shared[course_id, course_id] / sections_per_subject[subject_id]))
+        for _, subject_id, course_id, _, _, capacity in rows
+    ]
+
+    by_course = defaultdict(list)
+    for i, row in enumerate(rows):
+        by_course[row[2]].append(i)
+    student_weights = [{} for _ in rows]
+    for (first, second), students in shared.items():
+        pairs = combinations(by_course[first], 2) if first == second else (
+            (i, j) for i in by_course[first] for j in by_course[second]
+        )
+        for i, j in pairs:
+            if rows[i][1] == rows[j][1]:
+                continue  # Sections of one subject are alternatives
+            weight = students / (sections_per_subject[rows[i][1]] * sections_per_subject[rows[j][1]])
+            student_weights[i][j] = student_weights[j][i] = weight
+
+    # Rooms
+    rooms = list(Room.objects.order_by('pk').values_list('id', 'capacity'))
+    room_index = {room_id: index for index, (room_id, _) in enumerate(rooms)}
+    fixed_rooms = [room_index.get(row[4]) if keep_rooms else None for row in rows]
+
+    # Professor availability
+    windows = defaultdict(list)
+    for professor_id, day, start_time, end_time in ProfessorAvailability.objects.filter(
+        professor_id__in=professor_ids
+    ).values_list('professor_id', 'day', 'start_time', 'end_time'):
+        windows[professor_id].append((day, _minutes(start_time), _minutes(end_time)))
+    unavailable = {
+        professor_id: [
+            sum(
+                1 for day, start, end in pattern
+                if not any(d == day and s <= start and end <= e for d, s, e in professor_windows)
+            )
+            for pattern in patterns
+        ]
+        for professor_id, professor_windows in windows.items()
+    }
+
+    # Bookings of sections that are not being scheduled
+    fixed_professor = {}
+    fixed_room = {}
+    external = (
+        MeetingTime.objects.filter(section__term=term)
+        .exclude(section__in=sections)
+        .values_list('section__professor_id', 'section__room_id', 'day', 'start_time', 'end_time')
+    )
+    for professor_id, room_id, day, start_time, end_time in external.iterator(chunk_size=5000):
+        targets = []
+        if professor_id in professor_ids:
+            targets.append(fixed_professor.setdefault(professor_id, [0] * len(patterns)))
+        if room_id in room_index:
+            targets.append(fixed_room.setdefault(room_index[room_id], [0] * len(patterns)))
+        if not targets:
+            continue
+        counts = _overlap_counts(patterns, day, _minutes(start_time), _minutes(end_time))
+        for current in targets:
+            for p, count in enumerate(counts):
+                current[p] += count
+
+    return TimetableProblem(
+        section_ids=section_ids,
+        patterns=patterns,
+        professors=[row[3] for row in rows],
+        sizes=sizes,
+        fixed_rooms=fixed_rooms,
+        room_ids=[room_id for room_id, _ in rooms],
+        room_capacity=[capacity for _, capacity in rooms],
+        student_weights=student_weights,
+        unavailable=unavailable,
+        fixed_professor=fixed_professor,
+        fixed_room=fixed_room,
+    )
+
+
+def _as_time(minutes):
+    return time(*divmod(minutes, 60))
+
+
+def apply_solution(problem, solution):
+    """
+    Replace the meetings and rooms of every section in the problem
+    """
+    meetings = []
+    sections = []
+    for i, section_id in enumerate(problem.section_ids):
+        room = solution.rooms[i]
+        sections.append(Section(pk=section_id, room_id=problem.room_ids[room] if room is not None else None))
+        for day, start, end in problem.patterns[solution.patterns[i]]:
+            meetings.append(MeetingTime(
+                section_id=section_id, day=day, start_time=_as_time(start), end_time=_as_time(end)
+            ))
+    with transaction.atomic():
+        MeetingTime.objects.filter(section_id__in=problem.section_ids).delete()
+        MeetingTime.objects.bulk_create(meetings, batch_size=500)
+        Section.objects.bulk_update(sections, ['room'], batch_size=500)
+
+
+def generate_timetable(term, department_id=None, workers=None, time_limit=None, seed=None,
+                       apply=False, keep_rooms=False):
+    """
+    Build, solve and optionally apply a timetable; returns a report of the
+    assignments and every remaining constraint violation
+    """
+    if workers is None:
+        workers = getattr(settings, 'TIMETABLE_WORKERS', None)
+    if time_limit is None:
+        time_limit = getattr(settings, 'TIMETABLE_TIME_LIMIT', 30)
+
+    problem = build_problem(term, department_id=department_id, keep_rooms=keep_rooms)
+    if not problem.section_ids:
+        return {
+            'term': term,
+            'department': department_id,
+            'sections': 0,
+            'hard_violations': 0,
+            'student_clashes': 0.0,
+            'applied': False,
+            'assignments': [],
+            'violations': [],
+        }
+    solution = solve(problem, workers=workers, time_limit=time_limit, seed=seed)
+    hard, soft, violations = evaluate(problem, solution.patterns, solution.rooms)
+    if apply:
+        apply_solution(problem, solution)
+
+    assignments = []
+    for i, section_id in enumerate(problem.section_ids):
+        room = solution.rooms[i]
+        assignments.append({
+            'section': section_id,
+            'room': problem.room_ids[room] if room is not None else None,
+            'meetings': [
+                {'day': day, 'start_time': _as_time(start).strftime('%H:%M'), 'end_time': _as_time(end).strftime('%H:%M')}
+                for day, start, end in problem.patterns[solution.patterns[i]]
+            ],
+        })
+    return {
+        'term': term,
+        'department': department_id,
+        'sections': len(problem.section_ids),
+        'hard_violations': hard,
+        'student_clashes': round(soft, 2),
+        'seed': solution.seed,
+        'iterations': solution.iterations,
+        'elapsed_seconds': round(solution.elapsed, 3),
+        'applied': apply,
+        'assignments': assignments,
+        'violations': violations,
+    }
@@ -2,13 +2,17 @@ from rest_framework import generics
 from rest_framework.response import Response
 from rest_framework import status
 from drf_yasg.utils import swagger_auto_schema
+from core.caching import CachedReadMixin, ObjectCacheMixin
+from core.prefetch import AutoPrefetchMixin
+from users.scoping import ScopedQuerysetMixin
 from students.models import Student
 from .serializers import StudentsSerializer
 
 # get all students and create a new student
-class StudentListCreate(generics.ListCreateAPIView):
+class StudentListCreate(CachedReadMixin, ScopedQuerysetMixin, AutoPrefetchMixin, generics.ListCreateAPIView):
     queryset = Student.objects.all()
     serializer_class = StudentsSerializer
+    scope_student_field = 'student_id'
 
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -18,20 +22,19 @@ class StudentListCreate(generics.ListCreateAPIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
 # get, update, delete student by ID
-class StudentRetrieveUpdateDestroy(generics.RetrieveUpdateDestroyAPIView):
+class StudentRetrieveUpdateDestroy(ObjectCacheMixin, ScopedQuerysetMixin, AutoPrefetchMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Student.objects.all()
     serializer_class = StudentsSerializer
+    scope_student_field = 'student_id'
 
     def get(self, request, *args, **kwargs):
-        student = self.get_object()
-        serializer = self.get_serializer(student)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return self.retrieve(request, *args, **kwargs)
 
     def put(self, request, *args, **kwargs):
         student = self.get_object()
         serializer = self.get_serializer(student, data=request.data)
         if serializer.is_valid():
-            serializer.save()
+            self.perform_update(serializer)
             return Response(serializer.data, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -39,7 +42,7 @@ class StudentRetrieveUpdateDestroy(generics.RetrieveUpdateDestroyAPIView):
         student = self.get_object()
         serializer = self.get_serializer(student, data=request.data, partial=True)
         if serializer.is_valid():
-            serializer.save()
+            self.perform_update(serializer)
             return Response(serializer.data, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -2,10 +2,12 @@ from django.db import models
 from django.utils.translation import gettext_lazy as _
 from django.urls import reverse
 from departments.models import Department
+from colleges.models import OrgPathModel
 
 # Create your models here.
-class Student(models.Model):
+class Student(OrgPathModel):
     department = models.ForeignKey('departments.Department', on_delete=models.CASCADE, related_name='students')
+    org_path = models.CharField(max_length=64, default='', editable=False, db_index=True)  # Ancestor IDs, see colleges.hierarchy
     first_name = models.CharField(max_length=100)
     last_name = models.CharField(max_length=100)
     student_id = models.CharField(max_length=15, unique=True)  # Student ID Number
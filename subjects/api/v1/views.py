@@ -2,12 +2,16 @@ from rest_framework import generics
 from rest_framework.response import Response
 from rest_framework import status
 from drf_yasg.utils import swagger_auto_schema
+from core.caching import CachedReadMixin, ObjectCacheMixin
+from core.prefetch import AutoPrefetchMixin
+from users.scoping import ScopedQuerysetMixin
 from subjects.models import Subject
 from .serializers import SubjectSerializer
 
-class SubjectListCreate(generics.ListCreateAPIView):
+class SubjectListCreate(CachedReadMixin, ScopedQuerysetMixin, AutoPrefetchMixin, generics.ListCreateAPIView):
     queryset = Subject.objects.all()
     serializer_class = SubjectSerializer
+    scope_department_field = 'course__department_id'
 
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -16,20 +20,19 @@ class SubjectListCreate(generics.ListCreateAPIView):
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
-class SubjectRetrieveUpdateDestroy(generics.RetrieveUpdateDestroyAPIView):
+class SubjectRetrieveUpdateDestroy(ObjectCacheMixin, ScopedQuerysetMixin, AutoPrefetchMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Subject.objects.all()
     serializer_class = SubjectSerializer
+    scope_department_field = 'course__department_id'
 
     def get(self, request, *args, **kwargs):
-        subject = self.get_object()
-        serializer = self.get_serializer(subject)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return self.retrieve(request, *args, **kwargs)
 
     def put(self, request, *args, **kwargs):
         subject = self.get_object()
         serializer = self.get_serializer(subject, data=request.data)
         if serializer.is_valid():
-            serializer.save()
+            self.perform_update(serializer)
             return Response(serializer.data, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -37,7 +40,7 @@ class SubjectRetrieveUpdateDestroy(generics.RetrieveUpdateDestroyAPIView):
         subject = self.get_object()
         serializer = self.get_serializer(subject, data=request.data, partial=True)
         if serializer.is_valid():
-            serializer.save()
+            self.perform_update(serializer)
             return Response(serializer.data, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:55
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Cast, Concat
+
+
+def backfill_org_path(apps, schema_editor):
+    Subject = apps.get_model('subjects', 'Subject')
+    Course = apps.get_model('courses', 'Course')
+    parent_path = Subquery(Course.objects.filter(pk=OuterRef('course_id')).values('org_path')[:1])
+    Subject.objects.update(
+        org_path=Concat(parent_path, Cast('course_id', models.CharField()), Value('/'), output_field=models.CharField())
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0004_course_org_path'),
+        ('subjects', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='subject',
+            name='org_path',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=64),
+        ),
+        migrations.RunPython(backfill_org_path, migrations.RunPython.noop),
+    ]
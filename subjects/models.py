@@ -2,9 +2,11 @@ from django.db import models
 from django.utils.translation import gettext_lazy as _
 from django.urls import reverse
 from courses.models import Course
+from colleges.models import OrgPathModel
 # Create your models here.
-class Subject(models.Model):
+class Subject(OrgPathModel):
     course = models.ForeignKey('courses.Course', on_delete=models.CASCADE, related_name='subjects')
+    org_path = models.CharField(max_length=64, default='', editable=False, db_index=True)  # Ancestor IDs, see colleges.hierarchy
     name = models.CharField(max_length=255)
     code = models.CharField(max_length=20, unique=True)  # Example: "CS101"
     description = models.TextField()
@@ -1,8 +1,11 @@
-from rest_framework import serializers
-from django.contrib.auth import authenticate
+from rest_framework import serializers, exceptions
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
 from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ValidationError
 from users.models import User
+from users.login import authenticate_credentials
+from users.last_login import record_login
 
 class UserSerializer(serializers.ModelSerializer):
     """
@@ -35,10 +38,7 @@ class UserSerializer(serializers.ModelSerializer):
         Create a new user with encrypted password
         """
         password = validated_data.pop('password')
-        user = User.objects.create_user(**validated_data)
-        user.set_password(password)
-        user.save()
-        return user
+        return User.objects.create_user(password=password, **validated_data)
 
     def update(self, instance, validated_data):
         """
@@ -94,10 +94,7 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         """
         validated_data.pop('password_confirm')
         password = validated_data.pop('password')
-        user = User.objects.create_user(**validated_data)
-        user.set_password(password)
-        user.save()
-        return user
+        return User.objects.create_user(password=password, **validated_data)
 
 class LoginSerializer(serializers.Serializer):
     """
@@ -114,23 +111,52 @@ class LoginSerializer(serializers.Serializer):
         password = attrs.get('password')
 
         if username and password:
-            user = authenticate(
-                request=self.context.get('request'),
-                username=username, 
-                password=password
+            user = authenticate_credentials(
+                self.context.get('request'),
+                username,
+                password
             )
             
+            # None for inactive users too
             if not user:
                 raise serializers.ValidationError('Invalid login credentials')
             
-            if not user.is_active:
-                raise serializers.ValidationError('User account is disabled')
-            
             attrs['user'] = user
             return attrs
         else:
             raise serializers.ValidationError('Must include username and password')
 
+class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """
+    Token pair serializer backed by the shared login pipeline
+    """
+    def validate(self, attrs):
+        """
+        Authenticate with a single user fetch and off-thread hashing
+        """
+        self.user = authenticate_credentials(
+            self.context.get('request'),
+            attrs[self.username_field],
+            attrs['password']
+        )
+
+        if not jwt_settings.USER_AUTHENTICATION_RULE(self.user):
+            raise exceptions.AuthenticationFailed(
+                self.error_messages['no_active_account'],
+                'no_active_account',
+            )
+
+        refresh = self.get_token(self.user)
+        data = {
+            'refresh': str(refresh),
+            'access': str(refresh.access_token),
+        }
+
+        if jwt_settings.UPDATE_LAST_LOGIN:
+            record_login(self.user)
+
+        return data
+
 class UserProfileSerializer(serializers.ModelSerializer):
     """
     Serializer for user profile (read-only for sensitive fields)
@@ -14,13 +14,14 @@ urlpatterns = [
     path('auth/register/', views.register, name='register'),
     path('auth/login/', views.login, name='login'),
     path('auth/logout/', views.logout, name='logout'),
+    path('auth/login-stats/', views.login_stats, name='login_stats'),
     path('auth/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
     
     # JWT token endpoint (alternative login)
     path('auth/token/', views.CustomTokenObtainPairView.as_view(), name='token_obtain_pair'),
     
     # Profile management
-    path('auth/profile/', views.profile, name='profile'),
+    path('auth/profile/', views.Profile.as_view(), name='profile'),
     path('auth/profile/update/', views.update_profile, name='update_profile'),
     path('auth/change-password/', views.change_password, name='change_password'),
     
@@ -2,34 +2,41 @@ from rest_framework import status, viewsets, permissions
 from rest_framework.decorators import api_view, permission_classes, action
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenObtainPairView
-from django.contrib.auth import authenticate
 from django.contrib.auth.models import AnonymousUser
 
 from users.models import User
 from .serializers import (
     UserSerializer, UserRegistrationSerializer, LoginSerializer,
-    UserProfileSerializer, ChangePasswordSerializer
+    UserProfileSerializer, ChangePasswordSerializer,
+    CustomTokenObtainPairSerializer
 )
+from users.login import login_metrics
+from users.provisioning import parse_csv, provision_users
 from users.permissions import IsAdmin, IsPrincipal, IsOwnerOrAdmin
+from users.scope import get_request_scope
+from core.async_views import AsyncAPIView
+from core.prefetch import AutoPrefetchMixin, prefetch_for_serializer
 
 class CustomTokenObtainPairView(TokenObtainPairView):
     """
     Custom token obtain view that returns user data along with tokens
     """
+    serializer_class = CustomTokenObtainPairSerializer
+
     def post(self, request, *args, **kwargs):
-        response = super().post(request, *args, **kwargs)
-        if response.status_code == 200:
-            # Get user data
-            username = request.data.get('username')
-            user = User.objects.get(username=username)
-            user_data = UserProfileSerializer(user).data
-            
-            # Add user data to response
-            response.data['user'] = user_data
-        
-        return response
+        serializer = self.get_serializer(data=request.data)
+        try:
+            serializer.is_valid(raise_exception=True)
+        except TokenError as e:
+            raise InvalidToken(e.args[0]) from e
+
+        # The serializer already loaded the user with college/department
+        data = dict(serializer.validated_data)
+        data['user'] = UserProfileSerializer(serializer.user).data
+        return Response(data, status=status.HTTP_200_OK)
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
@@ -71,6 +78,14 @@ def login(request):
     
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, IsAdmin])
+def login_stats(request):
+    """
+    Login throughput and hashing metrics (admin only)
+    """
+    return Response(login_metrics.snapshot())
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def logout(request):
@@ -89,14 +104,16 @@ def logout(request):
             'error': 'Invalid token'
         }, status=status.HTTP_400_BAD_REQUEST)
 
-@api_view(['GET'])
-@permission_classes([IsAuthenticated])
-def profile(request):
+class Profile(AsyncAPIView):
     """
     Get current user profile
     """
-    serializer = UserProfileSerializer(request.user)
-    return Response(serializer.data)
+    permission_classes = [IsAuthenticated]
+
+    async def get(self, request):
+        # Reload with the college and department the serializer renders
+        user = await prefetch_for_serializer(User.objects.filter(pk=request.user.pk), UserProfileSerializer).aget()
+        return Response(UserProfileSerializer(user).data)
 
 @api_view(['PUT', 'PATCH'])
 @permission_classes([IsAuthenticated])
@@ -143,7 +160,7 @@ def change_password(request):
     
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(AutoPrefetchMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing users (admin only)
     """
@@ -173,14 +190,16 @@ class UserViewSet(viewsets.ModelViewSet):
         if isinstance(user, AnonymousUser):
             return User.objects.none()
         
-        if user.is_admin():
-            return User.objects.all()
+        queryset = super().get_queryset()
+        scope = get_request_scope(self.request)
+        if scope.is_admin:
+            return queryset
         elif user.is_principal():
-            return User.objects.filter(college=user.college)
+            return queryset.filter(college_id__in=scope.college_ids)
         elif user.is_dean():
-            return User.objects.filter(department=user.department)
+            return queryset.filter(department_id__in=scope.department_ids)
         else:
-            return User.objects.filter(id=user.id)
+            return queryset.filter(id=user.id)
     
     @action(detail=True, methods=['post'], permission_classes=[IsAdmin])
     def activate(self, request, pk=None):
@@ -202,7 +221,8 @@ class UserViewSet(viewsets.ModelViewSet):
         user.save()
         return Response({'message': 'User deactivated successfully'})
     
-    @action(detail=False, methods=['get'], permission_classes=[IsPrincipal])
+    @action(detail=False, methods=['get'], permission_classes=[IsPrincipal],
+            serializer_class=UserProfileSerializer)
     def by_role(self, request):
         """
         Get users filtered by role
@@ -215,8 +235,40 @@ class UserViewSet(viewsets.ModelViewSet):
         
         page = self.paginate_queryset(queryset)
         if page is not None:
-            serializer = UserProfileSerializer(page, many=True)
+            serializer = self.get_serializer(page, many=True)
             return self.get_paginated_response(serializer.data)
         
-        serializer = UserProfileSerializer(queryset, many=True)
+        serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
+    
+    @action(detail=False, methods=['post'], url_path='bulk-provision', permission_classes=[IsAdmin])
+    def bulk_provision(self, request):
+        """
+        Create many users at once from a JSON list or an uploaded CSV file
+        """
+        upload = request.FILES.get('file')
+        if upload is not None:
+            rows = parse_csv(upload.read())
+        elif isinstance(request.data, list):
+            rows = request.data
+        elif hasattr(request.data, 'get'):
+            rows = request.data.get('users', [])
+        else:
+            rows = None
+
+        if not rows or not isinstance(rows, list):
+            return Response(
+                {'error': 'Provide a list of users or a CSV file'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        dry_run = request.query_params.get('dry_run') in ('1', 'true')
+        # Never fork a process pool inside a web worker
+        report = provision_users(rows, dry_run=dry_run, hash_in_threads=True)
+        if report['valid'] == 0:
+            return Response(report, status=status.HTTP_400_BAD_REQUEST)
+        if not dry_run and report['created'] == 0:
+            # Valid rows that could not be inserted (a concurrent writer
+            # took one of their unique values)
+            return Response(report, status=status.HTTP_409_CONFLICT)
+        return Response(report, status=status.HTTP_200_OK if dry_run else status.HTTP_201_CREATED)
@@ -0,0 +1,135 @@
+import atexit
+import logging
+import threading
+
+from django.conf import settings
+from django.contrib.auth.models import update_last_login
+from django.db import connection
+from django.utils import timezone
+
+from users.models import User
+
+logger = logging.getLogger(__name__)
+
+
+class LastLoginBuffer:
+    """
+    Write-behind buffer for last_login timestamps.
+
+    Logins are collected in memory and written with one bulk UPDATE, either
+    when the buffer reaches max_size or flush_interval seconds after the
+    first unflushed login, whichever comes first. flush_interval is the
+    staleness bound; 0 disables the background timer.
+    """
+    def __init__(self, flush_interval=30, max_size=500):
+        self.flush_interval = flush_interval
+        self.max_size = max_size
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._timer = None
+        self._failing = False  # The last write failed; only the timer retries
+
+    def __len__(self):
+        return len(self._pending)
+
+    def _schedule(self):
+        # Called with the lock held
+        if self._timer is None and self.flush_interval:
+            self._timer = threading.Timer(self.flush_interval, self._timed_flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def record(self, user):
+        """
+        Buffer a login for user and stamp the instance in memory. Never
+        raises: a failed write is logged and left to the timer to retry.
+        """
+        now = timezone.now()
+        user.last_login = now
+        with self._lock:
+            self._pending[user.pk] = now
+            full = len(self._pending) >= self.max_size and not (self._failing and self.flush_interval)
+            if not full:
+                self._schedule()
+        if full:
+            try:
+                self.flush()
+            except Exception:
+                pass  # Logged by flush, which also scheduled the retry
+
+    def flush(self):
+        """Write all buffered timestamps; returns the number of users updated"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        if not pending:
+            return 0
+        try:
+            User.objects.bulk_update(
+                [User(pk=pk, last_login=ts) for pk, ts in pending.items()],
+                ['last_login'],
+                batch_size=self.max_size,
+            )
+        except Exception:
+            # Keep them for the timer to retry; logins recorded meanwhile are newer
+            with self._lock:
+                for pk, ts in pending.items():
+                    self._pending.setdefault(pk, ts)
+                self._failing = True
+                self._schedule()
+            logger.exception('Could not write %d buffered last_login timestamps', len(pending))
+            raise
+        self._failing = False
+        return len(pending)
+
+    def _timed_flush(self):
+        with self._lock:
+            self._timer = None
+        try:
+            self.flush()
+        except Exception:
+            pass  # Logged by flush, which also scheduled another try
+        finally:
+            # Timer threads get their own connection; don't leak it
+            connection.close()
+
+
+_buffer = None
+_buffer_lock = threading.Lock()
+
+
+def get_last_login_buffer():
+    """
+    Return the process-wide buffer, creating it on first use
+    """
+    global _buffer
+    if _buffer is None:
+        with _buffer_lock:
+            if _buffer is None:
+                _buffer = LastLoginBuffer(
+                    flush_interval=getattr(settings, 'LAST_LOGIN_FLUSH_INTERVAL', 30),
+                    max_size=getattr(settings, 'LAST_LOGIN_MAX_BUFFER', 500),
+                )
+                atexit.register(_buffer.flush)
+    return _buffer
+
+
+def record_login(user):
+    """
+    Update user's last_login, buffered when LAST_LOGIN_WRITE_BEHIND is on
+    """
+    if getattr(settings, 'LAST_LOGIN_WRITE_BEHIND', False):
+        get_last_login_buffer().record(user)
+    else:
+        update_last_login(None, user)
+
+
+def flush_last_logins():
+    """
+    Flush buffered last_login writes (call on worker shutdown)
+    """
+    if _buffer is None:
+        return 0
+    return _buffer.flush()
@@ -0,0 +1,172 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import user_login_failed
+from django.contrib.auth.hashers import check_password, make_password
+from rest_framework.exceptions import Throttled
+
+from users.models import User
+
+
+class LoginMetrics:
+    """
+    Thread-safe counters for the login pipeline
+    """
+    def __init__(self, window=60):
+        self.window = window
+        self._lock = threading.Lock()
+        self._recent = deque()
+        self.reset()
+
+    def reset(self):
+        """Clear all counters"""
+        with self._lock:
+            self.attempts = 0
+            self.succeeded = 0
+            self.failed = 0
+            self.rejected = 0
+            self.hash_seconds = 0.0
+            self.total_seconds = 0.0
+            self._recent.clear()
+
+    def record(self, success, hash_seconds, total_seconds):
+        """Record the outcome of one login attempt"""
+        now = time.monotonic()
+        with self._lock:
+            self.attempts += 1
+            self.hash_seconds += hash_seconds
+            self.total_seconds += total_seconds
+            if success:
+                self.succeeded += 1
+                self._recent.append(now)
+            else:
+                self.failed += 1
+            self._trim(now)
+
+    def record_rejected(self):
+        """Record a login turned away because the hash pool was saturated"""
+        with self._lock:
+            self.attempts += 1
+            self.rejected += 1
+
+    def _trim(self, now):
+        while self._recent and now - self._recent[0] > self.window:
+            self._recent.popleft()
+
+    def snapshot(self):
+        """Return the current counters as a dict"""
+        with self._lock:
+            self._trim(time.monotonic())
+            completed = self.succeeded + self.failed
+            return {
+                'attempts': self.attempts,
+                'succeeded': self.succeeded,
+                'failed': self.failed,
+                'rejected': self.rejected,
+                'logins_per_second': round(len(self._recent) / self.window, 3),
+                'avg_hash_ms': round(self.hash_seconds * 1000 / completed, 3) if completed else 0.0,
+                'avg_login_ms': round(self.total_seconds * 1000 / completed, 3) if completed else 0.0,
+                'window_seconds': self.window,
+            }
+
+
+login_metrics = LoginMetrics()
+
+_executor = None
+_pending = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    """
+    Lazily create the hash pool and the semaphore bounding its queue
+    """
+    global _executor, _pending
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                workers = getattr(settings, 'LOGIN_HASH_WORKERS', 4)
+                max_pending = getattr(settings, 'LOGIN_HASH_MAX_PENDING', 64)
+                _pending = threading.BoundedSemaphore(workers + max_pending)
+                _executor = ThreadPoolExecutor(
+                    max_workers=workers,
+                    thread_name_prefix='login-hash',
+                )
+    return _executor, _pending
+
+
+def _verify(password, encoded):
+    """
+    Check a password against its hash; returns (matches, needs_rehash)
+    """
+    needs_rehash = []
+    if encoded is None:
+        # Run the default hasher once so unknown usernames take as long as
+        # known ones (same mitigation as ModelBackend).
+        make_password(password)
+        return False, False
+    matches = check_password(password, encoded, setter=lambda raw: needs_rehash.append(True))
+    return matches, bool(needs_rehash)
+
+
+def verify_password_limited(password, encoded):
+    """
+    Verify a password with at most LOGIN_HASH_WORKERS checks running at once.
+
+    A concurrency limiter, not an offload: the calling request thread still
+    waits, first for a slot (up to LOGIN_HASH_QUEUE_TIMEOUT seconds, with
+    at most LOGIN_HASH_MAX_PENDING logins queued) and then for the result.
+    Running the checks on a fixed pool caps how many cores logins occupy
+    (PBKDF2 releases the GIL) so a login burst can't starve other requests.
+    Raises Throttled when the pool and its queue are full.
+    """
+    executor, pending = _get_executor()
+    timeout = getattr(settings, 'LOGIN_HASH_QUEUE_TIMEOUT', 5)
+    if not pending.acquire(timeout=timeout):
+        login_metrics.record_rejected()
+        raise Throttled(wait=1, detail='Too many concurrent logins, please retry.')
+    try:
+        return executor.submit(_verify, password, encoded).result()
+    finally:
+        pending.release()
+
+
+def authenticate_credentials(request, username, password):
+    """
+    Authenticate a username/password pair for the API login endpoints.
+
+    The user is fetched once together with the college and department rows
+    the profile serializer renders, and the password check goes through
+    verify_password_limited. Mirrors ModelBackend: inactive users are
+    rejected and failures send the user_login_failed signal.
+    """
+    started = time.perf_counter()
+    user = (
+        User.objects
+        .select_related('college', 'department')
+        .filter(**{User.USERNAME_FIELD: username})
+        .first()
+    )
+
+    hash_started = time.perf_counter()
+    matches, needs_rehash = verify_password_limited(password, user.password if user else None)
+    hash_seconds = time.perf_counter() - hash_started
+
+    if not matches or not user.is_active:
+        user_login_failed.send(
+            sender=__name__,
+            credentials={User.USERNAME_FIELD: username},
+            request=request,
+        )
+        login_metrics.record(False, hash_seconds, time.perf_counter() - started)
+        return None
+
+    if needs_rehash:
+        user.set_password(password)
+        user.save(update_fields=['password'])
+
+    login_metrics.record(True, hash_seconds, time.perf_counter() - started)
+    return user
@@ -0,0 +1,74 @@
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from users.provisioning import parse_csv, provision_users
+
+
+class Command(BaseCommand):
+    help = 'Bulk-create users from a CSV or JSON file (one user per row/object)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path',
+            help='CSV file with a header row, or a JSON file containing a list of users',
+        )
+        parser.add_argument(
+            '--format',
+            choices=['csv', 'json'],
+            help='Input format (default: inferred from the file extension)',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=None,
+            help='Processes used for password hashing (default: PROVISIONING_HASH_WORKERS or CPU count)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Rows per INSERT statement (default: 500)',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Validate only, do not create any users',
+        )
+
+    def handle(self, *args, **options):
+        path = Path(options['path'])
+        if not path.exists():
+            raise CommandError(f'File not found: {path}')
+
+        fmt = options['format'] or path.suffix.lstrip('.').lower()
+        if fmt == 'csv':
+            rows = parse_csv(path.read_bytes())
+        elif fmt == 'json':
+            rows = json.loads(path.read_text())
+            if isinstance(rows, dict):
+                rows = rows.get('users', [])
+        else:
+            raise CommandError('Cannot infer the input format; pass --format csv|json')
+
+        self.stdout.write(f'Provisioning {len(rows)} users from {path}...')
+        report = provision_users(
+            rows,
+            hash_workers=options['workers'],
+            batch_size=options['batch_size'],
+            dry_run=options['dry_run'],
+        )
+
+        for error in report['errors']:
+            details = '; '.join(
+                f'{field}: {" ".join(messages)}' for field, messages in error['errors'].items()
+            )
+            self.stdout.write(self.style.WARNING(f'Row {error["row"]}: {details}'))
+
+        verb = 'Validated' if report['dry_run'] else 'Created'
+        count = report['valid'] if report['dry_run'] else report['created']
+        self.stdout.write(self.style.SUCCESS(
+            f'{verb} {count} of {report["total"]} users, {report["failed"]} failed '
+            f'({report["rows_per_second"]} rows/s in {report["elapsed_seconds"]}s)'
+        ))
@@ -94,7 +94,7 @@ class User(AbstractUser):
         """Check if user can manage a specific college or any college"""
         if self.is_admin():
             return True
-        if self.is_principal() and college and self.college == college:
+        if self.is_principal() and college and self.college_id == college.pk:
             return True
         return False
 
@@ -102,9 +102,9 @@ class User(AbstractUser):
         """Check if user can manage a specific department or any department"""
         if self.is_admin():
             return True
-        if self.is_principal() and department and self.college == department.college:
+        if self.is_principal() and department and self.college_id == department.college_id:
             return True
-        if self.is_dean() and department and self.department == department:
+        if self.is_dean() and department and self.department_id == department.pk:
             return True
         return False
 
@@ -112,7 +112,7 @@ class User(AbstractUser):
         """Check if user can view a specific student"""
         if self.has_management_role():
             return True
-        if self.is_teacher() and student and self.department == student.department:
+        if self.is_teacher() and student and self.department_id == student.department_id:
             return True
         if self.is_student_user() and student and self == student:
             return True
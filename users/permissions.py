@@ -1,4 +1,6 @@
 from rest_framework.permissions import BasePermission
+from users.scope import get_request_scope
+from colleges.hierarchy import ancestor_ids
 
 class IsAdmin(BasePermission):
     """
@@ -88,11 +90,15 @@ class IsCollegeManager(BasePermission):
         return request.user.is_authenticated
 
     def has_object_permission(self, request, view, obj):
-        if hasattr(obj, 'college'):
-            return request.user.can_manage_college(obj.college)
+        scope = get_request_scope(request)
+        if hasattr(obj, 'college_id'):
+            return scope.can_manage_college(obj.college_id)
         elif obj.__class__.__name__ == 'College':
-            return request.user.can_manage_college(obj)
-        return request.user.is_admin()
+            return scope.can_manage_college(obj.pk)
+        elif getattr(obj, 'org_path', None):
+            # Courses, subjects, students, ...: the college is the path root
+            return scope.can_manage_college(ancestor_ids(obj)[0])
+        return scope.is_admin
 
 class IsDepartmentManager(BasePermission):
     """
@@ -102,11 +108,15 @@ class IsDepartmentManager(BasePermission):
         return request.user.is_authenticated
 
     def has_object_permission(self, request, view, obj):
-        if hasattr(obj, 'department'):
-            return request.user.can_manage_department(obj.department)
+        scope = get_request_scope(request)
+        if hasattr(obj, 'department_id'):
+            return scope.can_manage_department(obj.department_id)
         elif obj.__class__.__name__ == 'Department':
-            return request.user.can_manage_department(obj)
-        return request.user.is_admin()
+            return scope.can_manage_department(obj.pk)
+        elif len(getattr(obj, 'org_path', '').split('/')) > 2:
+            # Subjects: the department is the second path component
+            return scope.can_manage_department(ancestor_ids(obj)[1])
+        return scope.is_admin
 
 class CanViewStudent(BasePermission):
     """
@@ -116,9 +126,10 @@ class CanViewStudent(BasePermission):
         return request.user.is_authenticated
 
     def has_object_permission(self, request, view, obj):
+        scope = get_request_scope(request)
         if obj.__class__.__name__ == 'Student':
-            return request.user.can_view_student(obj)
-        return request.user.has_management_role()
+            return scope.can_view_student(obj)
+        return scope.role in ('admin', 'principal', 'dean')
 
 class ReadOnlyOrAdmin(BasePermission):
     """
@@ -0,0 +1,242 @@
+import csv
+import io
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.password_validation import validate_password
+from django.contrib.auth.validators import UnicodeUsernameValidator
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from rest_framework import serializers
+
+from colleges.models import College
+from departments.models import Department
+from users.models import User
+
+# Columns that must be unique across the users table
+UNIQUE_FIELDS = ['username', 'employee_id', 'student_id']
+
+
+class BulkUserRowSerializer(serializers.Serializer):
+    """
+    Validates a single provisioning row without touching the database.
+
+    Uniqueness and foreign keys are checked for the whole batch at once in
+    provision_users, so this serializer has no per-row query validators.
+    """
+    username = serializers.CharField(max_length=150, validators=[UnicodeUsernameValidator()])
+    email = serializers.EmailField(required=False, allow_blank=True, default='')
+    password = serializers.CharField(write_only=True)
+    first_name = serializers.CharField(max_length=150, required=False, allow_blank=True, default='')
+    last_name = serializers.CharField(max_length=150, required=False, allow_blank=True, default='')
+    role = serializers.ChoiceField(choices=User.ROLE_CHOICES, default='student')
+    phone = serializers.CharField(max_length=15, required=False, allow_blank=True, allow_null=True)
+    college = serializers.IntegerField(required=False, allow_null=True)
+    department = serializers.IntegerField(required=False, allow_null=True)
+    employee_id = serializers.CharField(max_length=20, required=False, allow_blank=True, allow_null=True)
+    student_id = serializers.CharField(max_length=20, required=False, allow_blank=True, allow_null=True)
+    date_of_birth = serializers.DateField(required=False, allow_null=True)
+    address = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+
+    def to_internal_value(self, data):
+        # CSV gives empty strings for missing values; treat them as absent
+        data = {key: value for key, value in data.items() if value not in ('', None)}
+        return super().to_internal_value(data)
+
+    def validate_password(self, value):
+        """
+        Validate password using Django's password validators
+        """
+        try:
+            validate_password(value)
+        except ValidationError as e:
+            raise serializers.ValidationError(e.messages)
+        return value
+
+    def validate(self, attrs):
+        for field in ('phone', 'employee_id', 'student_id', 'address'):
+            if not attrs.get(field):
+                attrs[field] = None
+        return attrs
+
+
+def parse_csv(content):
+    """
+    Parse CSV text (or bytes) with a header row into a list of dicts
+    """
+    if isinstance(content, bytes):
+        content = content.decode('utf-8-sig')
+    reader = csv.DictReader(io.StringIO(content))
+    return [
+        {key.strip(): (value or '').strip() for key, value in row.items() if key}
+        for row in reader
+    ]
+
+
+def _init_hash_worker():
+    import django
+    if not settings.configured:
+        django.setup()
+
+
+def _hash_chunk(passwords):
+    return [make_password(password) for password in passwords]
+
+
+_thread_pool = None
+_thread_pool_lock = threading.Lock()
+
+
+def _hash_thread_pool():
+    """
+    The process-wide pool API requests hash on (None: hash inline). Shared,
+    so concurrent requests queue for the same few threads
+    """
+    global _thread_pool
+    threads = getattr(settings, 'PROVISIONING_HASH_THREADS', 2)
+    if threads <= 1:
+        return None
+    with _thread_pool_lock:
+        if _thread_pool is None:
+            _thread_pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='provisioning-hash')
+        return _thread_pool
+
+
+def hash_passwords(passwords, workers=None, threads=False):
+    """
+    Hash passwords, spreading the work over a process pool for big batches,
+    or with threads over the small shared thread pool (for web workers,
+    which must not fork one; PBKDF2 releases the GIL).
+
+    Returns hashes in the same order as the input.
+    """
+    if threads:
+        pool = _hash_thread_pool()
+        if pool is None:
+            return _hash_chunk(passwords)
+        return list(pool.map(make_password, passwords))
+
+    if workers is None:
+        workers = getattr(settings, 'PROVISIONING_HASH_WORKERS', None) or os.cpu_count() or 1
+    threshold = getattr(settings, 'PROVISIONING_PARALLEL_THRESHOLD', 50)
+    if workers <= 1 or len(passwords) < threshold:
+        return _hash_chunk(passwords)
+
+    chunk_size = max(1, len(passwords) // (workers * 4))
+    chunks = [passwords[i:i + chunk_size] for i in range(0, len(passwords), chunk_size)]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_hash_worker) as pool:
+        hashed = []
+        for result in pool.map(_hash_chunk, chunks):
+            hashed.extend(result)
+    return hashed
+
+
+# Keep IN (...) lists under SQLite's bound-parameter limit
+LOOKUP_CHUNK = 900
+
+
+def _existing_values(model, field, values):
+    values = list(values)
+    found = set()
+    for start in range(0, len(values), LOOKUP_CHUNK):
+        chunk = values[start:start + LOOKUP_CHUNK]
+        found.update(
+            model.objects.filter(**{f'{field}__in': chunk}).values_list(field, flat=True)
+        )
+    return found
+
+
+def provision_users(rows, hash_workers=None, batch_size=500, dry_run=False, hash_in_threads=False):
+    """
+    Validate and create users in bulk.
+
+    Each row is validated on its own, then uniqueness (within the batch and
+    against the table) and college/department references are checked with
+    one query per column. Valid rows have their passwords hashed in parallel
+    (on hash_workers processes, or with hash_in_threads on the shared thread
+    pool) and are inserted with bulk_create. Returns a report with per-row errors
+    (1-based row numbers) and the achieved throughput.
+    """
+    started = time.perf_counter()
+    errors = {}
+    valid = {}
+
+    def add_error(index, field, message):
+        errors.setdefault(index, {}).setdefault(field, []).append(message)
+
+    for index, row in enumerate(rows, start=1):
+        if not isinstance(row, dict):
+            errors[index] = {'non_field_errors': ['Expected an object of user fields.']}
+            continue
+        serializer = BulkUserRowSerializer(data=row)
+        if serializer.is_valid():
+            valid[index] = serializer.validated_data
+        else:
+            errors[index] = {
+                field: [str(message) for message in messages]
+                for field, messages in serializer.errors.items()
+            }
+
+    # Uniqueness within the batch and against existing users
+    for field in UNIQUE_FIELDS:
+        seen = {}
+        for index, data in valid.items():
+            value = data.get(field)
+            if value is None:
+                continue
+            if value in seen:
+                add_error(index, field, f'Duplicate {field} in batch (also on row {seen[value]}).')
+            else:
+                seen[value] = index
+        taken = _existing_values(User, field, seen)
+        for value in taken:
+            add_error(seen[value], field, f'A user with that {field} already exists.')
+
+    # Foreign keys, one query per model
+    for field, model in (('college', College), ('department', Department)):
+        ids = {data[field] for data in valid.values() if data.get(field) is not None}
+        missing = ids - _existing_values(model, 'id', ids)
+        for index, data in valid.items():
+            if data.get(field) in missing:
+                add_error(index, field, f'Invalid {field} ID.')
+
+    ready = [(index, data) for index, data in valid.items() if index not in errors]
+    created = 0
+    if ready and not dry_run:
+        hashed = hash_passwords(
+            [data['password'] for _, data in ready], workers=hash_workers, threads=hash_in_threads
+        )
+        users = []
+        for (index, data), encoded in zip(ready, hashed):
+            fields = {key: value for key, value in data.items() if key not in ('password', 'college', 'department')}
+            users.append(User(
+                password=encoded,
+                college_id=data.get('college'),
+                department_id=data.get('department'),
+                **fields
+            ))
+        try:
+            with transaction.atomic():
+                User.objects.bulk_create(users, batch_size=batch_size)
+            created = len(users)
+        except IntegrityError as e:
+            # Another writer claimed a unique value after validation
+            for index, _ in ready:
+                add_error(index, 'non_field_errors', f'Insert failed: {e}')
+
+    elapsed = time.perf_counter() - started
+    processed = created if not dry_run else len(ready)
+    return {
+        'total': len(rows),
+        'created': created,
+        'valid': len(ready),
+        'failed': len(errors),
+        'dry_run': dry_run,
+        'errors': [{'row': index, 'errors': errors[index]} for index in sorted(errors)],
+        'elapsed_seconds': round(elapsed, 3),
+        'rows_per_second': round(processed / elapsed, 1) if elapsed else 0.0,
+    }
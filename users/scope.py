@@ -0,0 +1,181 @@
+from dataclasses import dataclass, field
+
+from django.conf import settings
+
+from core.cache import bump_generation, get_cache, get_generation
+
+SCOPE_KEY = 'access-scope:{user_id}:{generation}'
+SCOPE_NAMESPACE = 'access-scope'
+
+MANAGEMENT_ROLES = ('admin', 'principal', 'dean')
+
+
+@dataclass(frozen=True)
+class AccessScope:
+    """
+    Everything a user can reach, resolved once and expressed as IDs.
+
+    Checks only compare IDs that are already on the object being checked
+    (obj.college_id, obj.department_id, ...), so they never trigger a
+    lazy load of a related row.
+    """
+    role: str
+    user_id: int
+    college_ids: frozenset = field(default_factory=frozenset)
+    department_ids: frozenset = field(default_factory=frozenset)
+    student_numbers: frozenset = field(default_factory=frozenset)
+    source: tuple = ()
+
+    @property
+    def is_admin(self):
+        return self.role == 'admin'
+
+    @property
+    def cache_key(self):
+        """
+        Identifies the visibility of this scope rather than the user, so users
+        with identical access share it (students are always distinct)
+        """
+        if self.is_admin:
+            return 'admin'
+        return '{}:c{}:d{}:s{}'.format(
+            self.role,
+            ','.join(str(pk) for pk in sorted(self.college_ids)),
+            ','.join(str(pk) for pk in sorted(self.department_ids)),
+            ','.join(sorted(self.student_numbers)),
+        )
+
+    def can_manage_college(self, college_id=None):
+        """Check if the scope can manage a college (by ID)"""
+        if self.is_admin:
+            return True
+        return self.role == 'principal' and college_id in self.college_ids
+
+    def can_manage_department(self, department_id=None):
+        """Check if the scope can manage a department (by ID)"""
+        if self.is_admin:
+            return True
+        return self.role in ('principal', 'dean') and department_id in self.department_ids
+
+    def can_view_student(self, student=None):
+        """Check if the scope can view a student record or student user"""
+        if self.role in MANAGEMENT_ROLES:
+            return True
+        if student is None:
+            return False
+        if self.role == 'teacher':
+            return student.department_id in self.department_ids
+        if self.role == 'student':
+            if student.__class__.__name__ == 'User':
+                return student.pk == self.user_id
+            return student.student_id in self.student_numbers
+        return False
+
+    def allows(self, department_id, student_number=None, by_student=False):
+        """
+        Row-level twin of filter_queryset, for rows that are already loaded
+        (by_student: the model has a student_field)
+        """
+        if self.is_admin:
+            return True
+        if self.role == 'student' and by_student:
+            return student_number in self.student_numbers
+        return department_id in self.department_ids
+
+    def filter_queryset(self, queryset, department_field, student_field=None):
+        """
+        Restrict queryset to the rows this scope can see.
+
+        department_field is the lookup from the model to a department ID
+        (e.g. 'department_id' or 'course__department_id'); student_field is
+        the lookup to Student.student_id for models that belong to a single
+        student. Admins see everything, principals and staff their college's
+        departments, deans and teachers their department, and students their
+        own records (or their department when the model has no student).
+        Both lookups end on indexed foreign-key or unique columns.
+        """
+        if self.is_admin:
+            return queryset
+        if self.role == 'student' and student_field:
+            if not self.student_numbers:
+                return queryset.none()
+            return queryset.filter(**{f'{student_field}__in': self.student_numbers})
+        if not self.department_ids:
+            return queryset.none()
+        if len(self.department_ids) == 1:
+            (department_id,) = self.department_ids
+            return queryset.filter(**{department_field: department_id})
+        return queryset.filter(**{f'{department_field}__in': self.department_ids})
+
+
+def _scope_source(user):
+    # The user attributes a scope is derived from; a mismatch means stale
+    return (user.role, user.college_id, user.department_id, user.student_id)
+
+
+def build_access_scope(user):
+    """
+    Resolve a user's scope from the database (at most one query)
+    """
+    from departments.models import Department
+
+    college_ids = frozenset()
+    department_ids = frozenset()
+    student_numbers = frozenset()
+
+    if user.role in ('principal', 'staff') and user.college_id:
+        college_ids = frozenset([user.college_id])
+        department_ids = frozenset(
+            Department.objects.filter(college_id=user.college_id).values_list('id', flat=True)
+        )
+    elif user.role != 'principal' and user.department_id:
+        # Deans, teachers, students (for catalog data) and department staff
+        department_ids = frozenset([user.department_id])
+        if user.college_id:
+            college_ids = frozenset([user.college_id])
+    if user.role == 'student' and user.student_id:
+        student_numbers = frozenset([user.student_id])
+
+    return AccessScope(
+        role=user.role,
+        user_id=user.pk,
+        college_ids=college_ids,
+        department_ids=department_ids,
+        student_numbers=student_numbers,
+        source=_scope_source(user),
+    )
+
+
+def get_access_scope(user):
+    """
+    Return the user's AccessScope, cached across requests until the user's
+    role assignment or the department layout changes
+    """
+    key = SCOPE_KEY.format(user_id=user.pk, generation=get_generation(SCOPE_NAMESPACE))
+    cache = get_cache()
+    scope = cache.get(key)
+    if scope is None or scope.source != _scope_source(user):
+        scope = build_access_scope(user)
+        cache.set(key, scope, getattr(settings, 'ACCESS_SCOPE_CACHE_TIMEOUT', 300))
+    return scope
+
+
+def get_request_scope(request):
+    """
+    Return the scope of request.user, resolved at most once per request
+    """
+    scope = getattr(request, '_access_scope', None)
+    if scope is None:
+        scope = get_access_scope(request.user)
+        request._access_scope = scope
+    return scope
+
+
+def invalidate_user_scope(user):
+    """Drop the cached scope for one user"""
+    get_cache().delete(SCOPE_KEY.format(user_id=user.pk, generation=get_generation(SCOPE_NAMESPACE)))
+
+
+def invalidate_all_scopes():
+    """Invalidate every cached scope (department membership changed)"""
+    bump_generation(SCOPE_NAMESPACE)
@@ -0,0 +1,54 @@
+from users.scope import get_request_scope
+
+
+class ScopedQuerysetMixin:
+    """
+    View mixin that limits get_queryset() to what request.user may see.
+
+    The role rules live in AccessScope.filter_queryset and are applied as
+    WHERE clauses, so pagination counts and pages only cover visible rows.
+    Views declare how their model reaches a department and, optionally, a
+    student number.
+    """
+    scope_department_field = 'department_id'
+    scope_student_field = None
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        user = self.request.user
+        if not user.is_authenticated:
+            return queryset.none()
+        queryset = get_request_scope(self.request).filter_queryset(
+            queryset,
+            self.scope_department_field,
+            self.scope_student_field,
+        )
+        if not queryset.ordered:
+            # Stable pages need a deterministic order; the PK index is free
+            queryset = queryset.order_by('pk')
+        return queryset
+
+    def get_scope_values(self, instance):
+        """
+        Return (department ID, student number) of a loaded row by following
+        the scope lookups as attributes
+        """
+        def resolve(lookup):
+            value = instance
+            for attr in lookup.split('__'):
+                value = getattr(value, attr)
+            return value
+
+        student_number = resolve(self.scope_student_field) if self.scope_student_field else None
+        return resolve(self.scope_department_field), student_number
+
+    def scope_allows(self, values):
+        """Check scope values from get_scope_values against request.user"""
+        if not self.request.user.is_authenticated:
+            return False
+        department_id, student_number = values
+        return get_request_scope(self.request).allows(
+            department_id,
+            student_number,
+            by_student=bool(self.scope_student_field),
+        )
@@ -0,0 +1,19 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from departments.models import Department
+from users.models import User
+from users.scope import invalidate_all_scopes, invalidate_user_scope
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, **kwargs):
+    """Role, college or department may have changed"""
+    invalidate_user_scope(instance)
+
+
+@receiver(post_save, sender=Department)
+@receiver(post_delete, sender=Department)
+def department_changed(sender, **kwargs):
+    """Principals' department sets depend on which college a department is in"""
+    invalidate_all_scopes()
@@ -1114,3 +1114,567 @@ class UserEdgeCasesTest(TestCase):
                 username='unique_test3',
                 student_id='STU001'
             )
+
+
+class LoginPipelineTest(APITestCase):
+    """Test cases for the shared login pipeline"""
+
+    def setUp(self):
+        """Set up test data"""
+        from users.login import login_metrics
+        self.metrics = login_metrics
+        self.metrics.reset()
+        self.college = College.objects.create(name="Login College")
+        self.department = Department.objects.create(
+            college=self.college,
+            name="Login Department"
+        )
+        self.user = User.objects.create_user(
+            username='teacher',
+            password='testpass123',
+            role='teacher',
+            college=self.college,
+            department=self.department
+        )
+        self.token_url = reverse('users_v1:token_obtain_pair')
+        self.login_url = reverse('users_v1:login')
+
+    def test_token_obtain_returns_profile(self):
+        """Test token endpoint returns tokens and the user profile"""
+        response = self.client.post(self.token_url, {
+            'username': 'teacher',
+            'password': 'testpass123'
+        })
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('access', response.data)
+        self.assertIn('refresh', response.data)
+        self.assertEqual(response.data['user']['college_name'], 'Login College')
+        self.assertEqual(response.data['user']['department_name'], 'Login Department')
+
+    def test_token_obtain_fetches_user_once(self):
+        """Test the user and its related rows are loaded in a single query"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(self.token_url, {
+                'username': 'teacher',
+                'password': 'testpass123'
+            })
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        user_selects = [
+            q['sql'] for q in ctx.captured_queries
+            if q['sql'].startswith('SELECT') and 'FROM "users_user"' in q['sql']
+        ]
+        self.assertEqual(len(user_selects), 1)
+        self.assertFalse(any(
+            q['sql'].startswith('SELECT') and 'FROM "colleges_college"' in q['sql']
+            for q in ctx.captured_queries
+        ))
+
+    def test_token_obtain_invalid_credentials(self):
+        """Test token endpoint rejects a wrong password"""
+        response = self.client.post(self.token_url, {
+            'username': 'teacher',
+            'password': 'wrongpassword'
+        })
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_login_inactive_user_rejected(self):
+        """Test inactive users cannot log in through the pipeline"""
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.post(self.login_url, {
+            'username': 'teacher',
+            'password': 'testpass123'
+        })
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_login_metrics_recorded(self):
+        """Test successful and failed logins are counted"""
+        self.client.post(self.login_url, {'username': 'teacher', 'password': 'testpass123'})
+        self.client.post(self.login_url, {'username': 'teacher', 'password': 'nope'})
+        self.client.post(self.login_url, {'username': 'ghost', 'password': 'nope'})
+
+        snapshot = self.metrics.snapshot()
+        self.assertEqual(snapshot['attempts'], 3)
+        self.assertEqual(snapshot['succeeded'], 1)
+        self.assertEqual(snapshot['failed'], 2)
+        self.assertGreater(snapshot['logins_per_second'], 0)
+
+    def test_login_stats_admin_only(self):
+        """Test login stats endpoint is restricted to admins"""
+        url = reverse('users_v1:login_stats')
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        admin = User.objects.create_user(username='admin', password='testpass123', role='admin')
+        self.client.force_authenticate(user=admin)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('logins_per_second', response.data)
+
+
+class LastLoginBufferTest(APITestCase):
+    """Test cases for write-behind last_login updates"""
+
+    def setUp(self):
+        """Set up test data"""
+        self.users = [
+            User.objects.create_user(username=f'user{i}', password='testpass123')
+            for i in range(3)
+        ]
+
+    def test_buffer_flushes_in_bulk(self):
+        """Test buffered logins are written on flush"""
+        from users.last_login import LastLoginBuffer
+        buffer = LastLoginBuffer(flush_interval=0, max_size=100)
+        for user in self.users:
+            buffer.record(user)
+
+        self.assertEqual(len(buffer), 3)
+        self.assertFalse(User.objects.filter(last_login__isnull=False).exists())
+
+        with self.assertNumQueries(1):
+            self.assertEqual(buffer.flush(), 3)
+        self.assertEqual(User.objects.filter(last_login__isnull=False).count(), 3)
+        self.assertEqual(len(buffer), 0)
+
+    def test_buffer_flushes_when_full(self):
+        """Test reaching max_size triggers an immediate flush"""
+        from users.last_login import LastLoginBuffer
+        buffer = LastLoginBuffer(flush_interval=0, max_size=2)
+        buffer.record(self.users[0])
+        buffer.record(self.users[1])
+        self.assertEqual(len(buffer), 0)
+        self.assertEqual(User.objects.filter(last_login__isnull=False).count(), 2)
+
+    def test_failed_flush_keeps_entries(self):
+        """Test a failed write puts the timestamps back for the next flush"""
+        from unittest import mock
+        from django.db import OperationalError
+        from users.last_login import LastLoginBuffer
+        buffer = LastLoginBuffer(flush_interval=0, max_size=100)
+        for user in self.users:
+            buffer.record(user)
+
+        with mock.patch.object(User.objects, 'bulk_update', side_effect=OperationalError('database is locked')):
+            with self.assertLogs('users.last_login', 'ERROR'), self.assertRaises(OperationalError):
+                buffer.flush()
+        self.assertEqual(len(buffer), 3)
+        self.assertEqual(buffer.flush(), 3)
+        self.assertEqual(User.objects.filter(last_login__isnull=False).count(), 3)
+
+    def test_full_buffer_write_failure_does_not_fail_the_login(self):
+        """Test a failed flush from record is logged and retried by the timer only"""
+        from unittest import mock
+        from django.db import OperationalError
+        from users.last_login import LastLoginBuffer
+        buffer = LastLoginBuffer(flush_interval=30, max_size=2)
+        with mock.patch('users.last_login.threading.Timer') as timer, \
+                mock.patch.object(User.objects, 'bulk_update', side_effect=OperationalError('database is locked')) as update:
+            with self.assertLogs('users.last_login', 'ERROR'):
+                buffer.record(self.users[0])
+                buffer.record(self.users[1])  # Full: flush fails, no exception
+            buffer.record(self.users[2])      # No second write on a login
+            self.assertEqual(update.call_count, 1)
+            timer.return_value.start.assert_called()
+        self.assertEqual(len(buffer), 3)
+        self.assertEqual(buffer.flush(), 3)
+        self.assertEqual(User.objects.filter(last_login__isnull=False).count(), 3)
+
+    def test_token_obtain_uses_buffer_when_enabled(self):
+        """Test token issuance defers the last_login write"""
+        from django.test.utils import override_settings
+        from users.last_login import flush_last_logins
+
+        with override_settings(LAST_LOGIN_WRITE_BEHIND=True):
+            response = self.client.post(reverse('users_v1:token_obtain_pair'), {
+                'username': 'user0',
+                'password': 'testpass123'
+            })
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.users[0].refresh_from_db()
+        self.assertIsNone(self.users[0].last_login)
+
+        flush_last_logins()
+        self.users[0].refresh_from_db()
+        self.assertIsNotNone(self.users[0].last_login)
+
+
+class BulkProvisioningTest(APITestCase):
+    """Test cases for bulk user provisioning"""
+
+    def setUp(self):
+        """Set up test data"""
+        self.college = College.objects.create(name="Provision College")
+        self.department = Department.objects.create(
+            college=self.college,
+            name="Provision Department"
+        )
+        self.admin = User.objects.create_user(
+            username='admin',
+            password='testpass123',
+            role='admin',
+            employee_id='EMP000'
+        )
+        self.url = reverse('users_v1:user-bulk-provision')
+        self.client.force_authenticate(user=self.admin)
+
+    def row(self, username, **kwargs):
+        data = {
+            'username': username,
+            'password': 'Str0ngPass!23',
+            'role': 'student',
+            'department': self.department.id,
+            'college': self.college.id,
+        }
+        data.update(kwargs)
+        return data
+
+    def test_bulk_provision_json(self):
+        """Test creating users from a JSON list"""
+        rows = [
+            self.row('s1', student_id='S1'),
+            self.row('s2', student_id='S2'),
+            self.row('t1', role='teacher', employee_id='EMP001'),
+        ]
+        response = self.client.post(self.url, rows, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created'], 3)
+        self.assertEqual(response.data['errors'], [])
+        self.assertIn('rows_per_second', response.data)
+
+        user = User.objects.get(username='t1')
+        self.assertEqual(user.department_id, self.department.id)
+        self.assertTrue(user.check_password('Str0ngPass!23'))
+
+    def test_bulk_provision_reports_row_errors(self):
+        """Test per-row errors for duplicates and bad references"""
+        rows = [
+            self.row('admin'),                          # existing username
+            self.row('s1', student_id='S1'),
+            self.row('s1', student_id='S2'),            # duplicate in batch
+            self.row('s3', employee_id='EMP000'),       # existing employee_id
+            self.row('s4', department=99999),           # unknown department
+            self.row('s5', password=''),                # missing password
+            self.row('s6'),
+        ]
+        response = self.client.post(self.url, rows, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created'], 2)
+        failed_rows = {error['row']: error['errors'] for error in response.data['errors']}
+        self.assertEqual(sorted(failed_rows), [1, 3, 4, 5, 6])
+        self.assertIn('username', failed_rows[1])
+        self.assertIn('employee_id', failed_rows[4])
+        self.assertIn('department', failed_rows[5])
+        self.assertIn('password', failed_rows[6])
+
+    def test_bulk_provision_query_count_is_constant(self):
+        """Test validation does not issue per-row queries"""
+        from users.provisioning import provision_users
+        rows = [self.row(f'user{i}', student_id=f'S{i}') for i in range(20)]
+        # username + student_id lookups, 2 FK lookups, savepoint + INSERT + release
+        with self.assertNumQueries(7):
+            report = provision_users(rows, hash_workers=1)
+        self.assertEqual(report['created'], 20)
+
+    def test_bulk_provision_csv_upload(self):
+        """Test creating users from an uploaded CSV file"""
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        content = (
+            'username,password,role,department,student_id\n'
+            f's1,Str0ngPass!23,student,{self.department.id},S1\n'
+            f's2,Str0ngPass!23,student,,\n'
+        ).encode()
+        upload = SimpleUploadedFile('users.csv', content, content_type='text/csv')
+        response = self.client.post(self.url, {'file': upload}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created'], 2)
+        self.assertIsNone(User.objects.get(username='s2').student_id)
+
+    def test_bulk_provision_dry_run(self):
+        """Test dry run validates without creating users"""
+        response = self.client.post(self.url + '?dry_run=1', [self.row('s1')], format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['valid'], 1)
+        self.assertFalse(User.objects.filter(username='s1').exists())
+
+    def test_bulk_provision_rejects_rows_that_are_not_objects(self):
+        """Test non-object rows are reported per row instead of failing the request"""
+        response = self.client.post(self.url, ['s1', 42], format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual([error['row'] for error in response.data['errors']], [1, 2])
+        self.assertIn('non_field_errors', response.data['errors'][0]['errors'])
+
+        response = self.client.post(self.url, {'users': 'not a list'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_provision_insert_conflict(self):
+        """Test a batch whose insert fails after validation is a conflict, not 201"""
+        from unittest import mock
+        from django.db import IntegrityError
+        with mock.patch.object(User.objects, 'bulk_create', side_effect=IntegrityError('duplicate username')):
+            response = self.client.post(self.url, [self.row('s1', student_id='S1')], format='json')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data['created'], 0)
+        self.assertIn('non_field_errors', response.data['errors'][0]['errors'])
+
+    def test_bulk_provision_admin_only(self):
+        """Test non-admins cannot provision users"""
+        teacher = User.objects.create_user(username='teacher', role='teacher')
+        self.client.force_authenticate(user=teacher)
+        response = self.client.post(self.url, [self.row('s1')], format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_api_never_starts_a_process_pool(self):
+        """Test the API hashes on the shared thread pool, not a process pool"""
+        from unittest import mock
+        from django.contrib.auth.hashers import check_password
+        from django.test.utils import override_settings
+
+        rows = [self.row(f's{i}') for i in range(4)]
+        with override_settings(PROVISIONING_PARALLEL_THRESHOLD=2, PROVISIONING_HASH_WORKERS=4), \
+                mock.patch('users.provisioning.ProcessPoolExecutor', side_effect=AssertionError('forked')):
+            response = self.client.post(self.url, rows, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(check_password(rows[3]['password'], User.objects.get(username='s3').password))
+
+    def test_parallel_password_hashing(self):
+        """Test hashes from the process pool verify and keep input order"""
+        from django.contrib.auth.hashers import check_password
+        from django.test.utils import override_settings
+        from users.provisioning import hash_passwords
+
+        passwords = [f'password-{i}' for i in range(6)]
+        with override_settings(PROVISIONING_PARALLEL_THRESHOLD=2):
+            hashed = hash_passwords(passwords, workers=2)
+        self.assertEqual(len(hashed), 6)
+        for raw, encoded in zip(passwords, hashed):
+            self.assertTrue(check_password(raw, encoded))
+
+    def test_provision_users_command(self):
+        """Test the provision_users management command"""
+        import tempfile
+        from io import StringIO
+        from django.core.management import call_command
+
+        with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as handle:
+            json.dump([self.row('s1'), self.row('admin')], handle)
+        out = StringIO()
+        call_command('provision_users', handle.name, stdout=out)
+        self.assertIn('Created 1 of 2 users, 1 failed', out.getvalue())
+        self.assertIn('Row 2', out.getvalue())
+        self.assertTrue(User.objects.filter(username='s1').exists())
+
+
+class AccessScopeTest(TestCase):
+    """Test cases for precomputed access scopes"""
+
+    def setUp(self):
+        """Set up test data"""
+        from django.core.cache import cache
+        from students.models import Student
+        cache.clear()
+        self.college = College.objects.create(name="Scope College")
+        self.other_college = College.objects.create(name="Other College")
+        self.department = Department.objects.create(college=self.college, name="Scope Dept")
+        self.sibling = Department.objects.create(college=self.college, name="Sibling Dept")
+        self.foreign = Department.objects.create(college=self.other_college, name="Foreign Dept")
+        self.student_record = Student.objects.create(
+            department=self.department,
+            first_name="Jane",
+            last_name="Doe",
+            student_id="S-100",
+            email="jane@example.com",
+            contact_number="123"
+        )
+        self.other_record = Student.objects.create(
+            department=self.foreign,
+            first_name="John",
+            last_name="Roe",
+            student_id="S-200",
+            email="john@example.com",
+            contact_number="456"
+        )
+        self.principal = User.objects.create_user(
+            username='principal', role='principal', college=self.college
+        )
+        self.dean = User.objects.create_user(
+            username='dean', role='dean', department=self.department
+        )
+        self.teacher = User.objects.create_user(
+            username='teacher', role='teacher', department=self.department
+        )
+        self.student = User.objects.create_user(
+            username='student', role='student', student_id='S-100'
+        )
+
+    def test_principal_scope(self):
+        """Test principals reach every department of their college"""
+        from users.scope import get_access_scope
+        scope = get_access_scope(self.principal)
+        self.assertEqual(scope.college_ids, {self.college.id})
+        self.assertEqual(scope.department_ids, {self.department.id, self.sibling.id})
+        self.assertTrue(scope.can_manage_college(self.college.id))
+        self.assertFalse(scope.can_manage_college(self.other_college.id))
+        self.assertTrue(scope.can_manage_department(self.sibling.id))
+        self.assertFalse(scope.can_manage_department(self.foreign.id))
+
+    def test_checks_run_without_queries(self):
+        """Test scope checks never load related rows"""
+        from users.scope import get_access_scope
+        teacher_scope = get_access_scope(self.teacher)
+        student_scope = get_access_scope(self.student)
+        dean_scope = get_access_scope(self.dean)
+        records = [self.student_record, self.other_record]
+        with self.assertNumQueries(0):
+            self.assertTrue(teacher_scope.can_view_student(records[0]))
+            self.assertFalse(teacher_scope.can_view_student(records[1]))
+            self.assertTrue(student_scope.can_view_student(records[0]))
+            self.assertFalse(student_scope.can_view_student(records[1]))
+            self.assertTrue(dean_scope.can_manage_department(self.department.id))
+            self.assertFalse(dean_scope.can_manage_department(self.sibling.id))
+
+    def test_scope_is_cached(self):
+        """Test the scope is resolved once and then served from cache"""
+        from users.scope import get_access_scope
+        with self.assertNumQueries(1):
+            get_access_scope(self.principal)
+        with self.assertNumQueries(0):
+            get_access_scope(self.principal)
+
+    def test_scope_invalidated_on_department_change(self):
+        """Test adding a department refreshes principal scopes"""
+        from users.scope import get_access_scope
+        get_access_scope(self.principal)
+        new_department = Department.objects.create(college=self.college, name="New Dept")
+        self.assertIn(new_department.id, get_access_scope(self.principal).department_ids)
+
+    def test_scope_invalidated_on_role_change(self):
+        """Test changing a user's role rebuilds their scope"""
+        from users.scope import get_access_scope
+        self.assertFalse(get_access_scope(self.teacher).can_manage_department(self.department.id))
+        self.teacher.role = 'dean'
+        self.teacher.save()
+        self.assertTrue(get_access_scope(self.teacher).can_manage_department(self.department.id))
+
+    def test_department_manager_permission_uses_scope(self):
+        """Test IsDepartmentManager checks objects without extra queries"""
+        from users.scope import get_access_scope
+
+        class MockRequest:
+            def __init__(self, user):
+                self.user = user
+
+        request = MockRequest(self.principal)
+        permission = IsDepartmentManager()
+        get_access_scope(self.principal)
+        with self.assertNumQueries(0):
+            self.assertTrue(permission.has_object_permission(request, None, self.student_record))
+            self.assertFalse(permission.has_object_permission(request, None, self.other_record))
+            self.assertTrue(permission.has_object_permission(request, None, self.sibling))
+
+
+class ScopedListTest(APITestCase):
+    """Test cases for role-based visibility on list endpoints"""
+
+    def setUp(self):
+        """Set up test data"""
+        from django.core.cache import cache
+        from students.models import Student
+        from courses.models import Course
+        from enrollments.models import Enrollment
+        cache.clear()
+        self.college = College.objects.create(name="Scope College")
+        self.other_college = College.objects.create(name="Other College")
+        self.department = Department.objects.create(college=self.college, name="Scope Dept")
+        self.sibling = Department.objects.create(college=self.college, name="Sibling Dept")
+        self.foreign = Department.objects.create(college=self.other_college, name="Foreign Dept")
+        self.records = {}
+        for index, department in enumerate([self.department, self.sibling, self.foreign], start=1):
+            student = Student.objects.create(
+                department=department,
+                first_name=f"Student{index}",
+                last_name="Doe",
+                student_id=f"S-{index}",
+                email=f"s{index}@example.com",
+                contact_number="123"
+            )
+            course = Course.objects.create(department=department, name=f"Course {index}", code=f"C{index}")
+            Enrollment.objects.create(student=student, course=course)
+            self.records[department.id] = student
+
+        self.admin = User.objects.create_user(username='admin', role='admin')
+        self.principal = User.objects.create_user(
+            username='principal', role='principal', college=self.college
+        )
+        self.teacher = User.objects.create_user(
+            username='teacher', role='teacher', department=self.department
+        )
+        self.student = User.objects.create_user(
+            username='student', role='student', student_id='S-2', department=self.sibling
+        )
+        self.students_url = reverse('student-list-create')
+        self.enrollments_url = reverse('enrollment-list-create')
+
+    def _student_ids(self, user, url):
+        self.client.force_authenticate(user=user)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data['count'], sorted(
+            row['student_id'] if 'student_id' in row else row['student'] for row in response.data['results']
+        )
+
+    def test_admin_sees_everything(self):
+        """Test admins are not filtered"""
+        count, _ = self._student_ids(self.admin, self.students_url)
+        self.assertEqual(count, 3)
+
+    def test_principal_sees_own_college(self):
+        """Test principals see rows from every department in their college"""
+        count, ids = self._student_ids(self.principal, self.students_url)
+        self.assertEqual(count, 2)
+        self.assertEqual(ids, ['S-1', 'S-2'])
+
+    def test_teacher_sees_own_department(self):
+        """Test teachers only see rows from their department"""
+        count, ids = self._student_ids(self.teacher, self.students_url)
+        self.assertEqual(count, 1)
+        self.assertEqual(ids, ['S-1'])
+        count, _ = self._student_ids(self.teacher, self.enrollments_url)
+        self.assertEqual(count, 1)
+
+    def test_student_sees_own_records(self):
+        """Test students only see their own student record and enrollments"""
+        count, ids = self._student_ids(self.student, self.students_url)
+        self.assertEqual(count, 1)
+        self.assertEqual(ids, ['S-2'])
+        count, ids = self._student_ids(self.student, self.enrollments_url)
+        self.assertEqual(count, 1)
+        self.assertEqual(ids, [self.records[self.sibling.id].id])
+
+    def test_out_of_scope_detail_is_not_found(self):
+        """Test detail views apply the same filter"""
+        self.client.force_authenticate(user=self.teacher)
+        other = self.records[self.foreign.id]
+        response = self.client.get(reverse('student-update-delete', args=[other.id]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_filter_is_applied_in_sql(self):
+        """Test scoping adds a WHERE clause rather than filtering in Python"""
+        self.client.force_authenticate(user=self.teacher)
+        self.client.get(self.students_url)
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from core.caching import invalidate_response_cache
+        from students.models import Student
+        invalidate_response_cache(Student)  # Measure a rebuild, not a cached page
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(self.students_url)
+        # Scope is cached: the COUNT and the page query carry the filter
+        count_sql, page_sql = context.captured_queries[0]['sql'], context.captured_queries[1]['sql']
+        self.assertIn('COUNT', count_sql)
+        self.assertIn('"department_id" = %s' % self.department.id, count_sql)
+        self.assertIn('"department_id" = %s' % self.department.id, page_sql)